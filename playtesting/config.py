@@ -75,7 +75,7 @@ class PlaytestConfig:
 
     # Rate limiting
     max_concurrent_agents: int = 5
-    delay_between_messages_ms: int = 100
+    delay_between_messages_ms: int = 0  # API pacing is done by the shared LLM rate limiter
 
     # Output settings
     output_dir: str = "./playtest_results"
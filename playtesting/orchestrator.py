@@ -8,6 +8,7 @@ from typing import List
 from pathlib import Path
 
 from tnl.llm import LLMClient
+from tnl.persistence import create_repository
 
 from .config import PlaytestConfig, AgentConfig
 from .playthrough import Playthrough
@@ -25,6 +26,10 @@ class PlaytestOrchestrator:
         self.output_dir = Path(config.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # One pooled repository shared by all agent threads, so connections
+        # to the backend are reused instead of re-handshaking per call
+        self.repository = create_repository(pool_size=max(config.max_concurrent_agents, 1))
+
     def run_all(self) -> List[Playthrough]:
         """
         Run all configured playthroughs in parallel.
@@ -110,6 +115,7 @@ class PlaytestOrchestrator:
             config=self.config,
             agent_config=agent_config,
             llm_client=llm_client,
+            repository=self.repository,
         )
 
         return runner.run()
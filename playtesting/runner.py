@@ -8,6 +8,7 @@ from typing import Optional
 from tnl import CampaignEngine
 from tnl.llm import LLMClient
 from tnl.models.campaign import CampaignPhase
+from tnl.persistence import BaseCampaignRepository
 
 from .config import PlaytestConfig, AgentConfig
 from .playthrough import Playthrough, PlaythroughMetadata, MessageSource
@@ -24,13 +25,14 @@ class PlaythroughRunner:
         config: PlaytestConfig,
         agent_config: AgentConfig,
         llm_client: Optional[LLMClient] = None,
+        repository: Optional[BaseCampaignRepository] = None,
     ):
         self.config = config
         self.agent_config = agent_config
         self.llm = llm_client or LLMClient()
 
-        # Create engine and player agent
-        self.engine = CampaignEngine(llm_client=self.llm)
+        # Create engine and player agent (repository may be shared across runners)
+        self.engine = CampaignEngine(llm_client=self.llm, repository=repository)
         self.player = PlayerAgent(
             llm_client=self.llm,
             personality=agent_config.personality,
@@ -85,6 +87,9 @@ class PlaythroughRunner:
             self.playthrough.metadata.completed_normally = False
 
         finally:
+            # Make sure the last turns are persisted before the runner exits
+            self.engine.close()
+
             # Capture final state
             self.playthrough.metadata.completed_at = datetime.utcnow()
             if self.engine.state:
@@ -295,6 +300,12 @@ class PlaythroughRunner:
         return context
 
     def _delay(self) -> None:
-        """Add delay between messages to respect rate limits."""
+        """
+        Optional fixed pause between messages (off by default).
+
+        API rate limits are enforced by the shared LLM rate limiter, which
+        paces every call against the real quota, so this is only for
+        deliberately slowing a playtest down.
+        """
         if self.config.delay_between_messages_ms > 0:
             time.sleep(self.config.delay_between_messages_ms / 1000)
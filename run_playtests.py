@@ -7,6 +7,7 @@ Run multiple AI agents through the game to generate playthroughs for analysis.
 
 import argparse
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -114,12 +115,22 @@ Examples:
     parser.add_argument(
         "--delay",
         type=int,
-        default=100,
-        help="Delay between messages in ms (default: 100)"
+        default=0,
+        help="Extra fixed delay between messages in ms (default: 0; API rate limits are handled automatically)"
+    )
+
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Persist to a local SQLite database instead of the remote API "
+             "(same as TNL_PERSISTENCE=sqlite; path from TNL_SQLITE_PATH)"
     )
 
     args = parser.parse_args()
 
+    if args.local:
+        os.environ["TNL_PERSISTENCE"] = "sqlite"
+
     setup_logging(args.verbose)
     logger = logging.getLogger(__name__)
 
@@ -92,9 +92,16 @@ def display_sidebar():
                         st.write(f"• {item}")
 
 
+def replace_engine():
+    """Swap in a fresh engine, persisting any saves queued by the old one."""
+    if "engine" in st.session_state:
+        st.session_state.engine.close()
+    st.session_state.engine = CampaignEngine()
+
+
 def start_new_campaign():
     """Start a fresh campaign."""
-    st.session_state.engine = CampaignEngine()
+    replace_engine()
     st.session_state.messages = []
     st.session_state.campaign_started = True
 
@@ -105,7 +112,7 @@ def start_new_campaign():
 
 def resume_campaign(campaign_id: str):
     """Resume an existing campaign."""
-    st.session_state.engine = CampaignEngine()
+    replace_engine()
 
     message = st.session_state.engine.resume_campaign(campaign_id)
     if message:
@@ -131,11 +138,12 @@ def display_chat():
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        # Get response from engine
+        # Stream response from engine (narration renders token by token)
         with st.chat_message("assistant"):
+            # Only the pre-narration work (simulation layer) runs under the spinner
             with st.spinner(""):
-                response = st.session_state.engine.handle_input(prompt)
-                st.markdown(response)
+                stream = st.session_state.engine.handle_input_stream(prompt)
+            response = st.write_stream(stream)
 
         st.session_state.messages.append({"role": "assistant", "content": response})
 
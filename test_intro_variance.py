@@ -87,6 +87,7 @@ def test_intro_variance(num_samples: int = 3):
             prompt=prompt,
             system_prompt="You are a narrative writer for an RPG.",
             max_tokens=600,
+            cache=False,  # Measuring variance - never reuse a cached intro
         )
 
         intro = response.strip()
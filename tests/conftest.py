@@ -0,0 +1,158 @@
+"""Shared test helpers (offline: no API key or backend needed)."""
+
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pytest
+
+from tnl.llm import LLMClient, RateLimiter, RetryBudget, RetryPolicy
+from tnl.persistence import BaseCampaignRepository
+from tnl.persistence.delta import Patch
+
+
+class InMemoryRepository(BaseCampaignRepository):
+    """
+    Repository keeping everything in dicts.
+
+    Deltas are appended, not upserted (like a backend without a unique key
+    on seq), and ``fail_next_delta`` makes the next delta write raise after
+    storing it, as a timed-out request the server applied would.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(llm_client=object(), **kwargs)
+        self.checkpoints: Dict[str, Dict[str, Any]] = {}
+        self.deltas: List[Dict[str, Any]] = []
+        self.archive: Dict[tuple, Dict[str, Any]] = {}
+        self.fail_next_delta = False
+
+    def save_seed_chunk(self, chunk_order: int, seed_chunk: str, campaign_id: Optional[str] = None) -> str:
+        return campaign_id or "campaign"
+
+    def load_campaign_chunks(self, campaign_id: str) -> List[Dict[str, Any]]:
+        return []
+
+    def _match_chunks(self, campaign_id: str, embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+        return []
+
+    def _store_embeddings(self, campaign_id: str, chunks: List[str], embeddings: List[List[float]]) -> None:
+        pass
+
+    def _read_checkpoint(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        return self.checkpoints.get(campaign_id)
+
+    def _write_checkpoint(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        self.checkpoints[campaign_id] = state_json
+
+    def _read_deltas(self, campaign_id: str, checkpoint_id: str) -> List[Dict[str, Any]]:
+        return [
+            d for d in self.deltas
+            if d["campaign_id"] == campaign_id and d["checkpoint_id"] == checkpoint_id
+        ]
+
+    def _write_delta(self, campaign_id: str, checkpoint_id: str, seq: int, patch: Patch) -> bool:
+        self.deltas.append({"campaign_id": campaign_id, "checkpoint_id": checkpoint_id, "seq": seq, "patch": patch})
+        if self.fail_next_delta:
+            self.fail_next_delta = False
+            raise TimeoutError("delta write timed out")
+        return True
+
+    def _write_scene_archive(self, campaign_id: str, location: str, scene_json: Dict[str, Any]) -> bool:
+        self.archive[(campaign_id, location)] = scene_json
+        return True
+
+    def _read_scene_archive(self, campaign_id: str, location: str) -> Optional[Dict[str, Any]]:
+        return self.archive.get((campaign_id, location))
+
+
+@pytest.fixture
+def memory_repo() -> InMemoryRepository:
+    return InMemoryRepository()
+
+
+# ----------------------------------------------------------------------
+# Fake OpenAI transport
+# ----------------------------------------------------------------------
+
+
+def chat_response(text: str, total_tokens: Optional[int] = None) -> SimpleNamespace:
+    """A parsed chat completion carrying ``text``."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(total_tokens=total_tokens) if total_tokens is not None else None,
+    )
+
+
+class FakeStream:
+    """Streamed chat completion: yields ``parts`` (optionally waiting before each) and records close()."""
+
+    def __init__(self, parts: List[str], delay: float = 0.0, total_tokens: Optional[int] = None):
+        self.parts = parts
+        self.delay = delay
+        self.total_tokens = total_tokens
+        self.closed = threading.Event()
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        for part in self.parts:
+            if self.closed.wait(self.delay):
+                return
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=part))], usage=None
+            )
+        if self.total_tokens is not None:
+            yield SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=self.total_tokens))
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def reply(text: str, request: Dict[str, Any]) -> Any:
+    """Answer a chat request with ``text``, streamed if the request asked for a stream."""
+    return FakeStream([text]) if request.get("stream") else chat_response(text)
+
+
+class FakeRaw:
+    def __init__(self, parsed: Any, headers: Optional[Dict[str, str]] = None):
+        self.parsed = parsed
+        self.headers = headers or {}
+
+    def parse(self) -> Any:
+        return self.parsed
+
+
+class FakeEndpoint:
+    """
+    Stand-in for ``client.chat.completions`` / ``client.embeddings``.
+
+    ``handler(kwargs)`` returns the parsed response (or a FakeRaw to set
+    headers) or raises. Every request's kwargs are recorded in ``calls``.
+    """
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Any]):
+        self.handler = handler
+        self.calls: List[Dict[str, Any]] = []
+        self.with_raw_response = self
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs: Any) -> FakeRaw:
+        with self._lock:
+            self.calls.append(kwargs)
+        result = self.handler(kwargs)
+        return result if isinstance(result, FakeRaw) else FakeRaw(result)
+
+
+def fake_llm(chat: Callable[[Dict[str, Any]], Any], **kwargs: Any) -> LLMClient:
+    """LLMClient whose chat endpoint is ``chat``, with its own limiter and a fast retry policy."""
+    kwargs.setdefault("rate_limiter", RateLimiter())
+    kwargs.setdefault("retry_policy", RetryPolicy(base_delay=0.001, max_delay=0.01, budget=RetryBudget()))
+    kwargs.setdefault("use_embedding_cache", False)
+    client = LLMClient(api_key="test", **kwargs)
+    client.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=FakeEndpoint(chat)),
+        embeddings=FakeEndpoint(lambda request: SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(len(text)), 1.0]) for text in request["input"]],
+            usage=None,
+        )),
+    )
+    return client
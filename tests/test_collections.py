@@ -0,0 +1,69 @@
+"""Tests for the ordered-set bookkeeping containers and their JSON shape."""
+
+import json
+
+import pytest
+from pydantic import BaseModel, Field
+
+from tnl.models.campaign import CampaignState
+from tnl.models.collections import NameSet, OrderedSet
+
+
+class Holder(BaseModel):
+    ids: OrderedSet = Field(default_factory=OrderedSet)
+    names: NameSet = Field(default_factory=NameSet)
+
+
+def test_ordered_set_keeps_insertion_order_and_ignores_duplicates():
+    items = OrderedSet(["b", "a"])
+    assert items.add("c") and not items.append("a")
+    items.extend(["a", "d"])
+
+    assert list(items) == ["b", "a", "c", "d"]
+    assert items[0] == "b" and items[-1] == "d" and items[1:3] == ["a", "c"]
+    assert "c" in items and "C" not in items and 1 not in items
+    assert items == ["b", "a", "c", "d"]
+
+    assert items.discard("a") and not items.discard("a")
+    with pytest.raises(ValueError):
+        items.remove("a")
+    assert list(reversed(items)) == ["d", "c", "b"]
+
+
+def test_name_set_dedupes_case_insensitively_keeping_first_spelling():
+    names = NameSet(["Rusty Sword", "rusty sword ", "Lantern"])
+
+    assert list(names) == ["Rusty Sword", "Lantern"]
+    assert "RUSTY SWORD" in names
+    names.remove("lantern")
+    assert list(names) == ["Rusty Sword"]
+
+
+def test_sets_serialize_to_plain_json_lists():
+    holder = Holder(ids=OrderedSet(["x", "y"]), names=NameSet(["Ann"]))
+
+    assert holder.model_dump() == {"ids": ["x", "y"], "names": ["Ann"]}
+    assert json.loads(holder.model_dump_json()) == {"ids": ["x", "y"], "names": ["Ann"]}
+
+
+def test_sets_validate_from_lists_of_older_saves():
+    holder = Holder.model_validate({"ids": ["x", "x", 3], "names": ["Ann", "ANN", "Bob"]})
+
+    assert isinstance(holder.ids, OrderedSet) and isinstance(holder.names, NameSet)
+    assert list(holder.ids) == ["x", "3"]
+    assert list(holder.names) == ["Ann", "Bob"]
+
+
+def test_campaign_state_round_trips():
+    state = CampaignState()
+    state.inventory.add("Rope")
+    state.inventory.add("rope")
+    state.known_npcs.update(["Mara", "Old Tom"])
+
+    data = json.loads(state.model_dump_json())
+    assert data["inventory"] == ["Rope"] and data["known_npcs"] == ["Mara", "Old Tom"]
+
+    loaded = CampaignState.model_validate(data)
+    assert isinstance(loaded.inventory, NameSet)
+    assert loaded.inventory == state.inventory and loaded.known_npcs == state.known_npcs
+    assert "old tom" in loaded.known_npcs
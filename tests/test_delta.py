@@ -0,0 +1,111 @@
+"""Tests for JSON-patch deltas and checkpoint + delta replay."""
+
+import pytest
+
+from tnl.models.campaign import CampaignPhase, CampaignState
+from tnl.persistence.delta import apply_patch, make_patch
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ({"a": 1}, {"a": 1}),
+        ({"a": 1, "b": 2}, {"a": 3, "c": 4}),
+        ({"l": [1, 2]}, {"l": [1, 2, 3, 4]}),
+        ({"l": [1, 2, 3, 4]}, {"l": [3, 4, 5]}),
+        ({"l": [{"x": False}, {"x": False}]}, {"l": [{"x": False}, {"x": True}]}),
+        ({"l": [1, 2, 3]}, {"l": [9]}),
+        ({"a/b": {"~k": 1}}, {"a/b": {"~k": 2}}),
+        ({"n": None}, {"n": {"deep": [1]}}),
+        ({"t": 1}, {"t": 1.0}),
+    ],
+)
+def test_apply_make_patch_round_trips(old, new):
+    patch = make_patch(old, new)
+    assert apply_patch(old, patch) == new
+
+
+def test_equal_values_give_empty_patch():
+    assert make_patch({"a": [1, {"b": None}]}, {"a": [1, {"b": None}]}) == []
+    # 1 == 1.0, but the persisted JSON type still changes
+    assert make_patch({"t": 1}, {"t": 1.0}) == [{"op": "replace", "path": "/t", "value": 1.0}]
+
+
+def test_sliding_window_is_removes_plus_appends():
+    old = {"history": list(range(50))}
+    new = {"history": list(range(2, 52))}
+    patch = make_patch(old, new)
+    assert [op["op"] for op in patch] == ["remove", "remove", "add", "add"]
+    assert apply_patch(old, patch) == new
+
+
+def test_apply_patch_does_not_mutate_input():
+    doc = {"l": [1]}
+    apply_patch(doc, [{"op": "add", "path": "/l/-", "value": 2}])
+    assert doc == {"l": [1]}
+
+
+def test_apply_patch_rejects_bad_ops():
+    with pytest.raises(ValueError):
+        apply_patch({}, [{"op": "move", "path": "/a"}])
+    with pytest.raises(ValueError):
+        apply_patch({}, [{"op": "replace", "path": "/missing/x", "value": 1}])
+
+
+def _state(turn: int) -> CampaignState:
+    state = CampaignState(phase=CampaignPhase.GAMEPLAY, genre="Fantasy", current_turn=turn)
+    for i in range(turn):
+        state.add_message("user", f"action {i}")
+        state.inventory.add(f"item {i}")
+    return state
+
+
+def test_replay_deltas_restores_latest_state(memory_repo):
+    for turn in range(1, 6):
+        memory_repo.save_runtime_state("c1", _state(turn))
+
+    assert len(memory_repo.checkpoints) == 1
+    assert [d["seq"] for d in memory_repo.deltas] == [1, 2, 3, 4]
+
+    fresh = type(memory_repo)()
+    fresh.checkpoints, fresh.deltas = memory_repo.checkpoints, memory_repo.deltas
+    loaded = fresh.load_runtime_state("c1")
+    assert loaded.current_turn == 5
+    assert list(loaded.inventory) == [f"item {i}" for i in range(5)]
+    assert loaded.message_history == _state(5).message_history
+
+    # Loading makes the replayed state the base for the next delta
+    fresh.save_runtime_state("c1", _state(6))
+    assert fresh.deltas[-1]["seq"] == 5
+
+
+def test_failed_delta_write_is_not_duplicated_on_replay(memory_repo):
+    memory_repo.save_runtime_state("c1", _state(1))
+    memory_repo.fail_next_delta = True
+    with pytest.raises(TimeoutError):
+        memory_repo.save_runtime_state("c1", _state(2))
+
+    # The failed write was stored anyway; the next save must not stack on it
+    memory_repo.save_runtime_state("c1", _state(3))
+    loaded = type(memory_repo)()
+    loaded.checkpoints, loaded.deltas = memory_repo.checkpoints, memory_repo.deltas
+    state = loaded.load_runtime_state("c1")
+    assert state.current_turn == 3
+    assert list(state.inventory) == ["item 0", "item 1", "item 2"]
+    assert len(state.message_history) == 3
+
+
+def test_resent_seq_replaces_earlier_delta(memory_repo):
+    memory_repo.save_runtime_state("c1", _state(1))
+    checkpoint_id = memory_repo.checkpoints["c1"]["checkpoint_id"]
+    base = memory_repo.build_state_json("c1", _state(1))
+    # Same seq written twice (a retried upload on a backend that appends)
+    for turn in (2, 3):
+        patch = make_patch(base, memory_repo.build_state_json("c1", _state(turn)))
+        memory_repo._write_delta("c1", checkpoint_id, 1, patch)
+
+    state = type(memory_repo)()
+    state.checkpoints, state.deltas = memory_repo.checkpoints, memory_repo.deltas
+    loaded = state.load_runtime_state("c1")
+    assert loaded.current_turn == 3
+    assert len(loaded.message_history) == 3
@@ -0,0 +1,64 @@
+"""Tests for scene transition detection."""
+
+import pytest
+
+from tnl.simulation import SceneDetector
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("I go to the old mill.", "Old Mill"),
+        ("I go into the cellar", "Cellar"),
+        ("I walk into the tavern, looking around", "Tavern"),
+        ("I enter the crypt at the far end", "Crypt"),
+        ("I travel to Ironhold where the smiths work", "Ironhold"),
+    ],
+)
+def test_detects_default_movement(text, expected):
+    assert SceneDetector().detect_scene_transition(text) == expected
+
+
+@pytest.mark.parametrize(
+    "genre, text, expected",
+    [
+        ("sci-fi horror", "I board the derelict freighter", "Derelict Freighter"),
+        ("steampunk", "We board the airship Valiant.", "Airship Valiant"),
+        ("noir", "I stop by the precinct", "Precinct"),
+    ],
+)
+def test_detects_genre_movement(genre, text, expected):
+    assert SceneDetector.for_genre(genre).detect_scene_transition(text) == expected
+
+
+@pytest.mark.parametrize(
+    "genre, text",
+    [
+        ("sci-fi horror", "The windows are boarded up."),
+        ("steampunk", "I check the notice board by the door."),
+        ("steampunk", "The boardroom falls silent."),
+        ("noir", "I stop byzantine schemes before they start."),
+        (None, "I wait for the entertainment."),
+        (None, "I look at the gopher in the grass."),
+    ],
+)
+def test_ignores_partial_word_matches(genre, text):
+    assert SceneDetector.for_genre(genre).detect_scene_transition(text) is None
+
+
+def test_ignores_current_location_and_non_locations():
+    detector = SceneDetector()
+    assert detector.detect_scene_transition("I go to the tavern", current_location="Tavern") is None
+    assert detector.detect_scene_transition("I run to avoid the guards") is None
+
+
+def test_detect_locations_lists_distinct_destinations():
+    text = "You could head to the docks, or visit the chapel. Some go to the docks."
+    assert SceneDetector().detect_locations(text, current_location="Chapel") == ["Docks"]
+
+
+def test_explicitly_empty_lists_replace_the_defaults():
+    assert SceneDetector(trailing_phrases=[]).detect_scene_transition("I head to the plaza at the gate") == "Plaza At The Gate"
+    assert SceneDetector(non_location_words=[]).detect_scene_transition("I go to the docks to find him") == "Docks To Find Him"
+    assert SceneDetector(strip_words=[]).detect_scene_transition("I go to the door") == "The Door"
+    assert SceneDetector(movement_keywords=[]).detect_scene_transition("I go to the docks") is None
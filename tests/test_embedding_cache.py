@@ -0,0 +1,87 @@
+"""Tests for the embedding cache: model keying, LRU eviction and the SQLite store."""
+
+import pytest
+
+from tnl.llm.cache import EmbeddingCache
+
+from conftest import fake_llm
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "embeddings.db")
+
+
+def test_same_text_hits_only_under_the_same_model():
+    cache = EmbeddingCache()
+    cache.put_many("small", ["a lighthouse"], [[1.0, 2.0]])
+
+    assert cache.get_many("small", ["a lighthouse"]) == [[1.0, 2.0]]
+    assert cache.get_many("large", ["a lighthouse"]) == [None]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_models_keep_separate_vectors_for_the_same_text():
+    cache = EmbeddingCache()
+    cache.put_many("small", ["tide"], [[1.0]])
+    cache.put_many("large", ["tide"], [[2.0, 3.0]])
+
+    assert cache.get_many("small", ["tide"]) == [[1.0]]
+    assert cache.get_many("large", ["tide"]) == [[2.0, 3.0]]
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+    cache.get_many("m", ["a"])  # "b" is now the oldest
+    cache.put_many("m", ["c"], [[3.0]])
+
+    assert cache.get_many("m", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+    assert cache.stats()["entries"] == 2
+
+
+def test_vectors_persist_across_instances(db_path):
+    first = EmbeddingCache(path=db_path)
+    first.put_many("m", ["harbour", "chapel"], [[0.5, 1.5], [2.5, 3.5]])
+    first.close()
+
+    second = EmbeddingCache(path=db_path)
+    assert second.get_many("m", ["chapel", "harbour", "market"]) == [[2.5, 3.5], [0.5, 1.5], None]
+    assert second.get_many("other", ["harbour"]) == [None]
+    second.close()
+
+
+def test_evicted_entries_are_reloaded_from_disk(db_path):
+    cache = EmbeddingCache(max_entries=1, path=db_path)
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get_many("m", ["a"]) == [[1.0]]
+    assert cache.stats()["hits"] == 1
+    cache.close()
+
+
+def test_clear_drops_memory_and_disk(db_path):
+    cache = EmbeddingCache(path=db_path)
+    cache.put_many("m", ["a"], [[1.0]])
+    cache.clear()
+    cache.close()
+
+    reopened = EmbeddingCache(path=db_path)
+    assert reopened.get_many("m", ["a"]) == [None]
+    reopened.close()
+
+
+def test_embed_batch_only_sends_misses_upstream(db_path):
+    cache = EmbeddingCache(path=db_path)
+    llm = fake_llm(lambda request: None, use_embedding_cache=True, embedding_cache=cache)
+
+    first = llm.embed_batch(["ab", "abc"], model="m")
+    second = llm.embed_batch(["abc", "abcd", "ab"], model="m")
+    llm.embed_batch(["ab"], model="other")
+
+    assert first == [[2.0, 1.0], [3.0, 1.0]]
+    assert second == [[3.0, 1.0], [4.0, 1.0], [2.0, 1.0]]
+    assert [call["input"] for call in llm.client.embeddings.calls] == [["ab", "abc"], ["abcd"], ["ab"]]
+    cache.close()
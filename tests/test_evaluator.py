@@ -0,0 +1,71 @@
+"""Tests for simulation trigger evaluation."""
+
+import random
+from typing import List
+
+import pytest
+
+from tnl.models.campaign import CampaignState
+from tnl.models.simulation import SceneSimulation, SimulationState, Watcher
+from tnl.simulation import SceneSimulationGenerator, SimulationEvaluator
+
+
+class FakeEmbedder:
+    """Embeds every text as the same unit vector, so semantic triggers always match."""
+
+    def embed_batch(self, texts: List[str], model: str = "") -> List[List[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+
+def _simulation(probability: float) -> SimulationState:
+    triggers = SceneSimulationGenerator(FakeEmbedder())._build_triggers(
+        ["knife"], "threatening someone with a weapon", probability
+    )
+    scene = SceneSimulation(
+        location="Tavern",
+        watchers=[Watcher(id="w1", name="Barkeep", triggers=triggers)],
+    )
+    simulation = SimulationState()
+    simulation.add_scene(scene)
+    simulation.current_location = "Tavern"
+    return simulation
+
+
+@pytest.mark.parametrize("probability", [0.3, 0.7, 0.8])
+def test_keyword_and_semantic_match_rolls_element_once(probability):
+    evaluator = SimulationEvaluator(FakeEmbedder())
+    inputs = ["I draw my knife on the barkeep"] * 4000
+    result = evaluator.evaluate_batch(
+        inputs, _simulation(probability), query_embeddings=[[1.0, 0.0]] * len(inputs), seed=7
+    )
+
+    assert result.hits.all()
+    assert result.fire_probability[0, 0] == pytest.approx(probability)
+    assert result.fire_rates[0] == pytest.approx(probability, abs=0.03)
+
+
+def test_evaluate_action_fire_rate_unchanged_by_semantic_trigger():
+    evaluator = SimulationEvaluator(FakeEmbedder())
+    random.seed(11)
+    fired = 0
+    runs = 3000
+    for _ in range(runs):
+        state = CampaignState(simulation=_simulation(0.7), current_location="Tavern")
+        fired += bool(evaluator.evaluate_action("I draw my knife", state, query_embedding=[1.0, 0.0]))
+    assert fired / runs == pytest.approx(0.7, abs=0.03)
+
+
+@pytest.mark.parametrize("processes", [2, 3])
+def test_evaluate_batch_is_identical_across_worker_counts(processes):
+    evaluator = SimulationEvaluator(FakeEmbedder())
+    inputs = [f"I {'draw my knife' if i % 3 else 'order a drink'} ({i})" for i in range(200)]
+    simulation = _simulation(0.5)
+
+    serial = evaluator.evaluate_batch(inputs, simulation, seed=13)
+    parallel = evaluator.evaluate_batch(inputs, simulation, seed=13, processes=processes)
+
+    assert (serial.hits == parallel.hits).all()
+    assert (serial.fired == parallel.fired).all()
+    assert (serial.fire_probability == parallel.fire_probability).all()
+    assert 0 < serial.fired.sum() < serial.hits.sum()
+    assert not simulation.triggered_elements
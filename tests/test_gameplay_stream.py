@@ -0,0 +1,77 @@
+"""Tests for the streaming gameplay path."""
+
+from typing import Any
+
+from tnl.models.campaign import CampaignPhase, CampaignState
+from tnl.phases.gameplay import GameplayPhase
+
+from conftest import FakeStream, InMemoryRepository, chat_response, fake_llm
+
+NARRATION = [
+    "The drawer sticks, then gives. ",
+    "Inside, wrapped in oilcloth, lies a brass key.\n",
+    '```json\n{"inventory_add": ["Brass Key"]}\n```',
+]
+
+
+class CountingRepository(InMemoryRepository):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.saves = 0
+
+    def save_runtime_state(self, campaign_id: str, state: CampaignState) -> None:
+        self.saves += 1
+        super().save_runtime_state(campaign_id, state)
+
+
+def _narrate(request):
+    return FakeStream(NARRATION) if request.get("stream") else chat_response("".join(NARRATION))
+
+
+def _phase(repo: InMemoryRepository) -> GameplayPhase:
+    phase = GameplayPhase(fake_llm(_narrate), repo, scene_idle_turns=None, speculate_scenes=False)
+    phase._intro_shown = True
+    return phase
+
+
+def _state() -> CampaignState:
+    return CampaignState(campaign_id="c1", phase=CampaignPhase.GAMEPLAY, genre="Fantasy", current_location="Study")
+
+
+def test_stream_matches_blocking_response():
+    blocking_phase, streaming_phase = _phase(CountingRepository()), _phase(CountingRepository())
+    blocking_state, streaming_state = _state(), _state()
+    try:
+        blocking = blocking_phase.handle_input("I search the desk", blocking_state).display_message
+        streamed = list(streaming_phase.handle_input_stream("I search the desk", streaming_state))
+
+        assert len(streamed) == len(NARRATION)
+        assert "".join(streamed) == blocking
+        assert streaming_state.message_history == blocking_state.message_history
+        assert list(streaming_state.inventory) == list(blocking_state.inventory) == ["Brass Key"]
+    finally:
+        blocking_phase.close()
+        streaming_phase.close()
+
+
+def test_state_is_parsed_and_saved_once_after_the_stream_drains():
+    repo = CountingRepository()
+    phase = _phase(repo)
+    state = _state()
+    try:
+        stream = phase.handle_input_stream("I search the desk", state)
+
+        # Preparation is done, but narration hasn't been requested yet
+        assert state.message_history[-1]["content"] == "I search the desk"
+        assert not phase.llm.client.chat.completions.calls
+
+        next(stream)
+        assert repo.saves == 0 and "Brass Key" not in state.inventory
+
+        list(stream)
+        assert repo.saves == 1
+        assert "Brass Key" in state.inventory
+        assert state.message_history[-1] == {"role": "assistant", "content": "".join(NARRATION)}
+        assert repo.load_runtime_state("c1").inventory == ["Brass Key"]
+    finally:
+        phase.close()
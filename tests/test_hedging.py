@@ -0,0 +1,161 @@
+"""Tests for hedged generate calls over a fake streaming transport."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from tnl.llm import RateLimiter, RetryBudget, RetryPolicy
+from tnl.llm.client import DEFAULT_HEDGE_DELAY, HEDGE_MIN_SAMPLES, MIN_HEDGE_DELAY
+
+from conftest import FakeStream, fake_llm, reply
+
+
+class FailingStream(FakeStream):
+    """Stream that drops after ``delay`` seconds."""
+
+    def __iter__(self):
+        if not self.closed.wait(self.delay):
+            raise ConnectionError(f"{self.parts[0]} dropped")
+        return iter(())
+
+
+def _hedging_llm(*streams: FakeStream, **kwargs):
+    """Client whose n-th chat request is answered by ``streams[n]`` (or by calling it)."""
+    queue = iter(streams)
+    lock = threading.Lock()
+
+    def chat(request):
+        with lock:
+            answer = next(queue)
+        return answer(request) if callable(answer) else answer
+
+    kwargs.setdefault("hedge_ratio", 1.0)
+    kwargs.setdefault("hedge_delay", 0.05)
+    return fake_llm(chat, **kwargs)
+
+
+def test_backup_wins_and_slow_primary_is_closed_at_once():
+    slow = FakeStream(["slow"], delay=5.0)
+    llm = _hedging_llm(slow, FakeStream(["fast"]))
+
+    started = time.monotonic()
+    assert llm.generate("Look around", hedge=True) == "fast"
+    assert time.monotonic() - started < 1.0
+
+    assert slow.closed.is_set()
+    assert llm.hedge_stats()["hedges"] == 1 and llm.hedge_stats()["hedge_wins"] == 1
+    llm.close()
+
+
+def test_fast_primary_sends_no_backup():
+    llm = _hedging_llm(FakeStream(["quick"]), FakeStream(["unused"]))
+
+    assert llm.generate("Look around", hedge=True) == "quick"
+    assert llm.hedge_stats()["hedges"] == 0
+    assert len(llm.client.chat.completions.calls) == 1
+    llm.close()
+
+
+def test_backup_requests_stay_under_the_ratio():
+    llm = _hedging_llm(hedge_ratio=0.5)
+    llm.hedged_calls = 4
+
+    assert [llm._take_hedge() for _ in range(3)] == [True, True, False]
+    llm.hedged_calls = 6
+    assert llm._take_hedge()
+    assert not llm._take_hedge()
+
+
+def test_failed_leg_waits_for_the_other():
+    llm = _hedging_llm(FailingStream(["primary"], delay=0.2), FakeStream(["backup"], delay=0.3))
+
+    assert llm.generate("Look around", hedge=True) == "backup"
+    llm.close()
+
+
+def test_error_is_raised_when_both_legs_fail():
+    llm = _hedging_llm(FailingStream(["primary"], delay=0.2), FailingStream(["backup"], delay=0.3))
+
+    with pytest.raises(ConnectionError, match="primary dropped"):
+        llm.generate("Look around", hedge=True)
+    llm.close()
+
+
+def test_only_hedged_calls_move_the_hedge_delay():
+    llm = fake_llm(lambda request: reply("hi", request), hedge_ratio=0.0)
+
+    for _ in range(HEDGE_MIN_SAMPLES + 5):
+        llm.generate("Build a world chunk")
+    assert llm.hedge_delay() == DEFAULT_HEDGE_DELAY
+
+    for _ in range(HEDGE_MIN_SAMPLES):
+        llm.generate("Narrate", hedge=True)
+    assert llm.hedge_delay() == MIN_HEDGE_DELAY
+    llm.close()
+
+
+def test_cancelled_backup_does_not_retry_after_the_primary_wins():
+    outage = openai.InternalServerError.__new__(openai.InternalServerError)
+    Exception.__init__(outage, "overloaded")
+    outage.status_code = 503
+    outage.response = SimpleNamespace(headers={"retry-after": "5"})
+
+    def backup_fails(request):
+        raise outage
+
+    llm = _hedging_llm(
+        FakeStream(["primary"], delay=0.3),
+        backup_fails,
+        retry_policy=RetryPolicy(max_delay=10.0, budget=RetryBudget()),
+    )
+
+    started = time.monotonic()
+    assert llm.generate("Look around", hedge=True) == "primary"
+    llm._hedge_executor.shutdown(wait=True)  # The backup leg gives up instead of sleeping out its backoff
+
+    assert time.monotonic() - started < 2.0
+    assert len(llm.client.chat.completions.calls) == 2  # Its retry was never sent
+
+
+def test_time_queued_in_the_limiter_does_not_trigger_a_backup():
+    limiter = RateLimiter(requests_per_minute=120)
+    llm = _hedging_llm(FakeStream(["primary"]), FakeStream(["unused"]), rate_limiter=limiter, hedge_delay=0.2)
+    limiter._quota(llm.model).requests.level = 0  # Next permit in ~0.5s
+
+    assert llm.generate("Look around", hedge=True) == "primary"
+    assert llm.hedge_stats()["hedges"] == 0
+    llm.close()
+
+
+def test_stream_races_to_the_first_delta():
+    slow = FakeStream(["slow ", "start"], delay=5.0)
+    llm = _hedging_llm(slow, FakeStream(["fast ", "start"], delay=0.01, total_tokens=9))
+
+    started = time.monotonic()
+    assert "".join(llm.generate_stream("Look around", hedge=True)) == "fast start"
+    assert time.monotonic() - started < 1.0
+
+    assert slow.closed.is_set()
+    assert llm.hedge_stats()["hedge_wins"] == 1
+    llm._hedge_executor.shutdown(wait=True)
+    assert llm.rate_limiter.stats()["in_flight"] == 0
+    llm.close()
+
+
+def test_losing_stream_is_closed_and_its_permit_released():
+    primary = FakeStream(["primary ", "wins"], delay=0.2)
+    backup = FakeStream(["backup"], delay=0.25)
+    llm = _hedging_llm(primary, backup, hedge_delay=0.01)
+
+    stream = llm.generate_stream("Look around", hedge=True)
+    assert next(stream) == "primary "
+    llm._hedge_executor.shutdown(wait=True)
+
+    assert backup.closed.is_set()
+    assert llm.rate_limiter.stats()["in_flight"] == 1  # Only the stream being read
+    assert "".join(stream) == "wins"
+    assert llm.rate_limiter.stats()["in_flight"] == 0
+    llm.close()
@@ -0,0 +1,46 @@
+"""Tests for LLMClient behaviour over a fake OpenAI transport."""
+
+from pydantic import BaseModel
+
+from tnl.llm import ResponseCache
+
+from conftest import chat_response, fake_llm, reply
+
+
+class Name(BaseModel):
+    name: str
+
+
+def _counting_llm(cache: ResponseCache):
+    replies = iter(f"reply {i}" for i in range(100))
+    return fake_llm(lambda request: reply(next(replies), request), response_cache=cache)
+
+
+def test_sampled_text_calls_are_not_cached_by_default():
+    llm = _counting_llm(ResponseCache(":memory:"))
+    assert llm.generate("Look around", temperature=0.8) == "reply 0"
+    assert llm.generate("Look around", temperature=0.8) == "reply 1"
+    assert "".join(llm.generate_stream("Look around")) == "reply 2"
+
+
+def test_deterministic_and_opted_in_calls_are_cached():
+    llm = _counting_llm(ResponseCache(":memory:"))
+    assert llm.generate("Summarize", temperature=0) == "reply 0"
+    assert llm.generate("Summarize", temperature=0) == "reply 0"
+
+    assert llm.generate("World chunk", temperature=0.8, cache=True) == "reply 1"
+    assert llm.generate("World chunk", temperature=0.8, cache=True) == "reply 1"
+    assert llm.generate("Summarize", temperature=0, cache=False) == "reply 2"
+
+
+def test_structured_calls_follow_the_same_cache_rule():
+    names = iter(f'{{"name": "npc {i}"}}' for i in range(100))
+    llm = fake_llm(lambda request: chat_response(next(names)), response_cache=ResponseCache(":memory:"))
+
+    assert llm.generate_structured("Name an NPC", Name, temperature=0.7).name == "npc 0"
+    assert llm.generate_structured("Name an NPC", Name, temperature=0.7).name == "npc 1"
+
+    assert llm.generate_structured("Name an NPC", Name, temperature=0).name == "npc 2"
+    assert llm.generate_structured("Name an NPC", Name, temperature=0).name == "npc 2"
+    assert llm.generate_structured("Name an NPC", Name, temperature=0.7, cache=True).name == "npc 3"
+    assert llm.generate_structured("Name an NPC", Name, temperature=0.7, cache=True).name == "npc 3"
@@ -0,0 +1,53 @@
+"""Tests for location canonicalization."""
+
+from typing import List
+
+import pytest
+
+from tnl.models.simulation import SceneSimulation, SimulationState
+from tnl.simulation.locations import LocationIndex, location_tokens
+
+
+def test_location_tokens_drop_stop_words_and_plurals():
+    assert location_tokens("The Old Docks") == {"old", "dock"}
+    assert location_tokens("Smith's Forge") == {"smith", "forge"}
+
+
+@pytest.mark.parametrize(
+    "name, known, expected",
+    [
+        ("The Old Docks", ["Old Docks"], "Old Docks"),
+        ("old harbor docks", ["Harbor Docks", "Chapel"], "Harbor Docks"),
+        ("Grand Hall of the Keep", ["Grand Hall"], "Grand Hall"),
+        # Near misses: a shared word doesn't make the same place
+        ("Market", ["Black Market"], None),
+        ("The Tower", ["Wizard Tower"], None),
+        ("Black Market", ["Market"], None),
+        ("Tavern", ["Red Tavern", "Blue Tavern"], None),
+        ("North Gate", ["South Gate"], None),
+    ],
+)
+def test_token_matching(name, known, expected):
+    assert LocationIndex().match(name, known) == expected
+
+
+def test_embedding_fallback_uses_threshold():
+    vectors = {"Docks": [1.0, 0.0], "Chapel": [0.0, 1.0], "Waterfront": [0.95, 0.1], "Belfry": [0.6, 0.8]}
+
+    def embed_batch(texts: List[str]) -> List[List[float]]:
+        return [vectors[text] for text in texts]
+
+    index = LocationIndex()
+    assert index.match("Waterfront", ["Docks", "Chapel"], embed_batch) == "Docks"
+    assert index.match("Belfry", ["Docks", "Chapel"], embed_batch) is None
+
+
+def test_resolve_location_remembers_aliases():
+    simulation = SimulationState()
+    simulation.add_scene(SceneSimulation(location="Black Market"))
+    simulation.add_scene(SceneSimulation(location="Old Docks"))
+
+    assert simulation.resolve_location("the old docks") == "Old Docks"
+    assert simulation.location_aliases["the old docks"] == "Old Docks"
+    assert simulation.resolve_location("Market") == "Market"
+    assert "market" not in simulation.location_aliases
@@ -0,0 +1,137 @@
+"""Tests for speculative scene pre-generation."""
+
+import threading
+from typing import Dict, List
+
+from tnl.models.campaign import CampaignPhase, CampaignState
+from tnl.models.simulation import SceneSimulation
+from tnl.simulation import ScenePregenerator
+from tnl.simulation.pregen import generation_snapshot
+
+
+class RecordingGenerator:
+    """Stands in for SceneSimulationGenerator; blocks until released and records its input."""
+
+    def __init__(self, fail: bool = False):
+        self.release = threading.Event()
+        self.fail = fail
+        self.states: List[CampaignState] = []
+        self.batches: List[List[str]] = []
+
+    def generate_scene_simulations(self, locations, state, world_context) -> Dict[str, SceneSimulation]:
+        self.batches.append(list(locations))
+        self.release.wait(5)
+        self.states.append(state)
+        if self.fail:
+            raise RuntimeError("generation failed")
+        return {location: SceneSimulation(location=location) for location in locations}
+
+
+def _state() -> CampaignState:
+    state = CampaignState(campaign_id="c1", phase=CampaignPhase.GAMEPLAY, genre="Noir", current_turn=3)
+    state.current_location = "Office"
+    state.simulation.add_scene(SceneSimulation(location="Office"))
+    state.discovered_locations.add("Office")
+    return state
+
+
+def test_snapshot_shares_no_mutable_state():
+    state = _state()
+    snapshot = generation_snapshot(state)
+    assert snapshot.character_sheet is not state.character_sheet
+    assert snapshot.simulation is not state.simulation
+    assert not snapshot.simulation.scenes
+    assert snapshot.genre == "Noir" and snapshot.current_turn == 3
+
+
+def test_worker_sees_state_as_of_speculation():
+    generator = RecordingGenerator()
+    pregen = ScenePregenerator(generator)
+    state = _state()
+    try:
+        assert pregen.speculate(state, "You could head to the docks.") == ["Docks"]
+
+        # Gameplay keeps going while the worker runs
+        state.simulation.add_scene(SceneSimulation(location="Alley"))
+        state.current_turn = 4
+        state.character_sheet.name = "Changed"
+        generator.release.set()
+
+        scene = pregen.take("c1", "docks")
+        assert scene is not None and scene.location == "docks"
+        seen = generator.states[0]
+        assert seen.current_turn == 3
+        assert "Alley" not in seen.simulation.scenes
+        assert seen.character_sheet.name != "Changed"
+    finally:
+        pregen.close()
+
+
+def test_campaign_budget_caps_speculative_calls():
+    generator = RecordingGenerator()
+    generator.release.set()
+    pregen = ScenePregenerator(generator, campaign_budget=3, max_per_turn=2)
+    state = _state()
+    state.discovered_locations.update(["Docks", "Alley", "Pier", "Church"])
+    try:
+        assert pregen.speculate(state) == ["Church", "Pier"]
+        for location in ("Church", "Pier"):
+            state.simulation.add_scene(pregen.take("c1", location))
+
+        assert pregen.speculate(state) == ["Alley"]
+        state.simulation.add_scene(pregen.take("c1", "Alley"))
+        assert pregen.speculate(state) == []
+        assert pregen.started == 3
+        assert generator.batches == [["Church", "Pier"], ["Alley"]]
+    finally:
+        pregen.close()
+
+
+def test_unwanted_batches_are_cancelled_and_refunded():
+    generator = RecordingGenerator()
+    pregen = ScenePregenerator(generator, campaign_budget=3, max_workers=1)
+    state = _state()
+    try:
+        assert pregen.speculate(state, "You could head to the docks.") == ["Docks"]
+        # Docks occupies the only worker, so Alley waits in the queue
+        assert pregen.speculate(state, "You could head to the alley.") == ["Alley"]
+
+        # Neither is wanted now: the running Docks batch stays, the queued Alley batch is dropped
+        assert pregen.speculate(state, "You could head to the pier.") == ["Pier"]
+        assert pregen.cancelled == 1
+        assert pregen._spent["c1"] == 2
+
+        # Still within budget thanks to the refunds; Docks stays charged since it ran
+        assert pregen.speculate(state, "You could head to the church.") == ["Church"]
+        assert pregen.cancelled == 2
+        assert pregen._spent["c1"] == 2
+
+        generator.release.set()
+        assert pregen.take("c1", "Docks") is not None
+        assert pregen.take("c1", "Alley") is None
+        assert pregen.take("c1", "Church") is not None
+        assert generator.batches == [["Docks"], ["Church"]]
+    finally:
+        pregen.close()
+
+
+def test_take_counts_hits_and_misses():
+    generator = RecordingGenerator()
+    generator.release.set()
+    pregen = ScenePregenerator(generator)
+    failing = ScenePregenerator(RecordingGenerator(fail=True))
+    failing.scene_generator.release.set()
+    try:
+        pregen.speculate(_state(), "You could head to the docks.")
+        assert pregen.take("c1", "Docks") is not None
+        assert pregen.take("c1", "Docks") is None  # Claimed already
+        assert pregen.take("c1", "Pier") is None
+        assert pregen.take("c2", "Docks") is None
+        assert (pregen.hits, pregen.misses) == (1, 3)
+
+        failing.speculate(_state(), "You could head to the docks.")
+        assert failing.take("c1", "Docks") is None
+        assert (failing.hits, failing.misses) == (0, 1)
+    finally:
+        pregen.close()
+        failing.close()
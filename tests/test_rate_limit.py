@@ -0,0 +1,92 @@
+"""Tests for the shared LLM rate limiter: token buckets and AIMD concurrency."""
+
+import pytest
+
+from tnl.llm.rate_limit import RateLimiter, parse_reset
+
+from conftest import FakeRaw, FakeStream, chat_response, fake_llm
+
+
+def _level(limiter: RateLimiter, model: str) -> float:
+    return limiter._quotas[model].tokens.level
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1s", 1.0), ("6m0s", 360.0), ("120ms", 0.12), ("0.5", 0.5), ("1h2m", 3720.0), ("", None), ("soon", None),
+])
+def test_parse_reset(value, seconds):
+    assert parse_reset(value) == (pytest.approx(seconds) if seconds is not None else None)
+
+
+def test_token_bucket_makes_requests_wait_once_spent():
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=1_000_000)
+    limiter.acquire(model="m").release()
+    limiter.acquire(model="m").release()
+
+    with limiter._cond:
+        wait = limiter._try_acquire(0, "m")
+    assert wait == pytest.approx(30.0, rel=0.01)  # One request refills every 30s
+
+
+def test_models_have_separate_buckets():
+    limiter = RateLimiter(requests_per_minute=1_000, tokens_per_minute=10_000)
+    limiter.update_from_headers({"x-ratelimit-limit-tokens": "1000000", "x-ratelimit-remaining-tokens": "5"}, "embed")
+
+    with limiter.acquire(5_000, "chat"):
+        pass
+    with limiter._cond:
+        assert limiter._try_acquire(100, "embed") > 0
+    assert limiter.stats()["models"]["chat"]["tokens_per_minute"] == 10_000
+    assert limiter.stats()["models"]["embed"]["tokens_per_minute"] == 1_000_000
+
+
+def test_rate_limit_pauses_only_that_model_and_halves_concurrency():
+    limiter = RateLimiter(initial_concurrency=8)
+    limiter.on_rate_limited({"retry-after": "20"}, "chat")
+
+    assert limiter.concurrency == 4
+    with limiter._cond:
+        assert limiter._try_acquire(0, "chat") == pytest.approx(20.0, abs=0.5)
+        assert limiter._try_acquire(0, "embed") == 0.0
+
+
+def test_concurrency_grows_additively_up_to_the_cap():
+    limiter = RateLimiter(initial_concurrency=2, max_concurrency=3)
+    for _ in range(2):
+        limiter.acquire().release()
+    assert limiter.concurrency == pytest.approx(2.9)  # +1/2, then +1/2.5
+
+    for _ in range(10):
+        limiter.acquire().release()
+    assert limiter.concurrency == 3.0
+
+
+def test_release_settles_the_estimate_against_actual_usage():
+    limiter = RateLimiter(tokens_per_minute=60)
+    permit = limiter.acquire(50, "m")
+    assert _level(limiter, "m") == pytest.approx(10, abs=0.5)
+
+    permit.observe(used_tokens=20)
+    permit.release()
+    assert _level(limiter, "m") == pytest.approx(40, abs=0.5)
+
+
+def test_client_keys_permits_by_model_and_reads_headers():
+    headers = {"x-ratelimit-limit-requests": "30", "x-ratelimit-limit-tokens": "9000"}
+    llm = fake_llm(lambda request: FakeRaw(chat_response("hi"), headers))
+
+    llm.generate("Hello")
+
+    assert llm.rate_limiter.stats()["models"] == {
+        llm.model: {"requests_per_minute": 30.0, "tokens_per_minute": 9000.0}
+    }
+
+
+def test_streams_request_usage_and_refund_from_the_final_chunk():
+    llm = fake_llm(lambda request: FakeStream(["Once ", "upon"], total_tokens=7), rate_limiter=RateLimiter(tokens_per_minute=60_000))
+
+    assert "".join(llm.generate_stream("Tell a story", max_tokens=5_000)) == "Once upon"
+
+    assert llm.client.chat.completions.calls[0]["stream_options"] == {"include_usage": True}
+    # The 5000-token reservation was refunded down to the 7 tokens used
+    assert _level(llm.rate_limiter, llm.model) == pytest.approx(60_000 - 7, abs=50)
@@ -0,0 +1,105 @@
+"""Tests for retry classification, backoff and the shared retry budget."""
+
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import openai
+import pytest
+
+from tnl.llm.retry import RetryBudget, RetryPolicy, is_retryable
+
+from conftest import chat_response, fake_llm
+
+
+def _api_error(cls, status: Optional[int] = None, headers: Optional[Dict[str, str]] = None):
+    """An openai error instance without a real HTTP exchange."""
+    error = cls.__new__(cls)
+    Exception.__init__(error, cls.__name__)
+    error.message = cls.__name__
+    error.code = error.param = error.body = None
+    error.response = SimpleNamespace(headers=headers or {})
+    if status is not None:
+        error.status_code = status
+    return error
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (_api_error(openai.APITimeoutError), True),
+    (_api_error(openai.APIConnectionError), True),
+    (_api_error(openai.RateLimitError, 429), True),
+    (_api_error(openai.InternalServerError, 503), True),
+    (_api_error(openai.InternalServerError, 599), True),
+    (_api_error(openai.BadRequestError, 400), False),
+    (_api_error(openai.AuthenticationError, 401), False),
+    (ValueError("not an API error"), False),
+])
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_backoff_is_jittered_capped_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    error = _api_error(openai.InternalServerError, 503)
+
+    delays = [policy.backoff(attempt, error) for attempt in range(1, 8) for _ in range(50)]
+    assert all(0.0 <= delay <= 5.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+    assert policy.backoff(1, _api_error(openai.RateLimitError, 429, {"retry-after": "3"})) >= 3.0
+    assert policy.backoff(1, _api_error(openai.RateLimitError, 429, {"retry-after": "60"})) <= 5.0
+
+
+def test_budget_only_refills_from_successes():
+    budget = RetryBudget(ratio=0.5, floor_per_second=0.0, capacity=2)
+
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_state_gives_up_on_permanent_errors_attempts_deadline_and_budget():
+    error = _api_error(openai.InternalServerError, 503)
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    state = policy.start()
+    assert state.next_delay(_api_error(openai.BadRequestError, 400)) is None
+    state = policy.start()
+    assert state.next_delay(error) is not None
+    assert state.next_delay(error) is not None
+    assert state.next_delay(error) is None
+    assert policy.stats()["retries"] == 2 and policy.stats()["gave_up"] == 2
+
+    assert RetryPolicy(base_delay=10.0, max_delay=10.0, deadline=0.0).start().next_delay(
+        _api_error(openai.RateLimitError, 429, {"retry-after": "5"})
+    ) is None
+
+    drained = RetryPolicy(budget=RetryBudget(floor_per_second=0.0, capacity=0.5))
+    assert drained.start().next_delay(error) is None
+    assert drained.stats()["budget_exhausted"] == 1
+
+
+def test_client_retries_transient_errors_only():
+    failures = iter([_api_error(openai.InternalServerError, 503), _api_error(openai.APIConnectionError)])
+
+    def flaky(request):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return chat_response("made it")
+
+    llm = fake_llm(flaky)
+    assert llm.generate("Hello") == "made it"
+    assert len(llm.client.chat.completions.calls) == 3
+    assert llm.retry_policy.stats()["retries"] == 2
+
+    def rejected(request):
+        raise _api_error(openai.BadRequestError, 400)
+
+    llm = fake_llm(rejected)
+    with pytest.raises(openai.BadRequestError):
+        llm.generate("Hello")
+    assert len(llm.client.chat.completions.calls) == 1
@@ -0,0 +1,76 @@
+"""Tests for background archival of cold scenes in GameplayPhase."""
+
+import threading
+
+from tnl.models.campaign import CampaignPhase, CampaignState
+from tnl.models.simulation import SceneSimulation, Secret
+from tnl.phases.gameplay import GameplayPhase
+
+
+class SlowArchiveRepository:
+    """Wraps the in-memory repository, holding archive writes until released."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.release = threading.Event()
+        self.saves = 0
+
+    def archive_scene(self, campaign_id, scene):
+        self.release.wait(5)
+        return self.inner.archive_scene(campaign_id, scene)
+
+    def save_runtime_state(self, campaign_id, state):
+        self.saves += 1
+        self.inner.save_runtime_state(campaign_id, state)
+
+
+def _state() -> CampaignState:
+    state = CampaignState(campaign_id="c1", phase=CampaignPhase.GAMEPLAY, current_turn=20)
+    for location in ("Docks", "Chapel"):
+        state.simulation.add_scene(
+            SceneSimulation(location=location, secrets=[Secret(id=f"s-{location}", description="x")]),
+            current_turn=0,
+        )
+    state.current_location = "Chapel"
+    state.simulation.current_location = "Chapel"
+    state.simulation.touch_scene("Chapel", 20)
+    return state
+
+
+def _phase(repo) -> GameplayPhase:
+    return GameplayPhase(llm_client=object(), repository=repo, scene_idle_turns=15, speculate_scenes=False)
+
+
+def test_archival_does_not_block_save_and_evicts_later(memory_repo):
+    repo = SlowArchiveRepository(memory_repo)
+    phase = _phase(repo)
+    state = _state()
+    try:
+        phase._save_state(state)  # Returns while the archive write is still blocked
+        assert repo.saves == 1
+        assert not state.simulation.scenes["Docks"].archived
+
+        repo.release.set()
+        phase._archive_batch[0].result(5)
+        phase._save_state(state)
+        assert state.simulation.scenes["Docks"].archived
+        assert not state.simulation.scenes["Chapel"].archived
+        assert memory_repo.load_archived_scene("c1", "Docks").secrets[0].id == "s-Docks"
+    finally:
+        phase.close()
+
+
+def test_scene_visited_during_archival_stays_resident(memory_repo):
+    repo = SlowArchiveRepository(memory_repo)
+    phase = _phase(repo)
+    state = _state()
+    try:
+        phase._save_state(state)
+        state.simulation.touch_scene("Docks", 21)
+        repo.release.set()
+        phase._archive_batch[0].result(5)
+        phase._save_state(state)
+        assert not state.simulation.scenes["Docks"].archived
+        assert state.simulation.scenes["Docks"].secrets
+    finally:
+        phase.close()
@@ -0,0 +1,140 @@
+"""Tests for the local SQLite backend."""
+
+import hashlib
+import json
+from typing import List
+
+import pytest
+
+from tnl.models.campaign import CampaignPhase, CampaignState
+from tnl.models.simulation import SceneSimulation, Secret
+from tnl.persistence import SQLiteCampaignRepository
+
+
+class FakeEmbedder:
+    """Deterministic stand-in for LLMClient.embed/embed_batch."""
+
+    def embed_batch(self, texts: List[str], model: str = "") -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+    def embed(self, text: str, model: str = "") -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 for b in digest[:8]]
+
+
+class CharTokenizer:
+    """Offline stand-in for the tiktoken encoding (one token per character)."""
+
+    def encode(self, text: str) -> List[int]:
+        return [ord(c) for c in text]
+
+    def decode(self, ids: List[int]) -> str:
+        return "".join(map(chr, ids))
+
+
+def _open(path: str) -> SQLiteCampaignRepository:
+    repo = SQLiteCampaignRepository(path=path, llm_client=FakeEmbedder())
+    repo._tokenizer = CharTokenizer()
+    return repo
+
+
+def _load(path: str, campaign_id: str) -> CampaignState:
+    """Load runtime state through a fresh repository (no in-process snapshot)."""
+    repo = _open(path)
+    try:
+        return repo.load_runtime_state(campaign_id)
+    finally:
+        repo.close()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = _open(str(tmp_path / "tnl.db"))
+    yield repo
+    repo.close()
+
+
+def test_resaving_chunk_does_not_duplicate_embeddings(repo):
+    campaign_id = repo.save_seed_chunk(0, "The harbour town of Vell.")
+    repo.save_seed_chunk(0, "The harbour town of Vell.", campaign_id)
+    repo.save_seed_chunk(1, "A ruined abbey on the cliffs.", campaign_id)
+
+    rows = repo._load_chunk_embeddings(campaign_id)
+    assert [chunk for chunk, _ in rows] == ["The harbour town of Vell.", "A ruined abbey on the cliffs."]
+
+    results = repo.query_similar_chunks(campaign_id, "harbour", top_k=5)
+    assert len(results) == 2
+    assert len({r["chunk"] for r in results}) == 2
+
+
+def test_hydrated_index_has_no_duplicates(repo):
+    campaign_id = repo.save_seed_chunk(0, "Vell")
+    repo.save_seed_chunk(0, "Vell", campaign_id)
+
+    resumed = _open(repo.path)
+    try:
+        assert [r["chunk"] for r in resumed.query_similar_chunks(campaign_id, "Vell")] == ["Vell"]
+    finally:
+        resumed.close()
+
+
+def _state(turn: int) -> CampaignState:
+    state = CampaignState(phase=CampaignPhase.GAMEPLAY, genre="Noir", current_turn=turn)
+    for i in range(turn):
+        state.add_message("user", f"action {i}")
+        state.inventory.add(f"clue {i}")
+    return state
+
+
+def test_checkpoint_and_deltas_replay_after_reopening(repo):
+    for turn in range(1, 6):
+        repo.save_runtime_state("c1", _state(turn))
+
+    rows = repo._conn.execute("SELECT seq FROM runtime_deltas WHERE campaign_id = 'c1' ORDER BY seq").fetchall()
+    assert [seq for seq, in rows] == [1, 2, 3, 4]
+
+    resumed = _open(repo.path)
+    try:
+        loaded = resumed.load_runtime_state("c1")
+        assert loaded.current_turn == 5
+        assert list(loaded.inventory) == [f"clue {i}" for i in range(5)]
+        assert loaded.message_history == _state(5).message_history
+
+        # The replayed state is the base of the next delta
+        resumed.save_runtime_state("c1", _state(6))
+        assert _load(repo.path, "c1").current_turn == 6
+    finally:
+        resumed.close()
+
+
+def test_rewritten_delta_is_not_applied_twice(repo):
+    repo.save_runtime_state("c1", _state(1))
+    state_json = repo.build_state_json("c1", _state(2))
+    repo.save_state_json("c1", state_json)
+    checkpoint_id, seq, patch = repo._conn.execute("SELECT checkpoint_id, seq, patch FROM runtime_deltas").fetchone()
+
+    # A retried write of the same delta upserts its row
+    repo._write_delta("c1", checkpoint_id, seq, json.loads(patch))
+    assert repo._conn.execute("SELECT COUNT(*) FROM runtime_deltas").fetchone() == (1,)
+    assert _load(repo.path, "c1").current_turn == 2
+
+
+def test_scene_archive_round_trip(repo):
+    scene = SceneSimulation(
+        location="Docks",
+        location_description="Fog over the piers",
+        secrets=[Secret(id="s1", description="A body under the boards")],
+    )
+    assert repo.archive_scene("c1", scene)
+    scene.secrets[0].discovered = True
+    assert repo.archive_scene("c1", scene)
+
+    resumed = _open(repo.path)
+    try:
+        loaded = resumed.load_archived_scene("c1", "Docks")
+        assert loaded.location_description == "Fog over the piers"
+        assert loaded.secrets[0].discovered
+        assert resumed.load_archived_scene("c1", "Chapel") is None
+        assert resumed.load_archived_scene("c2", "Docks") is None
+    finally:
+        resumed.close()
@@ -0,0 +1,114 @@
+"""Tests for strict structured outputs and the fallback to JSON mode."""
+
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import openai
+import pytest
+from pydantic import BaseModel, Field
+
+from tnl.llm.schema import JSON_OBJECT_FORMAT, strict_response_format
+from tnl.models.campaign import CharacterSheet
+
+from conftest import chat_response, fake_llm
+
+
+class Item(BaseModel):
+    name: str = Field(min_length=1)
+    weight: float = 1.0
+
+
+class Loot(BaseModel):
+    items: List[Item] = Field(default_factory=list, max_length=5)
+    note: Optional[str] = None
+
+
+class Stats(BaseModel):
+    name: str
+    stats: Dict[str, int] = Field(default_factory=dict)
+
+
+def _bad_request(message: str, code: Optional[str] = None, param: Optional[str] = None) -> openai.BadRequestError:
+    error = openai.BadRequestError.__new__(openai.BadRequestError)
+    Exception.__init__(error, message)
+    error.message = message
+    error.status_code = 400
+    error.code = code
+    error.param = param
+    error.body = {"message": message, "code": code, "param": param}
+    error.response = SimpleNamespace(headers={})
+    return error
+
+
+def _llm(first_error: openai.BadRequestError):
+    """Client whose first strict request fails with ``first_error``."""
+    def chat(request):
+        if request["response_format"] is not JSON_OBJECT_FORMAT and not chat.failed:
+            chat.failed = True
+            raise first_error
+        return chat_response('{"items": [{"name": "rope"}]}')
+    chat.failed = False
+    return fake_llm(chat, max_retries=1)
+
+
+def test_strict_format_lists_every_property_and_drops_validation_keywords():
+    payload = strict_response_format(Loot)
+    assert payload["type"] == "json_schema"
+    assert payload["json_schema"]["name"] == "Loot" and payload["json_schema"]["strict"] is True
+
+    schema = payload["json_schema"]["schema"]
+    assert schema["required"] == ["items", "note"]
+    assert schema["additionalProperties"] is False
+    assert "default" not in schema["properties"]["note"]
+    assert "maxItems" not in schema["properties"]["items"]
+
+    item = schema["$defs"]["Item"]
+    assert item["required"] == ["name", "weight"]
+    assert item["additionalProperties"] is False
+    assert "minLength" not in item["properties"]["name"]
+
+
+def test_strict_format_leaves_the_model_schema_untouched():
+    strict_response_format(Loot)
+    assert Loot.model_json_schema()["properties"]["items"]["maxItems"] == 5
+
+
+def test_mapping_fields_cannot_be_strict():
+    assert strict_response_format(Stats) is None
+    assert strict_response_format(CharacterSheet) is None
+
+
+def test_mapping_schema_uses_json_mode_and_keeps_its_keys():
+    llm = fake_llm(lambda request: chat_response('{"name": "Ash", "stats": {"grit": 3}}'))
+
+    result = llm.generate_structured("Roll a character", Stats, cache=False)
+
+    assert result.stats == {"grit": 3}
+    assert llm.client.chat.completions.calls[0]["response_format"] is JSON_OBJECT_FORMAT
+    assert llm.structured_fallbacks == 0
+
+
+def test_rejected_schema_falls_back_without_using_an_attempt():
+    error = _bad_request("Invalid schema for response_format 'Loot'", "invalid_json_schema", "response_format")
+    llm = _llm(error)
+
+    result = llm.generate_structured("Search the chest", Loot, cache=False)
+
+    assert result.items[0].name == "rope"
+    assert llm.structured_fallbacks == 1
+    assert [call["response_format"] for call in llm.client.chat.completions.calls][-1] is JSON_OBJECT_FORMAT
+
+
+@pytest.mark.parametrize("error", [
+    _bad_request("This model's maximum context length is 128000 tokens", "context_length_exceeded", "messages"),
+    _bad_request("max_completion_tokens is too large", "invalid_value", "max_completion_tokens"),
+    _bad_request("Your request was rejected as a result of our safety system", "content_policy_violation"),
+])
+def test_other_bad_requests_are_raised_and_keep_strict_mode(error):
+    llm = _llm(error)
+
+    with pytest.raises(openai.BadRequestError):
+        llm.generate_structured("Search the chest", Loot, cache=False)
+
+    assert llm.structured_fallbacks == 0
+    assert llm._use_strict(Loot, True)
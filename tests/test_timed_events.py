@@ -0,0 +1,86 @@
+"""Tests for the timed event schedule (a persisted min-heap of due turns)."""
+
+from typing import Dict, List
+
+from tnl.models.campaign import CampaignState
+from tnl.models.simulation import SceneSimulation, SimulationState, TimedEvent
+from tnl.simulation import SimulationEvaluator
+
+
+class FakeEmbedder:
+    def embed_batch(self, texts: List[str], model: str = "") -> List[List[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+
+def _run(state: CampaignState, turns: int) -> Dict[int, List[str]]:
+    """Advance ``turns`` turns; reported event ids by turn."""
+    evaluator = SimulationEvaluator(FakeEmbedder())
+    fired = {}
+    for _ in range(turns):
+        results = evaluator.advance_timed_events(state)
+        if results:
+            fired[state.current_turn] = [r.element_id for r in results]
+    return fired
+
+
+def _state(*events: TimedEvent) -> CampaignState:
+    simulation = SimulationState()
+    for event in events:
+        simulation.add_timed_event(event, current_turn=0)
+    simulation.add_scene(SceneSimulation(location="Docks"))
+    simulation.add_scene(SceneSimulation(location="Tavern"))
+    return CampaignState(simulation=simulation, current_location="Tavern")
+
+
+def test_staged_event_keeps_its_cadence_and_then_stops():
+    storm = TimedEvent(id="storm", name="Storm", turns_per_stage=3, max_stages=3)
+    state = _state(storm)
+
+    assert _run(state, 12) == {3: ["storm"], 6: ["storm"]}
+    assert storm.current_stage == 2 and not storm.active
+    assert state.simulation.timed_schedule == []
+
+
+def test_due_events_come_out_in_declaration_order():
+    state = _state(
+        TimedEvent(id="b", name="B", turns_per_stage=2),
+        TimedEvent(id="a", name="A", turns_per_stage=4),
+    )
+
+    assert _run(state, 4) == {2: ["b"], 4: ["b", "a"]}
+
+
+def test_one_shot_fires_once_after_the_delay():
+    state = _state()
+    state.simulation.schedule_after(TimedEvent(id="bell", name="Bell"), turns=3, current_turn=2)
+    state.current_turn = 2
+
+    assert _run(state, 10) == {5: ["bell"]}
+
+
+def test_scene_events_progress_away_but_report_only_in_their_scene():
+    state = _state()
+    fire = TimedEvent(id="fire", name="Fire", turns_per_stage=2, max_stages=4)
+    state.simulation.add_timed_event(fire, current_turn=0, location="Docks")
+
+    assert _run(state, 4) == {}
+    assert fire.current_stage == 2
+
+    state.current_location = "Docks"
+    assert _run(state, 2) == {6: ["fire"]}
+
+
+def test_schedule_survives_a_save_and_old_saves_are_rebuilt():
+    state = _state(TimedEvent(id="storm", name="Storm", turns_per_stage=3, max_stages=5))
+    _run(state, 4)
+
+    reloaded = CampaignState.model_validate(state.model_dump(mode="json"))
+    assert reloaded.simulation.timed_schedule == [(6, "storm")]
+    assert _run(reloaded, 2) == {6: ["storm"]}
+    assert reloaded.simulation.timed_schedule == [(9, "storm")]
+
+    legacy = state.model_dump(mode="json")
+    legacy["simulation"]["timed_schedule"] = []
+    legacy_state = CampaignState.model_validate(legacy)
+    assert _run(legacy_state, 2) == {6: ["storm"]}
+    assert legacy_state.simulation.timed_schedule == [(9, "storm")]
@@ -0,0 +1,55 @@
+"""Tests for the Aho-Corasick keyword automaton and the trigger index."""
+
+import random
+
+import pytest
+
+from tnl.models.simulation import TriggerCondition, TriggerType, Watcher
+from tnl.simulation.trigger_index import KeywordAutomaton, TriggerIndex
+
+
+def _naive(patterns, text):
+    return {i for i, pattern in enumerate(patterns) if pattern in text}
+
+
+@pytest.mark.parametrize("patterns, text", [
+    (["he", "she", "his", "hers"], "ushers"),
+    (["a", "ab", "bab", "bc", "bca", "c", "caa"], "abccab"),
+    (["knife", "knif", "nife", "if"], "a knife"),
+    (["dragon", "drag"], "the dra gon"),
+    (["", "x"], "nothing here"),
+    (["same", "same"], "the same"),
+])
+def test_search_matches_naive_substring_search(patterns, text):
+    assert KeywordAutomaton(patterns).search(text) == _naive(patterns, text)
+
+
+def test_search_matches_naive_on_random_inputs():
+    rng = random.Random(3)
+    for _ in range(200):
+        patterns = ["".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+        text = "".join(rng.choices("abc ", k=rng.randint(0, 30)))
+        assert KeywordAutomaton(patterns).search(text) == _naive(patterns, text)
+
+
+def _watcher(watcher_id, *keywords):
+    trigger = TriggerCondition(trigger_type=TriggerType.KEYWORD, keywords=list(keywords), probability=1.0)
+    return "watcher", Watcher(id=watcher_id, name=watcher_id, triggers=[trigger])
+
+
+def test_index_returns_elements_by_keyword_until_retired():
+    index = TriggerIndex([_watcher("guard", "Sword", "steal"), _watcher("cat", "fish"), _watcher("thief", "steal")])
+
+    assert index.candidates("i steal the fish") == [(0, [0]), (1, [0]), (2, [0])]
+    assert index.candidates("i wave my sword") == [(0, [0])]
+    assert index.candidates("i sing") == []
+
+    index.retire(0)
+    assert index.candidates("i steal a sword") == [(2, [0])]
+
+
+def test_index_skips_elements_that_already_fired():
+    kind, fired = _watcher("guard", "sword")
+    fired.triggered = True
+
+    assert TriggerIndex([(kind, fired)]).candidates("sword") == []
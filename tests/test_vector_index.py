@@ -0,0 +1,60 @@
+"""Tests for the in-process cosine top-k vector index."""
+
+import numpy as np
+import pytest
+
+from tnl.persistence.vector_index import VectorIndex
+
+
+def _index() -> VectorIndex:
+    index = VectorIndex()
+    index.add(["north", "east", "northeast"], [[0, 2], [3, 0], [1, 1]])
+    return index
+
+
+def test_search_ranks_by_cosine_similarity():
+    results = _index().search([0.1, 1.0], top_k=3)
+
+    assert [r["chunk"] for r in results] == ["north", "northeast", "east"]
+    assert results[0]["similarity"] == pytest.approx(1.0 / np.hypot(0.1, 1.0))
+    assert results[2]["similarity"] == pytest.approx(0.1 / np.hypot(0.1, 1.0))
+
+
+def test_top_k_matches_full_sort():
+    rng = np.random.default_rng(7)
+    embeddings = rng.normal(size=(50, 8))
+    index = VectorIndex()
+    index.add([f"chunk {i}" for i in range(50)], embeddings)
+
+    query = rng.normal(size=8)
+    expected = np.argsort(-(embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)) @ query)[:5]
+    assert [r["chunk"] for r in index.search(query, top_k=5)] == [f"chunk {i}" for i in expected]
+
+
+def test_edge_cases():
+    assert VectorIndex().search([1.0, 0.0]) == []
+    assert _index().search([1.0, 0.0], top_k=0) == []
+    assert len(_index().search([1.0, 0.0], top_k=10)) == 3
+
+    index = VectorIndex()
+    index.add(["zero"], [[0.0, 0.0]])
+    assert index.search([1.0, 0.0])[0]["similarity"] == 0.0
+
+
+def test_re_adding_a_chunk_replaces_its_embedding():
+    index = _index()
+    index.add(["east", "south", "south"], [[0, 1], [0, -1], [0, -2]])
+
+    assert len(index) == 4
+    results = index.search([0, 1], top_k=4)
+    assert [r["chunk"] for r in results][:2] in (["north", "east"], ["east", "north"])
+    assert results[-1]["chunk"] == "south"
+
+
+def test_searches_keep_the_matrix_they_started_with():
+    index = _index()
+    before = index._matrix
+    index.add(["west"], [[-1, 0]])
+
+    assert before.shape[0] == 3
+    assert index._matrix.shape[0] == 4
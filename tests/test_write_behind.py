@@ -0,0 +1,93 @@
+"""Tests for WriteBehindSaver queueing, coalescing and flush/close ordering."""
+
+import threading
+from typing import Any, Dict
+
+from tnl.models.campaign import CampaignPhase, CampaignState
+from tnl.persistence.write_behind import WriteBehindSaver
+
+from conftest import InMemoryRepository
+
+
+class GatedRepository(InMemoryRepository):
+    """Repository whose saves wait for ``gate`` and record the saved turns."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.saved = []
+        self.fail = False
+
+    def save_state_json(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        self.started.set()
+        self.gate.wait(5)
+        if self.fail:
+            raise ConnectionError("backend down")
+        self.saved.append((campaign_id, state_json["current_turn"]))
+
+
+def _state(turn: int) -> CampaignState:
+    return CampaignState(phase=CampaignPhase.GAMEPLAY, genre="Fantasy", current_turn=turn)
+
+
+def test_queued_saves_for_a_campaign_coalesce_to_the_latest():
+    repo = GatedRepository()
+    saver = WriteBehindSaver(repo)
+    saver.submit("c1", _state(1))
+    assert repo.started.wait(5)  # Turn 1 is in flight
+
+    saver.submit("c1", _state(2))
+    saver.submit("c1", _state(3))
+    saver.submit("c2", _state(1))
+    assert saver.pending_count == 2
+
+    repo.gate.set()
+    assert saver.flush(5)
+    assert repo.saved == [("c1", 1), ("c1", 3), ("c2", 1)]
+    assert (saver.submitted, saver.written, saver.coalesced) == (4, 3, 1)
+    saver.close()
+
+
+def test_flush_waits_for_the_write_in_flight():
+    repo = GatedRepository()
+    saver = WriteBehindSaver(repo)
+    saver.submit("c1", _state(1))
+    assert repo.started.wait(5)
+
+    # Nothing is pending any more, but the upload hasn't finished
+    assert saver.pending_count == 0
+    assert not saver.flush(timeout=0.05)
+
+    repo.gate.set()
+    assert saver.flush(5)
+    assert repo.saved == [("c1", 1)]
+    saver.close()
+
+
+def test_close_drains_the_queue_then_saves_synchronously():
+    repo = GatedRepository()
+    saver = WriteBehindSaver(repo)
+    saver.submit("c1", _state(1))
+    saver.submit("c2", _state(1))
+    threading.Timer(0.05, repo.gate.set).start()
+
+    saver.close(timeout=5)
+    assert sorted(repo.saved) == [("c1", 1), ("c2", 1)]
+
+    saver.submit("c1", _state(2))
+    assert repo.saved[-1] == ("c1", 2)
+    assert saver.pending_count == 0
+
+
+def test_failed_saves_are_counted_not_raised():
+    repo = GatedRepository()
+    repo.fail = True
+    repo.gate.set()
+    saver = WriteBehindSaver(repo)
+
+    saver.submit("c1", _state(1))
+    assert saver.flush(5)
+    assert saver.failed == 1 and saver.written == 0
+    assert isinstance(saver.last_error, ConnectionError)
+    saver.close()
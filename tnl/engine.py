@@ -7,11 +7,11 @@ This is the core of the refactored architecture. The engine:
 """
 
 import logging
-from typing import Dict, Optional, Type
+from typing import Dict, Iterator, Optional, Type
 
 from .llm import LLMClient
 from .models.campaign import CampaignPhase, CampaignState
-from .persistence import CampaignRepository
+from .persistence import BaseCampaignRepository, WriteBehindSaver, create_repository
 from .phases import (
     CharacterPhase,
     GameplayPhase,
@@ -35,17 +35,20 @@ class CampaignEngine:
     def __init__(
         self,
         llm_client: Optional[LLMClient] = None,
-        repository: Optional[CampaignRepository] = None,
+        repository: Optional[BaseCampaignRepository] = None,
     ):
         self.llm = llm_client or LLMClient()
-        self.repository = repository or CampaignRepository(llm_client=self.llm)
+        self.repository = repository or create_repository(llm_client=self.llm)
+
+        # Per-turn saves are written behind; flush()/close() guarantee durability
+        self.saver = WriteBehindSaver(self.repository)
 
         # Initialize phase handlers
         self._phases: Dict[CampaignPhase, Phase] = {
             CampaignPhase.ONBOARDING: OnboardingPhase(self.llm),
             CampaignPhase.CHARACTER: CharacterPhase(self.llm),
             CampaignPhase.WORLD_GEN: WorldGenPhase(self.llm, self.repository),
-            CampaignPhase.GAMEPLAY: GameplayPhase(self.llm, self.repository),
+            CampaignPhase.GAMEPLAY: GameplayPhase(self.llm, self.repository, saver=self.saver),
         }
 
         # Current campaign state
@@ -74,6 +77,9 @@ class CampaignEngine:
         """
         logger.info(f"Attempting to resume campaign: {campaign_id}")
 
+        # Make sure any queued save of this campaign lands before reading it back
+        self.saver.flush()
+
         state = self.repository.load_runtime_state(campaign_id)
         if not state:
             return None
@@ -81,6 +87,9 @@ class CampaignEngine:
         self.state = state
         self.state.campaign_id = campaign_id
 
+        # Context retrieval index is rebuilt lazily on the first gameplay query
+        self.repository.hydrate_index(campaign_id, state.seed_chunks)
+
         # Determine appropriate phase
         if state.phase == CampaignPhase.GAMEPLAY:
             # Resume gameplay
@@ -150,6 +159,38 @@ class CampaignEngine:
 
         return result.display_message
 
+    def handle_input_stream(self, user_input: str) -> Iterator[str]:
+        """
+        Streaming variant of :meth:`handle_input`.
+
+        Gameplay narration (including the intro after "continue") is yielded
+        token by token. Everything before the narration starts (the
+        simulation layer, or the whole response of phases that aren't
+        streamed) runs before this returns; other phases' response is then
+        yielded as a single chunk.
+
+        Args:
+            user_input: What the user typed
+
+        Returns:
+            Iterator over response text fragments to display in order
+        """
+        gameplay_handler = self._phases[CampaignPhase.GAMEPLAY]
+
+        if self.state and self.state.phase == CampaignPhase.GAMEPLAY:
+            return gameplay_handler.handle_input_stream(user_input, self.state)
+
+        if (
+            self.state
+            and self.state.phase == CampaignPhase.READY
+            and "continue" in user_input.lower()
+        ):
+            # Transition to gameplay and stream the intro
+            self.state.phase = CampaignPhase.GAMEPLAY
+            return gameplay_handler.handle_input_stream("", self.state)
+
+        return iter([self.handle_input(user_input)])
+
     def _enter_phase(self, phase: CampaignPhase) -> str:
         """Enter a phase and return its welcome message."""
         self.state.phase = phase
@@ -160,6 +201,27 @@ class CampaignEngine:
 
         return handler.enter(self.state)
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until queued state saves are persisted.
+
+        Returns:
+            True if everything was written, False on timeout
+        """
+        return self.saver.flush(timeout)
+
+    def close(self) -> None:
+        """Persist outstanding saves and stop background workers."""
+        self.saver.close()
+        for phase in self._phases.values():
+            phase.close()
+
+    def __enter__(self) -> "CampaignEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     @property
     def current_phase(self) -> Optional[CampaignPhase]:
         """Get current phase."""
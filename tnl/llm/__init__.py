@@ -1,5 +1,19 @@
 """LLM client abstraction."""
 
+from .cache import EmbeddingCache, ResponseCache, get_default_embedding_cache, get_default_response_cache
 from .client import LLMClient
+from .rate_limit import RateLimiter, get_default_rate_limiter
+from .retry import RetryBudget, RetryPolicy, get_default_retry_policy
 
-__all__ = ["LLMClient"]
+__all__ = [
+    "LLMClient",
+    "EmbeddingCache",
+    "ResponseCache",
+    "RateLimiter",
+    "RetryPolicy",
+    "RetryBudget",
+    "get_default_embedding_cache",
+    "get_default_response_cache",
+    "get_default_rate_limiter",
+    "get_default_retry_policy",
+]
@@ -0,0 +1,298 @@
+"""Content-addressed caches for LLM calls."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_EMBEDDING_CACHE_SIZE = 10_000
+
+DEFAULT_RESPONSE_CACHE_SIZE = 5_000
+DEFAULT_RESPONSE_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for accounting."""
+    return max(1, len(text) // 4)
+
+
+class EmbeddingCache:
+    """
+    Embedding cache keyed by model name + SHA-256 of the text.
+
+    Holds an in-memory LRU of recent vectors and, if ``path`` is given, an
+    on-disk SQLite store that survives restarts. Thread-safe, so one cache
+    can be shared by every ``LLMClient`` in the process.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_EMBEDDING_CACHE_SIZE,
+        path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.path = path
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0  # Estimated tokens not sent upstream thanks to hits
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key for a (model, text) pair."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for several texts.
+
+        Returns:
+            One entry per text: the cached vector, or None on a miss
+        """
+        keys = [self.key(model, text) for text in texts]
+        results: List[Optional[List[float]]] = []
+
+        with self._lock:
+            for text, key in zip(texts, keys):
+                vector = self._memory.get(key)
+                if vector is None and self._db is not None:
+                    row = self._db.execute(
+                        "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row:
+                        vector = array("f", row[0]).tolist()
+                        self._remember(key, vector)
+                elif vector is not None:
+                    self._memory.move_to_end(key)
+
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self.saved_tokens += estimate_tokens(text)
+                results.append(vector)
+
+        return results
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[List[float]]) -> None:
+        """Store embeddings for several texts."""
+        with self._lock:
+            rows = []
+            for text, vector in zip(texts, vectors):
+                key = self.key(model, text)
+                self._remember(key, list(vector))
+                rows.append((key, array("f", vector).tobytes()))
+
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and estimated saved tokens."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "entries": len(self._memory),
+            }
+
+    def clear(self) -> None:
+        """Drop every cached vector (memory and disk) and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+            self.hits = self.misses = self.saved_tokens = 0
+
+    def close(self) -> None:
+        """Close the on-disk store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Insert into the in-memory LRU (caller holds the lock)."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+_default_embedding_cache: Optional[EmbeddingCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_embedding_cache() -> EmbeddingCache:
+    """
+    Process-wide embedding cache shared by every ``LLMClient``.
+
+    Persists to ``TNL_EMBED_CACHE_PATH`` if set, otherwise memory only.
+    """
+    global _default_embedding_cache
+    with _default_lock:
+        if _default_embedding_cache is None:
+            _default_embedding_cache = EmbeddingCache(path=os.getenv("TNL_EMBED_CACHE_PATH") or None)
+        return _default_embedding_cache
+
+
+class ResponseCache:
+    """
+    On-disk cache of chat completion responses.
+
+    Keyed by SHA-256 of the full request (model, messages, temperature,
+    max tokens and response format/schema), so only byte-identical requests
+    hit. Entries expire after ``ttl`` seconds (None = never) and the least
+    recently used ones are evicted beyond ``max_entries``. Pass ``":memory:"``
+    as ``path`` for a process-local cache. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_SIZE,
+        ttl: Optional[float] = DEFAULT_RESPONSE_CACHE_TTL,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        self._db: Optional[sqlite3.Connection] = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self._db.commit()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0  # Estimated completion tokens not generated thanks to hits
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        """Cache key for a request (canonical JSON of its kwargs)."""
+        payload = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, request: Dict[str, Any]) -> Optional[str]:
+        """Cached response content for a request, or None on a miss."""
+        key = self.key(request)
+        now = time.time()
+
+        with self._lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            self.saved_tokens += estimate_tokens(row[0])
+            return row[0]
+
+    def put(self, request: Dict[str, Any], content: str) -> None:
+        """Store a response, evicting least recently used entries beyond ``max_entries``."""
+        now = time.time()
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, content, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (self.key(request), content, now, now),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and estimated saved tokens."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if self._db else 0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "entries": entries,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached response and reset counters."""
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+            self.hits = self.misses = self.saved_tokens = 0
+
+    def close(self) -> None:
+        """Close the store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_default_response_cache: Optional[ResponseCache] = None
+
+
+def get_default_response_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide response cache, if enabled.
+
+    Response caching is opt-in: returns None unless ``TNL_RESPONSE_CACHE_PATH``
+    is set (``TNL_RESPONSE_CACHE_TTL`` overrides the TTL in seconds; 0 = never
+    expire).
+    """
+    global _default_response_cache
+    path = os.getenv("TNL_RESPONSE_CACHE_PATH")
+    if not path:
+        return None
+    with _default_lock:
+        if _default_response_cache is None:
+            ttl = float(os.getenv("TNL_RESPONSE_CACHE_TTL", DEFAULT_RESPONSE_CACHE_TTL))
+            _default_response_cache = ResponseCache(path=path, ttl=ttl or None)
+        return _default_response_cache
@@ -1,14 +1,35 @@
-"""OpenAI Chat Completions client wrapper."""
+"""OpenAI Chat Completions client wrapper.
 
+Every call has a blocking and an ``*_async`` variant. Both share the same
+request-building and parsing helpers, so the sync methods stay thin and the
+async ones can be driven by a single event loop across many campaigns.
+"""
+
+import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Type, TypeVar
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type, TypeVar
 
 import certifi
 import openai
 from pydantic import BaseModel, ValidationError
 
+from .cache import (
+    EmbeddingCache,
+    ResponseCache,
+    estimate_tokens,
+    get_default_embedding_cache,
+    get_default_response_cache,
+)
+from .rate_limit import Permit, RateLimiter, get_default_rate_limiter
+from .retry import RetryPolicy, get_default_retry_policy
+from .schema import JSON_OBJECT_FORMAT, schema_prompt, strict_response_format
+
 # Fix SSL certificate issues on Windows
 os.environ.setdefault("SSL_CERT_FILE", certifi.where())
 os.environ.setdefault("REQUESTS_CA_BUNDLE", certifi.where())
@@ -17,12 +38,53 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# Ask streams to end with a usage chunk, so the limiter can settle their tokens
+STREAM_USAGE = {"include_usage": True}
+
+# Hedged requests: at most this fraction of hedged calls send a second request
+DEFAULT_HEDGE_RATIO = 0.1
+# Hedge delay until enough latencies are observed to estimate p95 (seconds)
+DEFAULT_HEDGE_DELAY = 8.0
+DEFAULT_STREAM_HEDGE_DELAY = 2.0  # Streams race to their first delta
+MIN_HEDGE_DELAY = 0.5
+HEDGE_MIN_SAMPLES = 20
+HEDGE_LATENCY_WINDOW = 200
+# Threads for hedge requests, shared by all concurrent hedged calls (two each at most)
+HEDGE_MAX_WORKERS = 32
+
 
 class LLMClient:
     """
     Wrapper around OpenAI Chat Completions API.
 
-    Provides structured output support and retry logic.
+    Provides structured output support and retry logic. Transient API
+    failures (timeouts, connection errors, 429s, 5xx) are retried on every
+    call under a :class:`RetryPolicy` (by default the process-wide one, with
+    a shared retry budget). Structured calls use
+    strict ``json_schema`` outputs by default, so responses match the schema
+    on the first try; the validate-and-re-ask loop is only a fallback (also
+    used in loose JSON mode for schemas the provider rejects). The blocking methods
+    use ``openai.OpenAI``; the ``*_async`` methods use ``openai.AsyncOpenAI``,
+    which is created lazily on first use.
+
+    Embeddings go through an :class:`EmbeddingCache` (by default the
+    process-wide one), so only texts not seen before are sent upstream.
+
+    Chat responses can be served from an opt-in :class:`ResponseCache`
+    (``response_cache``, or the process-wide one if ``TNL_RESPONSE_CACHE_PATH``
+    is set). Identical requests then return the stored text without an API
+    call. By default only temperature-0 calls use it, since replaying a
+    sampled response (narration, a character, a scene) would repeat it word
+    for word. Pass ``cache=True``/``False`` to override.
+
+    Every upstream request takes a permit from a :class:`RateLimiter` (by
+    default the process-wide one), which paces each model's requests and
+    tokens per minute across all clients and backs off when the provider returns 429.
+
+    Latency-critical calls can pass ``hedge=True`` to :meth:`generate`: if
+    the response is slower than the observed p95, an identical second
+    request is sent and whichever finishes first wins (the other is
+    cancelled). ``hedge_ratio`` caps how many calls may hedge.
     """
 
     def __init__(
@@ -30,10 +92,57 @@ class LLMClient:
         model: str = "gpt-5.2",
         api_key: Optional[str] = None,
         max_retries: int = 3,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        use_embedding_cache: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        strict_schemas: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_ratio: float = DEFAULT_HEDGE_RATIO,
+        hedge_delay: Optional[float] = None,
     ):
         self.model = model
+        self.strict_schemas = strict_schemas
         self.max_retries = max_retries
-        self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.embedding_cache = (
+            (embedding_cache or get_default_embedding_cache()) if use_embedding_cache else None
+        )
+        self.response_cache = response_cache or get_default_response_cache()
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.retry_policy = retry_policy or get_default_retry_policy()
+        self._api_key = api_key or os.getenv("OPENAI_API_KEY")
+        # Retries are done by retry_policy, not the SDK
+        self.client = openai.OpenAI(api_key=self._api_key, max_retries=0)
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+
+        # Schemas the provider refused in strict mode (use loose JSON mode)
+        self._strict_rejected: set = set()
+
+        # Structured call counters (see structured_stats)
+        self._stats_lock = threading.Lock()
+        self.structured_calls = 0
+        self.structured_retries = 0
+        self.structured_fallbacks = 0
+        self.structured_retry_seconds = 0.0
+
+        # Hedged requests (see hedge_stats)
+        self.hedge_ratio = hedge_ratio
+        self.fixed_hedge_delay = hedge_delay  # None = derive from observed p95
+        # Latencies of hedged calls, per kind: "text" (whole response) and "stream" (first delta)
+        self._latencies: Dict[str, "deque[float]"] = {
+            kind: deque(maxlen=HEDGE_LATENCY_WINDOW) for kind in ("text", "stream")
+        }
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.hedged_calls = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """Lazy load the async client (only needed by the *_async methods)."""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(api_key=self._api_key, max_retries=0)
+        return self._async_client
 
     def generate(
         self,
@@ -42,6 +151,8 @@ class LLMClient:
         context: Optional[List[Dict[str, str]]] = None,
         max_tokens: int = 1000,
         temperature: float = 0.8,
+        cache: Optional[bool] = None,
+        hedge: bool = False,
     ) -> str:
         """
         Generate a text response.
@@ -52,28 +163,108 @@ class LLMClient:
             context: Optional conversation history
             max_tokens: Maximum response tokens
             temperature: Sampling temperature
+            cache: Use the response cache (if configured) for this call
+                (default: only if ``temperature`` is 0)
+            hedge: Send a backup request if this one is slow (latency-critical calls only)
 
         Returns:
             The generated text response
         """
-        messages = []
-
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-
-        if context:
-            messages.extend(context)
+        kwargs = self._chat_kwargs(prompt, system_prompt, context, max_tokens, temperature)
+        cache = self._use_cache(cache, temperature)
+        cached = self._cached_response(kwargs, cache)
+        if cached is not None:
+            return cached
+
+        if hedge:
+            content = self._generate_hedged(kwargs)
+        else:
+            response = self._send(self.client.chat.completions, self._request_tokens(kwargs), **kwargs)
+            content = response.choices[0].message.content or ""
+        self._store_response(kwargs, content, cache)
+        return content
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        context: Optional[List[Dict[str, str]]] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.8,
+        cache: Optional[bool] = None,
+        hedge: bool = False,
+    ) -> Iterator[str]:
+        """
+        Generate a text response, yielding content deltas as they arrive.
 
-        messages.append({"role": "user", "content": prompt})
+        Takes the same arguments as :meth:`generate`. Joining the yielded
+        deltas gives the same text :meth:`generate` would have returned.
+        With ``hedge=True`` a backup stream is opened if the first delta is
+        slow, and the stream that produces one first is the one yielded.
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_completion_tokens=max_tokens,
-            temperature=temperature,
+        Yields:
+            Non-empty text fragments in order (a cached response is one fragment)
+        """
+        kwargs = self._chat_kwargs(prompt, system_prompt, context, max_tokens, temperature)
+        cache = self._use_cache(cache, temperature)
+        cached = self._cached_response(kwargs, cache)
+        if cached is not None:
+            if cached:
+                yield cached
+            return
+
+        # The permit is held until the stream is drained or closed
+        if hedge:
+            opened = self._generate_hedged(kwargs, kind="stream")
+        else:
+            stream, permit = self._open(
+                self.client.chat.completions, self._request_tokens(kwargs), stream=True, stream_options=STREAM_USAGE, **kwargs
+            )
+            opened = _OpenStream(stream, permit, iter(stream), "")
+        stream, permit = opened.stream, opened.permit
+        parts = []
+        try:
+            if opened.delta:
+                parts.append(opened.delta)
+                yield opened.delta
+            for chunk in opened.chunks:
+                if not chunk.choices:
+                    # The final chunk carries the usage of the whole stream
+                    permit.observe(used_tokens=_usage_tokens(chunk))
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            # Only complete streams are cached
+            self._store_response(kwargs, "".join(parts), cache)
+        finally:
+            # Release the connection if the consumer stops early
+            _close(stream)
+            permit.release()
+
+    async def generate_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        context: Optional[List[Dict[str, str]]] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.8,
+        cache: Optional[bool] = None,
+    ) -> str:
+        """Async variant of :meth:`generate`."""
+        kwargs = self._chat_kwargs(prompt, system_prompt, context, max_tokens, temperature)
+        cache = self._use_cache(cache, temperature)
+        cached = self._cached_response(kwargs, cache)
+        if cached is not None:
+            return cached
+
+        response = await self._send_async(
+            self.async_client.chat.completions, self._request_tokens(kwargs), **kwargs
         )
-
-        return response.choices[0].message.content or ""
+        content = response.choices[0].message.content or ""
+        self._store_response(kwargs, content, cache)
+        return content
 
     def generate_structured(
         self,
@@ -83,11 +274,16 @@ class LLMClient:
         context: Optional[List[Dict[str, str]]] = None,
         max_tokens: int = 2000,
         temperature: float = 0.7,
+        cache: Optional[bool] = None,
+        strict: Optional[bool] = None,
     ) -> T:
         """
         Generate a structured response matching a Pydantic schema.
 
-        Uses OpenAI's JSON mode with schema enforcement.
+        In strict mode the provider enforces the schema while decoding;
+        otherwise JSON mode is used with the schema in the system prompt.
+        Responses that fail validation are re-asked up to ``max_retries``
+        times.
 
         Args:
             prompt: The user prompt
@@ -96,55 +292,109 @@ class LLMClient:
             context: Optional conversation history
             max_tokens: Maximum response tokens
             temperature: Sampling temperature
+            cache: Use the response cache (if configured) for this call
+                (default: only if ``temperature`` is 0)
+            strict: Use strict schema outputs (defaults to ``strict_schemas``)
 
         Returns:
             Parsed Pydantic model instance
 
         Raises:
             ValidationError: If response doesn't match schema after retries
+            openai.BadRequestError: For 400s other than a rejected strict schema
         """
-        messages = []
+        strict = self._use_strict(schema, strict)
+        cache = self._use_cache(cache, temperature)
+        messages, response_format = self._structured_request(prompt, schema, system_prompt, context, strict)
+        cache_key = self._structured_cache_key(messages, schema, max_tokens, temperature, response_format)
+        cached = self._cached_structured(cache_key, schema, cache)
+        if cached is not None:
+            return cached
 
-        # Build system prompt with schema
-        schema_json = json.dumps(schema.model_json_schema(), indent=2)
-        full_system = (system_prompt or "") + f"\n\nRespond with valid JSON matching this schema:\n{schema_json}"
-        messages.append({"role": "system", "content": full_system})
+        last_error = None
+        first_answer_at = None
+        attempt = 0
+        while attempt < self.max_retries:
+            try:
+                request = {
+                    "model": self.model,
+                    "messages": messages,
+                    "max_completion_tokens": max_tokens,
+                    "temperature": temperature,
+                    "response_format": response_format,
+                }
+                response = self._send(self.client.chat.completions, self._request_tokens(request), **request)
+            except openai.BadRequestError as e:
+                if response_format is JSON_OBJECT_FORMAT or not _rejects_schema(e):
+                    raise
+                # Switching modes doesn't use up an attempt
+                messages, response_format = self._strict_fallback(prompt, schema, system_prompt, context, e)
+                continue
+            first_answer_at = first_answer_at or time.monotonic()
+            content = response.choices[0].message.content or "{}"
+            result, last_error = self._parse_structured(content, schema, messages, attempt)
+            if result is not None:
+                self._record_structured(attempt, first_answer_at)
+                self._store_response(cache_key, content, cache)
+                return result
+            attempt += 1
+
+        self._record_structured(max(self.max_retries - 1, 0), first_answer_at)
 
-        if context:
-            messages.extend(context)
+        raise ValidationError.from_exception_data(
+            title=schema.__name__,
+            line_errors=[],
+        ) if last_error is None else last_error
 
-        messages.append({"role": "user", "content": prompt})
+    async def generate_structured_async(
+        self,
+        prompt: str,
+        schema: Type[T],
+        system_prompt: Optional[str] = None,
+        context: Optional[List[Dict[str, str]]] = None,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        cache: Optional[bool] = None,
+        strict: Optional[bool] = None,
+    ) -> T:
+        """Async variant of :meth:`generate_structured`."""
+        strict = self._use_strict(schema, strict)
+        cache = self._use_cache(cache, temperature)
+        messages, response_format = self._structured_request(prompt, schema, system_prompt, context, strict)
+        cache_key = self._structured_cache_key(messages, schema, max_tokens, temperature, response_format)
+        cached = self._cached_structured(cache_key, schema, cache)
+        if cached is not None:
+            return cached
 
         last_error = None
-        for attempt in range(self.max_retries):
+        first_answer_at = None
+        attempt = 0
+        while attempt < self.max_retries:
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    max_completion_tokens=max_tokens,
-                    temperature=temperature,
-                    response_format={"type": "json_object"},
-                )
-
-                content = response.choices[0].message.content or "{}"
-                data = json.loads(content)
-                return schema.model_validate(data)
-
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON parse error on attempt {attempt + 1}: {e}")
-                last_error = e
-            except ValidationError as e:
-                logger.warning(f"Validation error on attempt {attempt + 1}: {e}")
-                last_error = e
-                # Add clarification for next attempt
-                messages.append({
-                    "role": "assistant",
-                    "content": content if "content" in dir() else "{}"
-                })
-                messages.append({
-                    "role": "user",
-                    "content": f"The response didn't match the required schema. Error: {e}. Please try again with valid JSON."
-                })
+                request = {
+                    "model": self.model,
+                    "messages": messages,
+                    "max_completion_tokens": max_tokens,
+                    "temperature": temperature,
+                    "response_format": response_format,
+                }
+                response = await self._send_async(self.async_client.chat.completions, self._request_tokens(request), **request)
+            except openai.BadRequestError as e:
+                if response_format is JSON_OBJECT_FORMAT or not _rejects_schema(e):
+                    raise
+                # Switching modes doesn't use up an attempt
+                messages, response_format = self._strict_fallback(prompt, schema, system_prompt, context, e)
+                continue
+            first_answer_at = first_answer_at or time.monotonic()
+            content = response.choices[0].message.content or "{}"
+            result, last_error = self._parse_structured(content, schema, messages, attempt)
+            if result is not None:
+                self._record_structured(attempt, first_answer_at)
+                self._store_response(cache_key, content, cache)
+                return result
+            attempt += 1
+
+        self._record_structured(max(self.max_retries - 1, 0), first_answer_at)
 
         raise ValidationError.from_exception_data(
             title=schema.__name__,
@@ -162,8 +412,11 @@ class LLMClient:
         Returns:
             Embedding vector
         """
-        response = self.client.embeddings.create(model=model, input=[text])
-        return response.data[0].embedding
+        return self.embed_batch([text], model=model)[0]
+
+    async def embed_async(self, text: str, model: str = "text-embedding-3-small") -> List[float]:
+        """Async variant of :meth:`embed`."""
+        return (await self.embed_batch_async([text], model=model))[0]
 
     def embed_batch(
         self, texts: List[str], model: str = "text-embedding-3-small"
@@ -171,6 +424,9 @@ class LLMClient:
         """
         Generate embeddings for multiple texts.
 
+        Only cache misses are sent upstream (each distinct text once);
+        results are returned in input order.
+
         Args:
             texts: List of texts to embed
             model: Embedding model to use
@@ -180,5 +436,574 @@ class LLMClient:
         """
         if not texts:
             return []
-        response = self.client.embeddings.create(model=model, input=texts)
-        return [item.embedding for item in response.data]
+        cached, missing = self._cached_embeddings(texts, model)
+        vectors: List[List[float]] = []
+        if missing:
+            response = self._send(
+                self.client.embeddings, sum(map(estimate_tokens, missing)), model=model, input=missing
+            )
+            vectors = [item.embedding for item in response.data]
+        return self._merge_embeddings(texts, cached, missing, vectors, model)
+
+    async def embed_batch_async(
+        self, texts: List[str], model: str = "text-embedding-3-small"
+    ) -> List[List[float]]:
+        """Async variant of :meth:`embed_batch`."""
+        if not texts:
+            return []
+        cached, missing = self._cached_embeddings(texts, model)
+        vectors: List[List[float]] = []
+        if missing:
+            response = await self._send_async(
+                self.async_client.embeddings, sum(map(estimate_tokens, missing)), model=model, input=missing
+            )
+            vectors = [item.embedding for item in response.data]
+        return self._merge_embeddings(texts, cached, missing, vectors, model)
+
+    def hedge_delay(self, kind: str = "text") -> float:
+        """
+        Seconds before a hedged call sends its backup request.
+
+        Args:
+            kind: "text" (:meth:`generate`, p95 of whole responses) or
+                "stream" (:meth:`generate_stream`, p95 of time to first delta)
+        """
+        if self.fixed_hedge_delay is not None:
+            return self.fixed_hedge_delay
+        with self._stats_lock:
+            samples = sorted(self._latencies[kind])
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return DEFAULT_STREAM_HEDGE_DELAY if kind == "stream" else DEFAULT_HEDGE_DELAY
+        return max(MIN_HEDGE_DELAY, samples[int(0.95 * (len(samples) - 1))])
+
+    def hedge_stats(self) -> Dict[str, float]:
+        """Hedged call counters: extra requests sent and how often the backup won."""
+        delay = self.hedge_delay()
+        stream_delay = self.hedge_delay("stream")
+        with self._stats_lock:
+            calls = self.hedged_calls
+            return {
+                "calls": calls,
+                "hedges": self.hedges_sent,
+                "hedge_rate": self.hedges_sent / calls if calls else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "delay": delay,
+                "stream_delay": stream_delay,
+            }
+
+    def close(self) -> None:
+        """Stop the hedging worker threads, if they were started."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+            self._hedge_executor = None
+
+    async def aclose(self) -> None:
+        """Close the async client's connection pool, if it was created."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    # ------------------------------------------------------------------
+    # Shared request building / parsing (used by sync and async paths)
+    # ------------------------------------------------------------------
+
+    def _chat_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        context: Optional[List[Dict[str, str]]],
+        max_tokens: int,
+        temperature: float,
+    ) -> Dict[str, Any]:
+        """Build Chat Completions kwargs for a plain text request."""
+        messages = []
+
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        if context:
+            messages.extend(context)
+
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_completion_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+    def _generate_hedged(self, kwargs: Dict[str, Any], kind: str = "text") -> Any:
+        """
+        Run a chat request, racing a second identical one if the first is slow.
+
+        Both requests stream, so the loser is cancelled by closing its
+        connection as soon as the winner finishes (not when its next chunk
+        arrives). If one request fails the other is still awaited; the first
+        error is raised only if both fail.
+
+        Args:
+            kwargs: Chat Completions kwargs
+            kind: "text" to race whole responses (returns the text) or
+                "stream" to race to the first delta (returns the winner's
+                :class:`_OpenStream`, which the caller must finish)
+        """
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="tnl-hedge")
+
+        leg_fn = self._first_delta_leg if kind == "stream" else self._hedge_leg
+        cancel = threading.Event()
+        granted = threading.Event()
+        streams: List[Any] = []
+        primary = self._hedge_executor.submit(leg_fn, kwargs, cancel, streams, granted)
+        primary.add_done_callback(lambda _: granted.set())
+        with self._stats_lock:
+            self.hedged_calls += 1
+
+        # Time queued in the rate limiter isn't slowness: start the clock once the primary is sent
+        granted.wait()
+        started = time.monotonic()
+        pending = {primary}
+        done, _ = wait(pending, timeout=self.hedge_delay(kind))
+        if not done and self._take_hedge():
+            logger.debug(f"Hedging slow request after {time.monotonic() - started:.1f}s")
+            pending.add(self._hedge_executor.submit(leg_fn, kwargs, cancel, streams))
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((leg for leg in done if leg.exception() is None), None)
+            for leg in done:
+                if leg.exception() is not None:
+                    error = error or leg.exception()
+            if winner is None:
+                continue
+
+            cancel.set()
+            result = winner.result()
+            kept = getattr(result, "stream", None)
+            for stream in list(streams):
+                if stream is not kept:
+                    _close(stream)
+            # A loser that got through anyway still holds its stream and permit
+            for leg in (done | pending) - {winner}:
+                leg.add_done_callback(_discard_leg)
+            self._record_latency(kind, started)
+            with self._stats_lock:
+                self.hedge_wins += winner is not primary
+            return result
+        raise error
+
+    def _record_latency(self, kind: str, started: float) -> None:
+        """Record a hedged call's latency (the sample behind :meth:`hedge_delay`)."""
+        with self._stats_lock:
+            self._latencies[kind].append(time.monotonic() - started)
+
+    def _take_hedge(self) -> bool:
+        """Reserve a backup request if the extra-spend cap allows it."""
+        with self._stats_lock:
+            if self.hedges_sent >= self.hedge_ratio * self.hedged_calls:
+                return False
+            self.hedges_sent += 1
+            return True
+
+    def _hedge_leg(
+        self,
+        kwargs: Dict[str, Any],
+        cancel: threading.Event,
+        streams: List[Any],
+        granted: Optional[threading.Event] = None,
+    ) -> Optional[str]:
+        """
+        One request of a hedged call; stops early (returning None) once ``cancel`` is set.
+
+        A leg cancelled while still waiting for a permit or a retry never
+        sends its request. The open stream is added to ``streams`` so the
+        winner can close it.
+        """
+        try:
+            stream, permit = self._open(
+                self.client.chat.completions, self._request_tokens(kwargs),
+                cancel=cancel, granted=granted, stream=True, stream_options=STREAM_USAGE, **kwargs
+            )
+        except _Cancelled:
+            return None
+        streams.append(stream)
+        parts = []
+        try:
+            # Checked after publishing the stream: a winner that missed it has already set cancel
+            if cancel.is_set():
+                return None
+            for chunk in stream:
+                if cancel.is_set():
+                    return None
+                if not chunk.choices:
+                    permit.observe(used_tokens=_usage_tokens(chunk))
+                elif chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+            return "".join(parts)
+        except Exception:
+            if cancel.is_set():
+                return None  # Closed under us by the winner
+            raise
+        finally:
+            _close(stream)
+            permit.release()
+
+    def _first_delta_leg(
+        self,
+        kwargs: Dict[str, Any],
+        cancel: threading.Event,
+        streams: List[Any],
+        granted: Optional[threading.Event] = None,
+    ) -> Optional["_OpenStream"]:
+        """
+        One stream of a hedged :meth:`generate_stream`, read up to its first delta.
+
+        Returns the open stream (still holding its permit) for the caller to
+        finish, or None once ``cancel`` is set.
+        """
+        try:
+            stream, permit = self._open(
+                self.client.chat.completions, self._request_tokens(kwargs),
+                cancel=cancel, granted=granted, stream=True, stream_options=STREAM_USAGE, **kwargs
+            )
+        except _Cancelled:
+            return None
+        streams.append(stream)
+        chunks = iter(stream)
+        try:
+            for chunk in chunks:
+                if cancel.is_set():
+                    break
+                if not chunk.choices:
+                    permit.observe(used_tokens=_usage_tokens(chunk))
+                elif chunk.choices[0].delta.content:
+                    return _OpenStream(stream, permit, chunks, chunk.choices[0].delta.content)
+            else:
+                if not cancel.is_set():
+                    return _OpenStream(stream, permit, chunks, "")  # Empty response
+        except Exception:
+            _close(stream)
+            permit.release()
+            if cancel.is_set():
+                return None  # Closed under us by the winner
+            raise
+        _close(stream)
+        permit.release()
+        return None
+
+    def _request_tokens(self, request: Dict[str, Any]) -> int:
+        """Tokens to reserve for a chat request: estimated prompt plus the completion budget."""
+        prompt = sum(estimate_tokens(str(m.get("content") or "")) for m in request["messages"])
+        return prompt + request.get("max_completion_tokens", 0)
+
+    def _open(
+        self,
+        resource: Any,
+        tokens: int,
+        cancel: Optional[threading.Event] = None,
+        granted: Optional[threading.Event] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, Permit]:
+        """
+        Send a request through the rate limiter and retry policy, keeping the permit.
+
+        The caller must release the returned permit (streams hold it until
+        they finish; only opening a stream is retried). Each 429 makes the
+        limiter back off; errors the policy won't retry are re-raised.
+
+        Args:
+            cancel: Give up (raising ``_Cancelled``) instead of sending once this is set
+            granted: Set when a permit is first granted (the request is about to go out)
+        """
+        retry = self.retry_policy.start()
+        while True:
+            permit = self.rate_limiter.acquire(tokens, kwargs.get("model", ""))
+            if cancel is not None and cancel.is_set():
+                permit.release()
+                raise _Cancelled()
+            if granted is not None:
+                granted.set()
+            try:
+                raw = resource.with_raw_response.create(timeout=retry.timeout() or openai.NOT_GIVEN, **kwargs)
+            except openai.APIError as e:
+                self._failed(permit, e)
+                delay = retry.next_delay(e)
+                if delay is None:
+                    raise
+                logger.warning(f"LLM request failed ({e.__class__.__name__}), retry {retry.attempt} in {delay:.1f}s")
+                if cancel is not None:
+                    if cancel.wait(delay):
+                        raise _Cancelled() from e
+                else:
+                    time.sleep(delay)
+                continue
+            except BaseException:
+                permit.release()
+                raise
+            retry.succeeded()
+            permit.observe(raw.headers)
+            return raw.parse(), permit
+
+    def _send(self, resource: Any, tokens: int, **kwargs: Any) -> Any:
+        """Send a request (see :meth:`_open`) and return the parsed response."""
+        response, permit = self._open(resource, tokens, **kwargs)
+        with permit:
+            permit.observe(used_tokens=_usage_tokens(response))
+        return response
+
+    async def _send_async(self, resource: Any, tokens: int, **kwargs: Any) -> Any:
+        """Async variant of :meth:`_send`."""
+        retry = self.retry_policy.start()
+        while True:
+            permit = await self.rate_limiter.acquire_async(tokens, kwargs.get("model", ""))
+            try:
+                raw = await resource.with_raw_response.create(timeout=retry.timeout() or openai.NOT_GIVEN, **kwargs)
+            except openai.APIError as e:
+                self._failed(permit, e)
+                delay = retry.next_delay(e)
+                if delay is None:
+                    raise
+                logger.warning(f"LLM request failed ({e.__class__.__name__}), retry {retry.attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                permit.release()
+                raise
+            retry.succeeded()
+            with permit:
+                response = raw.parse()
+                permit.observe(raw.headers, used_tokens=_usage_tokens(response))
+            return response
+
+    def _failed(self, permit: Permit, error: openai.APIError) -> None:
+        """Release the permit of a failed request (telling the limiter about 429s)."""
+        if isinstance(error, openai.RateLimitError):
+            permit.rate_limited(error.response.headers)
+        permit.release()
+
+    def structured_stats(self) -> Dict[str, float]:
+        """Structured call counters: retry rate and latency added by retries."""
+        with self._stats_lock:
+            calls = self.structured_calls
+            return {
+                "calls": calls,
+                "retries": self.structured_retries,
+                "retry_rate": self.structured_retries / calls if calls else 0.0,
+                "strict_fallbacks": self.structured_fallbacks,
+                "retry_seconds": self.structured_retry_seconds,
+            }
+
+    def _use_strict(self, schema: Type[BaseModel], strict: Optional[bool]) -> bool:
+        """Whether a structured call should use strict schema outputs (and the schema allows them)."""
+        if strict is None:
+            strict = self.strict_schemas
+        return strict and schema not in self._strict_rejected and strict_response_format(schema) is not None
+
+    def _structured_request(
+        self,
+        prompt: str,
+        schema: Type[BaseModel],
+        system_prompt: Optional[str],
+        context: Optional[List[Dict[str, str]]],
+        strict: bool,
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Messages and response format for a structured call."""
+        if strict:
+            return self._structured_messages(prompt, schema, system_prompt, context, embed_schema=False), \
+                strict_response_format(schema)
+        return self._structured_messages(prompt, schema, system_prompt, context), JSON_OBJECT_FORMAT
+
+    def _strict_fallback(
+        self,
+        prompt: str,
+        schema: Type[BaseModel],
+        system_prompt: Optional[str],
+        context: Optional[List[Dict[str, str]]],
+        error: Exception,
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Switch a schema the provider rejected in strict mode to loose JSON mode (for this client's lifetime)."""
+        logger.warning(f"Strict schema for {schema.__name__} rejected, using JSON mode: {error}")
+        with self._stats_lock:
+            self._strict_rejected.add(schema)
+            self.structured_fallbacks += 1
+        return self._structured_request(prompt, schema, system_prompt, context, strict=False)
+
+    def _record_structured(self, retries: int, first_answer_at: Optional[float]) -> None:
+        """Count a finished structured call and the time its retries added."""
+        with self._stats_lock:
+            self.structured_calls += 1
+            self.structured_retries += retries
+            if retries and first_answer_at is not None:
+                self.structured_retry_seconds += time.monotonic() - first_answer_at
+
+    def _structured_messages(
+        self,
+        prompt: str,
+        schema: Type[BaseModel],
+        system_prompt: Optional[str],
+        context: Optional[List[Dict[str, str]]],
+        embed_schema: bool = True,
+    ) -> List[Dict[str, str]]:
+        """Build messages for a structured request (with the schema in the system prompt unless strict)."""
+        messages = []
+
+        if embed_schema:
+            full_system = (system_prompt or "") + f"\n\nRespond with valid JSON matching this schema:\n{schema_prompt(schema)}"
+            messages.append({"role": "system", "content": full_system})
+        elif system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        if context:
+            messages.extend(context)
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    @staticmethod
+    def _use_cache(cache: Optional[bool], temperature: float) -> bool:
+        """Whether a call uses the response cache (default: deterministic calls only)."""
+        return temperature == 0 if cache is None else cache
+
+    def _cached_response(self, request: Dict[str, Any], cache: bool) -> Optional[str]:
+        """Cached response text for a request (None on a miss or if caching is off)."""
+        if not cache or self.response_cache is None:
+            return None
+        return self.response_cache.get(request)
+
+    def _store_response(self, request: Dict[str, Any], content: str, cache: bool) -> None:
+        """Cache a response (no-op if caching is off)."""
+        if cache and self.response_cache is not None:
+            self.response_cache.put(request, content)
+
+    def _structured_cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        schema: Type[BaseModel],
+        max_tokens: int,
+        temperature: float,
+        response_format: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Cache request for a structured call (taken before retries append to ``messages``)."""
+        return {
+            "model": self.model,
+            "messages": list(messages),
+            "max_completion_tokens": max_tokens,
+            "temperature": temperature,
+            "response_format": response_format,
+            "schema": schema.__name__,
+        }
+
+    def _cached_structured(self, request: Dict[str, Any], schema: Type[T], cache: bool) -> Optional[T]:
+        """Cached structured result (a stale entry that no longer validates is a miss)."""
+        content = self._cached_response(request, cache)
+        if content is None:
+            return None
+        try:
+            return schema.model_validate_json(content)
+        except ValidationError:
+            return None
+
+    def _cached_embeddings(
+        self, texts: List[str], model: str
+    ) -> Tuple[List[Optional[List[float]]], List[str]]:
+        """
+        Split texts into cached vectors and distinct texts still to embed.
+
+        Returns:
+            (per-text cached vector or None, distinct missing texts in first-seen order)
+        """
+        if self.embedding_cache is None:
+            cached: List[Optional[List[float]]] = [None] * len(texts)
+        else:
+            cached = self.embedding_cache.get_many(model, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        return cached, missing
+
+    def _merge_embeddings(
+        self,
+        texts: List[str],
+        cached: List[Optional[List[float]]],
+        missing: List[str],
+        vectors: List[List[float]],
+        model: str,
+    ) -> List[List[float]]:
+        """Cache freshly embedded texts and reassemble results in input order."""
+        if self.embedding_cache is not None and missing:
+            self.embedding_cache.put_many(model, missing, vectors)
+        fresh = dict(zip(missing, vectors))
+        return [v if v is not None else fresh[t] for t, v in zip(texts, cached)]
+
+    def _parse_structured(
+        self,
+        content: str,
+        schema: Type[T],
+        messages: List[Dict[str, str]],
+        attempt: int,
+    ) -> Tuple[Optional[T], Optional[Exception]]:
+        """
+        Parse a structured response.
+
+        On a validation error, appends a clarification to ``messages`` so the
+        next attempt can correct itself.
+
+        Returns:
+            (parsed model, None) on success, (None, error) on failure
+        """
+        try:
+            data = json.loads(content)
+            return schema.model_validate(data), None
+
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON parse error on attempt {attempt + 1}: {e}")
+            return None, e
+        except ValidationError as e:
+            logger.warning(f"Validation error on attempt {attempt + 1}: {e}")
+            # Add clarification for next attempt
+            messages.append({"role": "assistant", "content": content})
+            messages.append({
+                "role": "user",
+                "content": f"The response didn't match the required schema. Error: {e}. Please try again with valid JSON."
+            })
+            return None, e
+
+
+def _rejects_schema(error: openai.BadRequestError) -> bool:
+    """Whether a 400 is the provider refusing the strict schema (not e.g. an over-long context)."""
+    param = str(getattr(error, "param", None) or "")
+    code = str(getattr(error, "code", None) or "")
+    return "response_format" in param or "json_schema" in param or "schema" in code
+
+
+class _Cancelled(Exception):
+    """A hedge leg was cancelled before its request went out."""
+
+
+class _OpenStream(NamedTuple):
+    """A chat stream read up to its first content delta."""
+    stream: Any
+    permit: Permit
+    chunks: Iterator[Any]
+    delta: str
+
+
+def _discard_leg(leg: Future) -> None:
+    """Close a losing hedge leg's stream if it finished opening after the race was decided."""
+    result = None if leg.cancelled() or leg.exception() is not None else leg.result()
+    if isinstance(result, _OpenStream):
+        _close(result.stream)
+        result.permit.release()
+
+
+def _close(stream: Any) -> None:
+    """Close a response stream (dropping its connection), if it can be closed."""
+    close = getattr(stream, "close", None)
+    if close:
+        close()
+
+
+def _usage_tokens(response: Any) -> Optional[int]:
+    """Total tokens billed for a response, if the provider reported usage."""
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
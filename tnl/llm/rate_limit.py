@@ -0,0 +1,287 @@
+"""Process-wide rate limiting for LLM traffic.
+
+Every ``LLMClient`` call (chat, streaming, structured and embeddings, sync
+or async) takes a permit from one shared :class:`RateLimiter` before going
+upstream. The limiter budgets requests/minute and tokens/minute with token
+buckets - one pair per model, since providers meter each model's quota
+separately - and caps in-flight requests with an AIMD (additive increase,
+multiplicative decrease) concurrency limit: every success widens the window
+a little, every 429 halves it and pauses new requests until the provider's
+reset time. Provider rate-limit headers keep each model's buckets in step
+with its real quota, so many agents and sessions can share it without tripping it.
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_REQUESTS_PER_MINUTE = 5_000
+DEFAULT_TOKENS_PER_MINUTE = 2_000_000
+DEFAULT_INITIAL_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 64
+
+# Pause after a 429 that carries no reset hint
+DEFAULT_RATE_LIMIT_PAUSE = 1.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds from a rate-limit reset header ("1s", "6m0s", "120ms", "0.5")."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class _Bucket:
+    """Token bucket refilled continuously up to one minute's budget."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (requests larger than capacity wait for a full bucket)."""
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed * 60.0 / self.capacity)
+
+
+class _Quota:
+    """Request and token buckets (and 429 pause) for one model."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(tokens_per_minute)
+        self.paused_until = 0.0
+
+
+class Permit:
+    """
+    A granted request slot. Release it exactly once (or use it as a context manager).
+
+    Call :meth:`observe` with the response headers (and the actual token
+    usage, if known) and :meth:`rate_limited` when the provider returns 429.
+    """
+
+    def __init__(self, limiter: "RateLimiter", tokens: int, model: str = ""):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.model = model
+        self.used_tokens: Optional[int] = None
+        self._throttled = False
+        self._released = False
+
+    def observe(self, headers: Optional[Mapping[str, str]] = None, used_tokens: Optional[int] = None) -> None:
+        """Feed back response headers and actual token usage."""
+        if used_tokens is not None:
+            self.used_tokens = used_tokens
+        if headers:
+            self.limiter.update_from_headers(headers, self.model)
+
+    def rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Report a 429 for this request."""
+        self._throttled = True
+        self.limiter.on_rate_limited(headers, self.model)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.limiter._release(self)
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class RateLimiter:
+    """
+    Token-bucket (requests and tokens per minute) limiter with AIMD concurrency.
+
+    Each model gets its own buckets, starting at ``requests_per_minute`` /
+    ``tokens_per_minute`` until its headers report the real limits, so an
+    embedding model's quota never throttles chat calls. The concurrency
+    window is shared. Thread-safe; ``acquire`` blocks the calling thread and ``acquire_async``
+    awaits, so threaded and asyncio callers share one budget.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._quotas: Dict[str, _Quota] = {}
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(min(initial_concurrency, max_concurrency))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+        # Counters (for debugging / benchmarks)
+        self.granted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, tokens: int = 0, model: str = "") -> Permit:
+        """Block until a request of ~``tokens`` tokens to ``model`` may be sent."""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_acquire(tokens, model)
+                if wait == 0.0:
+                    self.wait_seconds += time.monotonic() - started
+                    return Permit(self, tokens, model)
+                self._cond.wait(wait)
+
+    async def acquire_async(self, tokens: int = 0, model: str = "") -> Permit:
+        """Async variant of :meth:`acquire` (never blocks the event loop)."""
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._try_acquire(tokens, model)
+                if wait == 0.0:
+                    self.wait_seconds += time.monotonic() - started
+                    return Permit(self, tokens, model)
+            await asyncio.sleep(min(wait, 0.25))
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None, model: str = "") -> None:
+        """Halve the concurrency window and pause ``model`` until the provider's reset time."""
+        pause = None
+        if headers:
+            pause = parse_reset(headers.get("retry-after")) or max(
+                parse_reset(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+            ) or None
+        with self._cond:
+            self.throttled += 1
+            self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+            quota = self._quota(model)
+            quota.paused_until = max(quota.paused_until, time.monotonic() + (pause or DEFAULT_RATE_LIMIT_PAUSE))
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str], model: str = "") -> None:
+        """Sync ``model``'s bucket capacities and levels with ``x-ratelimit-*`` headers."""
+        values = {}
+        for name in ("limit-requests", "limit-tokens", "remaining-requests", "remaining-tokens"):
+            raw = headers.get(f"x-ratelimit-{name}")
+            try:
+                values[name] = float(raw) if raw is not None else None
+            except ValueError:
+                values[name] = None
+
+        with self._cond:
+            now = time.monotonic()
+            quota = self._quota(model)
+            for bucket, kind in ((quota.requests, "requests"), (quota.tokens, "tokens")):
+                bucket.refill(now)
+                limit = values[f"limit-{kind}"]
+                if limit:
+                    bucket.capacity = limit
+                    bucket.level = min(bucket.level, limit)
+                remaining = values[f"remaining-{kind}"]
+                if remaining is not None:
+                    # Other processes share the quota: never assume more than the provider reports
+                    bucket.level = min(bucket.level, remaining)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limits (per model) and counters."""
+        with self._cond:
+            return {
+                "models": {
+                    model: {
+                        "requests_per_minute": quota.requests.capacity,
+                        "tokens_per_minute": quota.tokens.capacity,
+                    }
+                    for model, quota in self._quotas.items()
+                },
+                "concurrency": self.concurrency,
+                "in_flight": self.in_flight,
+                "granted": self.granted,
+                "throttled": self.throttled,
+                "wait_seconds": self.wait_seconds,
+            }
+
+    def _quota(self, model: str) -> _Quota:
+        """Buckets for ``model`` (caller holds the lock)."""
+        quota = self._quotas.get(model)
+        if quota is None:
+            quota = self._quotas[model] = _Quota(self.requests_per_minute, self.tokens_per_minute)
+        return quota
+
+    def _try_acquire(self, tokens: int, model: str) -> float:
+        """Take a slot if possible (caller holds the lock); else seconds to wait."""
+        now = time.monotonic()
+        quota = self._quota(model)
+        if now < quota.paused_until:
+            return quota.paused_until - now
+        if self.in_flight >= int(self.concurrency):
+            return 1.0  # Woken by a release
+
+        quota.requests.refill(now)
+        quota.tokens.refill(now)
+        wait = max(quota.requests.wait_for(1), quota.tokens.wait_for(tokens))
+        if wait > 0:
+            return wait
+
+        quota.requests.level -= 1
+        quota.tokens.level -= tokens
+        self.in_flight += 1
+        self.granted += 1
+        return 0.0
+
+    def _release(self, permit: Permit) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if permit.used_tokens is not None:
+                # Refund (or charge) the difference from the estimate
+                bucket = self._quota(permit.model).tokens
+                bucket.level = min(bucket.capacity, bucket.level + permit.tokens - permit.used_tokens)
+            if not permit._throttled:
+                # Additive increase: about +1 per window of successful requests
+                self.concurrency = min(float(self.max_concurrency), self.concurrency + 1.0 / self.concurrency)
+            self._cond.notify_all()
+
+
+_default_rate_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """
+    Process-wide limiter shared by every ``LLMClient``.
+
+    Starting per-model budgets come from ``TNL_LLM_RPM`` / ``TNL_LLM_TPM`` (and
+    ``TNL_LLM_MAX_CONCURRENCY``); provider headers refine them at runtime.
+    """
+    global _default_rate_limiter
+    with _default_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = RateLimiter(
+                requests_per_minute=float(os.getenv("TNL_LLM_RPM") or DEFAULT_REQUESTS_PER_MINUTE),
+                tokens_per_minute=float(os.getenv("TNL_LLM_TPM") or DEFAULT_TOKENS_PER_MINUTE),
+                max_concurrency=int(os.getenv("TNL_LLM_MAX_CONCURRENCY") or DEFAULT_MAX_CONCURRENCY),
+            )
+        return _default_rate_limiter
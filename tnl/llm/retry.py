@@ -0,0 +1,199 @@
+"""Retry policy for transient LLM API failures.
+
+Timeouts, connection errors, 429s and 5xx responses are retried with
+exponential backoff and full jitter (honouring ``retry-after``), within a
+per-call deadline. Retries draw on a shared :class:`RetryBudget` that only
+refills as a fraction of successful traffic, so a provider outage turns
+into fast failures instead of every caller hammering it in lockstep.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import openai
+
+from .rate_limit import parse_reset
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.5  # seconds
+DEFAULT_MAX_DELAY = 20.0  # seconds
+DEFAULT_CALL_DEADLINE = 180.0  # seconds, across all attempts of one call
+
+# Retry budget: retries allowed per successful request, plus a small floor
+DEFAULT_RETRY_RATIO = 0.2
+DEFAULT_RETRY_FLOOR_PER_SECOND = 0.5
+DEFAULT_RETRY_BUDGET_CAPACITY = 20.0
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an API error is transient (worth retrying)."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of successful requests.
+
+    Each success deposits ``ratio`` tokens and the bucket also refills at
+    ``floor_per_second``; each retry withdraws one. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_RATIO,
+        floor_per_second: float = DEFAULT_RETRY_FLOOR_PER_SECOND,
+        capacity: float = DEFAULT_RETRY_BUDGET_CAPACITY,
+    ):
+        self.ratio = ratio
+        self.floor_per_second = floor_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Credit a successful request."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.floor_per_second)
+        self._updated = now
+
+
+class RetryPolicy:
+    """
+    Classification, backoff and limits for retrying LLM calls.
+
+    Use :meth:`start` once per logical call and ask the returned
+    :class:`RetryState` for the delay before each retry.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        deadline: Optional[float] = DEFAULT_CALL_DEADLINE,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.budget = budget or RetryBudget()
+        self._lock = threading.Lock()
+
+        # Counters (for debugging / benchmarks)
+        self.retries = 0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.backoff_seconds = 0.0
+
+    def start(self) -> "RetryState":
+        """Begin tracking one call."""
+        return RetryState(self)
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Delay before retry number ``attempt`` (1-based): full jitter, at least ``retry-after``."""
+        delay = random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = parse_reset(response.headers.get("retry-after"))
+            if retry_after:
+                delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def stats(self) -> Dict[str, float]:
+        """Retry counters."""
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "budget_exhausted": self.budget_exhausted,
+                "backoff_seconds": self.backoff_seconds,
+            }
+
+    def _count(self, delay: Optional[float], exhausted: bool = False) -> None:
+        with self._lock:
+            if delay is None:
+                self.gave_up += 1
+                self.budget_exhausted += exhausted
+            else:
+                self.retries += 1
+                self.backoff_seconds += delay
+
+
+class RetryState:
+    """Attempts and deadline of one call under a :class:`RetryPolicy`."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempt = 0
+        self.started = time.monotonic()
+
+    def timeout(self) -> Optional[float]:
+        """Seconds left before the call's deadline (None = no deadline)."""
+        if self.policy.deadline is None:
+            return None
+        return max(0.0, self.policy.deadline - (time.monotonic() - self.started))
+
+    def succeeded(self) -> None:
+        self.policy.budget.deposit()
+
+    def next_delay(self, error: BaseException) -> Optional[float]:
+        """
+        Seconds to wait before retrying after ``error``.
+
+        Returns:
+            The backoff delay, or None if the error is permanent, attempts or
+            the deadline are used up, or the shared retry budget is exhausted
+        """
+        self.attempt += 1
+        if not is_retryable(error) or self.attempt >= self.policy.max_attempts:
+            self.policy._count(None)
+            return None
+
+        delay = self.policy.backoff(self.attempt, error)
+        remaining = self.timeout()
+        if remaining is not None and delay >= remaining:
+            self.policy._count(None)
+            return None
+        if not self.policy.budget.withdraw():
+            self.policy._count(None, exhausted=True)
+            return None
+
+        self.policy._count(delay)
+        return delay
+
+
+_default_retry_policy: Optional[RetryPolicy] = None
+_default_lock = threading.Lock()
+
+
+def get_default_retry_policy() -> RetryPolicy:
+    """Process-wide retry policy (and retry budget) shared by every ``LLMClient``."""
+    global _default_retry_policy
+    with _default_lock:
+        if _default_retry_policy is None:
+            _default_retry_policy = RetryPolicy()
+        return _default_retry_policy
@@ -0,0 +1,88 @@
+"""Response-format payloads for structured LLM calls.
+
+Schemas are derived from Pydantic models once per model class and reused,
+instead of being rebuilt and serialized on every call.
+"""
+
+import copy
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+# Loose JSON mode: any JSON object (the schema goes in the system prompt)
+JSON_OBJECT_FORMAT: Dict[str, Any] = {"type": "json_object"}
+
+# Keywords strict structured outputs don't accept
+_UNSUPPORTED_KEYWORDS = frozenset({
+    "default", "format", "pattern",
+    "minLength", "maxLength", "minItems", "maxItems",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+})
+
+
+@lru_cache(maxsize=None)
+def schema_prompt(schema: Type[BaseModel]) -> str:
+    """Pretty-printed JSON schema for pasting into a prompt (loose JSON mode)."""
+    return json.dumps(schema.model_json_schema(), indent=2)
+
+
+class _NotStrict(Exception):
+    """The schema uses a construct strict mode can't express."""
+
+
+@lru_cache(maxsize=None)
+def strict_response_format(schema: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    """
+    ``json_schema`` response format enforcing ``schema`` strictly.
+
+    Strict mode requires every object to list all its properties as
+    required and forbid extra ones, and rejects validation keywords such as
+    defaults and length limits - the Pydantic model still applies those
+    when the response is validated.
+
+    Returns:
+        The response format, or None if ``schema`` has mapping fields
+        (``Dict[...]``) or allows extra keys, which strict mode would
+        reduce to ``{}`` - use loose JSON mode for those
+    """
+    try:
+        strict_schema = _strict(copy.deepcopy(schema.model_json_schema()))
+    except _NotStrict:
+        return None
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "schema": strict_schema,
+            "strict": True,
+        },
+    }
+
+
+def _strict(node: Any) -> Any:
+    """Rewrite a JSON schema (in place) into the strict subset (raises _NotStrict if impossible)."""
+    if isinstance(node, list):
+        return [_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    if node.get("additionalProperties", False) is not False:
+        raise _NotStrict()
+
+    for keyword in _UNSUPPORTED_KEYWORDS & node.keys():
+        del node[keyword]
+
+    for key, value in list(node.items()):
+        if key in ("properties", "$defs"):
+            node[key] = {name: _strict(prop) for name, prop in value.items()}
+        elif isinstance(value, (dict, list)):
+            node[key] = _strict(value)
+
+    if node.get("type") == "object" or "properties" in node:
+        properties = node.setdefault("properties", {})
+        node["required"] = list(properties)
+        node["additionalProperties"] = False
+
+    return node
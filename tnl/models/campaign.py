@@ -5,6 +5,7 @@ from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 
 from .character import CharacterSheet
+from .collections import NameSet
 from .world import WorldSeed
 from .simulation import SimulationState
 
@@ -44,11 +45,11 @@ class CampaignState(BaseModel):
     current_location: Optional[str] = None
     current_turn: int = 0
 
-    # Runtime state (mutable during gameplay)
-    inventory: List[str] = Field(default_factory=list)
-    abilities: List[str] = Field(default_factory=list)
-    discovered_locations: List[str] = Field(default_factory=list)
-    known_npcs: List[str] = Field(default_factory=list)
+    # Runtime state (mutable during gameplay; saved as plain lists)
+    inventory: NameSet = Field(default_factory=NameSet)
+    abilities: NameSet = Field(default_factory=NameSet)
+    discovered_locations: NameSet = Field(default_factory=NameSet)
+    known_npcs: NameSet = Field(default_factory=NameSet)
     active_events: List[str] = Field(default_factory=list)
 
     # Conversation history (for context)
@@ -69,10 +70,10 @@ class CampaignState(BaseModel):
         """Convert to runtime state dict for persistence."""
         return {
             "character_sheet": self.character_sheet.model_dump(),
-            "inventory": self.inventory,
-            "abilities": self.abilities,
-            "locations": self.discovered_locations,
-            "key_people": self.known_npcs,
+            "inventory": list(self.inventory),
+            "abilities": list(self.abilities),
+            "locations": list(self.discovered_locations),
+            "key_people": list(self.known_npcs),
             "world_events": self.active_events,
         }
 
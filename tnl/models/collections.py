@@ -0,0 +1,113 @@
+"""Ordered-set containers for campaign bookkeeping.
+
+Inventory, abilities, locations, NPCs and triggered element ids are
+append-mostly collections that are checked for membership every turn. These
+containers keep insertion order (so prompts and saves look the same) but
+make membership, add and discard constant-time. They validate from and
+serialize to plain JSON lists, so the persisted ``state_json`` shape is
+unchanged.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, overload
+
+from pydantic_core import core_schema
+
+
+class OrderedSet:
+    """
+    Insertion-ordered set of strings with a list-like read interface.
+
+    ``append`` is an alias of ``add`` (duplicates are ignored), so code
+    written against lists keeps working.
+    """
+
+    def __init__(self, items: Optional[Iterable[str]] = None):
+        self._items: Dict[str, str] = {}
+        if items is not None:
+            self.update(items)
+
+    @staticmethod
+    def _key(item: str) -> str:
+        """Identity used for deduplication."""
+        return item
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns False if it was already present."""
+        key = self._key(item)
+        if key in self._items:
+            return False
+        self._items[key] = item
+        return True
+
+    append = add
+
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items in order."""
+        for item in items:
+            self.add(item)
+
+    extend = update
+
+    def discard(self, item: str) -> bool:
+        """Remove an item if present; returns whether it was."""
+        return self._items.pop(self._key(item), None) is not None
+
+    def remove(self, item: str) -> None:
+        """Remove an item (ValueError if absent, like ``list.remove``)."""
+        if not self.discard(item):
+            raise ValueError(f"{item!r} not in {type(self).__name__}")
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, str) and self._key(item) in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items.values())
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        return list(self._items.values())[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, OrderedSet):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> core_schema.CoreSchema:
+        """Validate from a list (or an instance); serialize to a list."""
+        # Older saves may hold non-string entries (raw LLM values) - keep them as text
+        from_list = core_schema.no_info_after_validator_function(
+            lambda items: cls(item if isinstance(item, str) else str(item) for item in items),
+            core_schema.list_schema(),
+        )
+        return core_schema.union_schema(
+            [core_schema.is_instance_schema(cls), from_list],
+            serialization=core_schema.plain_serializer_function_ser_schema(list),
+        )
+
+
+class NameSet(OrderedSet):
+    """Ordered set of names, deduplicated case-insensitively (first spelling wins)."""
+
+    @staticmethod
+    def _key(item: str) -> str:
+        return item.strip().casefold()
@@ -5,10 +5,13 @@ They're generated on-demand when entering a new location, preserving player free
 while making each scene feel pre-determined once entered.
 """
 
+import heapq
 import random
 from enum import Enum
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .collections import OrderedSet
 
 
 class TriggerType(str, Enum):
@@ -18,6 +21,7 @@ class TriggerType(str, Enum):
     NPC_INTERACTION = "npc"       # Interacting with specific NPCs
     ITEM = "item"                 # Possessing/using certain items
     TIME = "time"                 # After N turns
+    SEMANTIC = "semantic"         # Player input similar in meaning to a description
 
 
 class Severity(str, Enum):
@@ -33,9 +37,11 @@ class TriggerCondition(BaseModel):
     trigger_type: TriggerType = TriggerType.KEYWORD
     keywords: List[str] = Field(default_factory=list)
     probability: float = Field(default=1.0, ge=0.0, le=1.0)
+    description: str = ""  # SEMANTIC: the kind of action that sets this off
+    threshold: float = Field(default=0.5, ge=-1.0, le=1.0)  # SEMANTIC: min cosine similarity
 
     def matches(self, player_input: str) -> bool:
-        """Check if this trigger matches the player input."""
+        """Check if this keyword trigger matches the player input."""
         if self.trigger_type != TriggerType.KEYWORD:
             return False
 
@@ -104,6 +110,14 @@ class TimedEvent(BaseModel):
     turns_per_stage: int = 5
     stage_descriptions: List[str] = Field(default_factory=list)
     active: bool = True
+    fire_at_turn: Optional[int] = None  # One-shot events fire once at this turn
+
+    def next_fire_turn(self, after_turn: int) -> int:
+        """First turn after ``after_turn`` at which this event is due."""
+        if self.fire_at_turn is not None:
+            return max(self.fire_at_turn, after_turn + 1)
+        period = max(self.turns_per_stage, 1)
+        return (after_turn // period + 1) * period
 
 
 class SceneSimulation(BaseModel):
@@ -114,7 +128,48 @@ class SceneSimulation(BaseModel):
     hidden_guards: List[HiddenGuard] = Field(default_factory=list)
     fail_conditions: List[FailCondition] = Field(default_factory=list)
     secrets: List[Secret] = Field(default_factory=list)
+    timed_events: List[TimedEvent] = Field(default_factory=list)  # Progress only while scene exists
     generated_at_turn: int = 0
+    last_visited_turn: int = 0
+    archived: bool = False  # Stub: elements live in the repository's scene archive
+
+    _trigger_index: Any = PrivateAttr(default=None)
+
+    def trigger_index(self) -> Any:
+        """Compiled keyword index over this scene's elements (built on first use)."""
+        if self._trigger_index is None:
+            from ..simulation.trigger_index import TriggerIndex
+
+            self._trigger_index = TriggerIndex(self.indexed_elements())
+        return self._trigger_index
+
+    def indexed_elements(self) -> List[Tuple[str, Any]]:
+        """(element_type, element) pairs in trigger evaluation order."""
+        return (
+            [("watcher", e) for e in self.watchers]
+            + [("hidden_guard", e) for e in self.hidden_guards]
+            + [("fail_condition", e) for e in self.fail_conditions]
+            + [("secret", e) for e in self.secrets]
+        )
+
+    def invalidate_trigger_index(self) -> None:
+        """Drop the compiled index after elements or keywords change."""
+        self._trigger_index = None
+
+    def to_stub(self) -> "SceneSimulation":
+        """
+        Lightweight stand-in for an archived scene.
+
+        Hidden elements are dropped; timed events are kept (the same
+        objects) so they keep progressing while the scene is archived.
+        """
+        return SceneSimulation(
+            location=self.location,
+            timed_events=self.timed_events,
+            generated_at_turn=self.generated_at_turn,
+            last_visited_turn=self.last_visited_turn,
+            archived=True,
+        )
 
 
 class SimulationState(BaseModel):
@@ -128,22 +183,233 @@ class SimulationState(BaseModel):
     global_timed_events: List[TimedEvent] = Field(default_factory=list)
 
     # Tracking
-    triggered_elements: List[str] = Field(default_factory=list)
+    triggered_elements: OrderedSet = Field(default_factory=OrderedSet)
     current_turn: int = 0
     current_location: Optional[str] = None
 
+    # Timed event schedule: min-heap of (due turn, event key)
+    timed_schedule: List[Tuple[int, str]] = Field(default_factory=list)
+
+    # Lowercased location alias -> canonical scene location
+    location_aliases: Dict[str, str] = Field(default_factory=dict)
+
+    _global_trigger_index: Any = PrivateAttr(default=None)
+    _location_index: Any = PrivateAttr(default=None)
+    _timed_events: Any = PrivateAttr(default=None)  # key -> (event, location, order)
+    _schedule_synced: bool = PrivateAttr(default=False)
+
+    def global_trigger_index(self) -> Any:
+        """Compiled keyword index over global watchers and fail conditions."""
+        index = self._global_trigger_index
+        if index is None or len(index.elements) != len(self.global_watchers) + len(self.global_fail_conditions):
+            from ..simulation.trigger_index import TriggerIndex
+
+            index = TriggerIndex(self.global_indexed_elements())
+            self._global_trigger_index = index
+        return index
+
+    def global_indexed_elements(self) -> List[Tuple[str, Any]]:
+        """(element_type, element) pairs for global elements in evaluation order."""
+        return (
+            [("watcher", e) for e in self.global_watchers]
+            + [("fail_condition", e) for e in self.global_fail_conditions]
+        )
+
+    def invalidate_trigger_index(self) -> None:
+        """Drop the compiled global index after elements or keywords change."""
+        self._global_trigger_index = None
+
     def get_scene(self, location: str) -> Optional[SceneSimulation]:
         """Get simulation for a location if it exists."""
         return self.scenes.get(location)
 
-    def add_scene(self, scene: SceneSimulation) -> None:
-        """Add a scene simulation."""
+    def resolve_location(
+        self,
+        location: str,
+        embed_batch: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    ) -> str:
+        """
+        Map a detected location name to the scene it refers to.
+
+        Known aliases are looked up directly; otherwise the name is matched
+        against existing scenes (see ``LocationIndex``) and remembered as an
+        alias on a match.
+
+        Args:
+            location: Detected location name
+            embed_batch: Embedding function enabling the similarity fallback
+
+        Returns:
+            The canonical scene location, or ``location`` itself if it's new
+        """
+        if location in self.scenes:
+            return location
+
+        alias = self.location_aliases.get(location.lower())
+        if alias in self.scenes:
+            return alias
+
+        for existing in self.scenes:
+            if existing.lower() == location.lower():
+                canonical = existing
+                break
+        else:
+            if self._location_index is None:
+                from ..simulation.locations import LocationIndex
+
+                self._location_index = LocationIndex()
+            canonical = self._location_index.match(location, list(self.scenes), embed_batch)
+            if canonical is None:
+                return location
+
+        self.location_aliases[location.lower()] = canonical
+        return canonical
+
+    def add_scene(self, scene: SceneSimulation, current_turn: Optional[int] = None) -> None:
+        """Add a scene simulation, compile its trigger index and schedule its events."""
+        scene.trigger_index()
         self.scenes[scene.location] = scene
+        self._timed_events = None
+
+        if self._schedule_synced:
+            turn = self.current_turn if current_turn is None else current_turn
+            for event in scene.timed_events:
+                self.schedule_event(event, turn, scene.location)
+
+    def touch_scene(self, location: str, turn: int) -> None:
+        """Record that the player is in a scene this turn."""
+        scene = self.scenes.get(location)
+        if scene:
+            scene.last_visited_turn = turn
+
+    def cold_scenes(self, current_turn: int, idle_turns: int) -> List[SceneSimulation]:
+        """Resident scenes (other than the current one) not visited for ``idle_turns`` turns."""
+        return [
+            scene
+            for location, scene in self.scenes.items()
+            if not scene.archived
+            and location != self.current_location
+            and current_turn - max(scene.last_visited_turn, scene.generated_at_turn) >= idle_turns
+        ]
+
+    def evict_scene(self, location: str) -> None:
+        """Replace a scene by its stub (archive it first - its elements are dropped)."""
+        self.scenes[location] = self.scenes[location].to_stub()
+
+    def restore_scene(self, scene: SceneSimulation) -> None:
+        """
+        Swap an archived scene back in for its stub.
+
+        The stub's timed events are kept, since they progressed while the
+        scene was archived.
+        """
+        stub = self.scenes.get(scene.location)
+        if stub is not None:
+            scene.timed_events = stub.timed_events
+            scene.last_visited_turn = stub.last_visited_turn
+        scene.archived = False
+        scene.invalidate_trigger_index()
+        scene.trigger_index()
+        self.scenes[scene.location] = scene
+
+    def add_timed_event(
+        self,
+        event: TimedEvent,
+        current_turn: int,
+        location: Optional[str] = None,
+    ) -> None:
+        """
+        Add and schedule a timed event.
+
+        Args:
+            event: The event (set ``fire_at_turn`` for a one-shot)
+            current_turn: Turn the event is added on
+            location: Scene the event belongs to (None for global)
+        """
+        if location is None:
+            self.global_timed_events.append(event)
+        else:
+            self.scenes[location].timed_events.append(event)
+        self._timed_events = None
+
+        if self._schedule_synced:
+            self.schedule_event(event, current_turn, location)
+
+    def schedule_after(
+        self,
+        event: TimedEvent,
+        turns: int,
+        current_turn: int,
+        location: Optional[str] = None,
+    ) -> None:
+        """Add a one-shot event that fires ``turns`` turns from now."""
+        event.fire_at_turn = current_turn + max(turns, 1)
+        self.add_timed_event(event, current_turn, location)
+
+    def schedule_event(
+        self,
+        event: TimedEvent,
+        after_turn: int,
+        location: Optional[str] = None,
+    ) -> None:
+        """Push an event's next due turn onto the schedule."""
+        if event.active:
+            key = self._timed_event_key(event, location)
+            heapq.heappush(self.timed_schedule, (event.next_fire_turn(after_turn), key))
+
+    def pop_due_events(self, turn: int) -> List[Tuple[TimedEvent, Optional[str]]]:
+        """
+        Remove and return every active event due at or before ``turn``.
+
+        Only due entries are touched, so idle events cost nothing per turn.
+
+        Returns:
+            (event, location) pairs in declaration order (globals first)
+        """
+        self._sync_schedule(turn - 1)
+        events = self._timed_event_map()
+
+        due = []
+        while self.timed_schedule and self.timed_schedule[0][0] <= turn:
+            _, key = heapq.heappop(self.timed_schedule)
+            entry = events.get(key)
+            if entry and entry[0].active:
+                due.append(entry)
+
+        due.sort(key=lambda entry: entry[2])
+        return [(event, location) for event, location, _ in due]
+
+    @staticmethod
+    def _timed_event_key(event: TimedEvent, location: Optional[str]) -> str:
+        return event.id if location is None else f"{location}/{event.id}"
+
+    def _timed_event_map(self) -> Dict[str, Tuple[TimedEvent, Optional[str], int]]:
+        """Schedule key -> (event, location, declaration order)."""
+        if self._timed_events is None:
+            entries = [(event, None) for event in self.global_timed_events]
+            for location, scene in self.scenes.items():
+                entries.extend((event, location) for event in scene.timed_events)
+
+            mapping: Dict[str, Tuple[TimedEvent, Optional[str], int]] = {}
+            for order, (event, location) in enumerate(entries):
+                mapping.setdefault(self._timed_event_key(event, location), (event, location, order))
+            self._timed_events = mapping
+        return self._timed_events
+
+    def _sync_schedule(self, current_turn: int) -> None:
+        """Schedule active events missing from the heap (e.g. saves from before the scheduler)."""
+        if self._schedule_synced:
+            return
+        heapq.heapify(self.timed_schedule)
+        scheduled = {key for _, key in self.timed_schedule}
+        for key, (event, location, _) in self._timed_event_map().items():
+            if event.active and key not in scheduled:
+                self.schedule_event(event, current_turn, location)
+        self._schedule_synced = True
 
     def mark_triggered(self, element_id: str) -> None:
         """Mark an element as triggered."""
-        if element_id not in self.triggered_elements:
-            self.triggered_elements.append(element_id)
+        self.triggered_elements.add(element_id)
 
 
 class TriggerResult(BaseModel):
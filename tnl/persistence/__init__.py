@@ -1,5 +1,54 @@
-"""Persistence layer for TNL."""
+"""Persistence layer for TNL.
 
+The backend is chosen with ``TNL_PERSISTENCE``:
+
+- ``remote`` (default): the FastAPI service (``CampaignRepository``)
+- ``sqlite``: a local database file at ``TNL_SQLITE_PATH`` (``SQLiteCampaignRepository``)
+"""
+
+import os
+from typing import Any, Optional
+
+from ..llm import LLMClient
+from .base import BaseCampaignRepository
 from .repository import CampaignRepository
+from .sqlite import DEFAULT_SQLITE_PATH, SQLiteCampaignRepository
+from .write_behind import WriteBehindSaver
+
+
+def create_repository(
+    llm_client: Optional[LLMClient] = None,
+    backend: Optional[str] = None,
+    **remote_kwargs: Any,
+) -> BaseCampaignRepository:
+    """
+    Create the configured campaign repository.
+
+    Args:
+        llm_client: LLM client used for embeddings
+        backend: "remote" or "sqlite" (defaults to ``TNL_PERSISTENCE``, then "remote")
+        **remote_kwargs: Extra options for ``CampaignRepository`` (e.g. pool_size);
+            ignored by the SQLite backend
+
+    Returns:
+        A repository instance
+    """
+    backend = (backend or os.getenv("TNL_PERSISTENCE") or "remote").lower()
+
+    if backend == "sqlite":
+        path = os.getenv("TNL_SQLITE_PATH") or DEFAULT_SQLITE_PATH
+        return SQLiteCampaignRepository(path=path, llm_client=llm_client)
+
+    if backend != "remote":
+        raise ValueError(f"Unknown persistence backend: {backend!r} (expected 'remote' or 'sqlite')")
+
+    return CampaignRepository(llm_client=llm_client, **remote_kwargs)
+
 
-__all__ = ["CampaignRepository"]
+__all__ = [
+    "BaseCampaignRepository",
+    "CampaignRepository",
+    "SQLiteCampaignRepository",
+    "WriteBehindSaver",
+    "create_repository",
+]
@@ -0,0 +1,487 @@
+"""Abstract campaign repository - the interface every persistence backend implements."""
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import tiktoken
+
+from ..llm import LLMClient
+from ..models.campaign import CampaignState
+from ..models.simulation import SceneSimulation
+from .delta import Patch, apply_patch, make_patch
+from .vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+EMBED_MODEL = "text-embedding-3-small"
+
+# Delta persistence: write a full checkpoint every N deltas
+DEFAULT_CHECKPOINT_INTERVAL = 20
+
+
+@dataclass
+class _PersistedSnapshot:
+    """Last state_json known to be persisted for a campaign."""
+
+    state_json: Dict[str, Any]
+    checkpoint_id: str
+    seq: int = 0  # Number of deltas persisted on top of the checkpoint
+
+
+class BaseCampaignRepository(ABC):
+    """
+    Base class for campaign persistence backends.
+
+    Backends implement seed chunk storage, embedding retrieval and the raw
+    checkpoint/delta reads and writes. Snapshotting, delta computation and
+    replay are shared here.
+
+    Runtime state is saved as a full checkpoint followed by JSON-patch deltas
+    against the last persisted snapshot, with a new checkpoint every
+    ``checkpoint_interval`` deltas.
+
+    Context retrieval uses an in-process :class:`VectorIndex` per campaign,
+    filled as seed chunks are embedded (or hydrated lazily on the first query
+    after a resume). The backend's own similarity search is only a fallback.
+    """
+
+    def __init__(
+        self,
+        llm_client: Optional[LLMClient] = None,
+        delta_saves: bool = True,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ):
+        self.llm_client = llm_client or LLMClient()
+        self._tokenizer = None
+
+        # Delta persistence bookkeeping
+        self.delta_saves = delta_saves
+        self.checkpoint_interval = checkpoint_interval
+        self._snapshots: Dict[str, _PersistedSnapshot] = {}
+        self._snapshots_lock = threading.Lock()
+
+        # Local vector indexes (campaign_id -> index), plus seed texts
+        # registered for lazy hydration on resume
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._pending_hydration: Dict[str, List[str]] = {}
+        self._indexes_lock = threading.Lock()
+
+    @property
+    def tokenizer(self):
+        """Lazy load tokenizer."""
+        if self._tokenizer is None:
+            self._tokenizer = tiktoken.encoding_for_model(EMBED_MODEL)
+        return self._tokenizer
+
+    def close(self) -> None:
+        """Release backend resources (connections, file handles)."""
+
+    def __enter__(self) -> "BaseCampaignRepository":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Backend interface
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def save_seed_chunk(
+        self,
+        chunk_order: int,
+        seed_chunk: str,
+        campaign_id: Optional[str] = None,
+    ) -> str:
+        """
+        Save a seed chunk (and its embeddings).
+
+        Args:
+            chunk_order: Order index of this chunk (0-4)
+            seed_chunk: The narrative chunk text
+            campaign_id: Campaign ID (omit for first chunk to create new campaign)
+
+        Returns:
+            The campaign ID (created on first call)
+        """
+
+    @abstractmethod
+    def load_campaign_chunks(self, campaign_id: str) -> List[Dict[str, Any]]:
+        """
+        Load all seed chunks for a campaign.
+
+        Args:
+            campaign_id: The campaign UUID
+
+        Returns:
+            List of chunk dicts with 'order' and 'text' keys
+        """
+
+    @abstractmethod
+    def _match_chunks(
+        self,
+        campaign_id: str,
+        embedding: List[float],
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
+        """Backend similarity search (fallback when no local index is available)."""
+
+    @abstractmethod
+    def _store_embeddings(
+        self,
+        campaign_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+    ) -> None:
+        """Persist chunk embeddings."""
+
+    def _load_chunk_embeddings(self, campaign_id: str) -> Optional[List[Tuple[str, List[float]]]]:
+        """
+        Load stored (chunk, embedding) pairs, if the backend can.
+
+        Returns:
+            The pairs, or None if the backend can't return embeddings
+            (the index is then rebuilt by re-embedding seed chunks)
+        """
+        return None
+
+    @abstractmethod
+    def _read_checkpoint(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Read the latest checkpoint state_json, or None if the campaign has none."""
+
+    @abstractmethod
+    def _write_checkpoint(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        """Write a full checkpoint (``state_json`` includes its ``checkpoint_id``)."""
+
+    @abstractmethod
+    def _read_deltas(self, campaign_id: str, checkpoint_id: str) -> List[Dict[str, Any]]:
+        """Read deltas (dicts with 'seq' and 'patch') recorded on top of a checkpoint."""
+
+    @abstractmethod
+    def _write_delta(
+        self,
+        campaign_id: str,
+        checkpoint_id: str,
+        seq: int,
+        patch: Patch,
+    ) -> bool:
+        """
+        Write a delta on top of a checkpoint.
+
+        Must be idempotent on (campaign_id, checkpoint_id, seq): a write
+        with an existing key replaces that delta instead of adding another.
+
+        Returns:
+            True if stored, False if the backend can't store deltas
+        """
+
+    def _write_scene_archive(
+        self,
+        campaign_id: str,
+        location: str,
+        scene_json: Dict[str, Any],
+    ) -> bool:
+        """
+        Store an evicted scene simulation as its own record.
+
+        Returns:
+            True if stored, False if the backend can't archive scenes
+            (scenes then stay resident)
+        """
+        return False
+
+    def _read_scene_archive(self, campaign_id: str, location: str) -> Optional[Dict[str, Any]]:
+        """Read an archived scene simulation, or None if there is none."""
+        return None
+
+    # ------------------------------------------------------------------
+    # Scene archive (shared)
+    # ------------------------------------------------------------------
+
+    def archive_scene(self, campaign_id: str, scene: SceneSimulation) -> bool:
+        """
+        Archive a cold scene so the runtime state can keep only its stub.
+
+        Args:
+            campaign_id: The campaign UUID
+            scene: The full scene simulation
+
+        Returns:
+            True if archived (safe to evict), False otherwise
+        """
+        try:
+            return self._write_scene_archive(campaign_id, scene.location, scene.model_dump())
+        except Exception as e:
+            logger.warning(f"Failed to archive scene {scene.location!r}: {e}")
+            return False
+
+    def load_archived_scene(self, campaign_id: str, location: str) -> Optional[SceneSimulation]:
+        """
+        Load an archived scene simulation.
+
+        Args:
+            campaign_id: The campaign UUID
+            location: The scene's location
+
+        Returns:
+            The full scene, or None if it isn't archived (or can't be read)
+        """
+        try:
+            scene_json = self._read_scene_archive(campaign_id, location)
+        except Exception as e:
+            logger.warning(f"Failed to load archived scene {location!r}: {e}")
+            return None
+        return SceneSimulation(**scene_json) if scene_json else None
+
+    # ------------------------------------------------------------------
+    # Runtime state (shared)
+    # ------------------------------------------------------------------
+
+    def save_runtime_state(
+        self,
+        campaign_id: str,
+        state: CampaignState,
+    ) -> None:
+        """
+        Save the current campaign state.
+
+        Args:
+            campaign_id: The campaign UUID
+            state: The campaign state to save
+        """
+        self.save_state_json(campaign_id, self.build_state_json(campaign_id, state))
+
+    def build_state_json(
+        self,
+        campaign_id: str,
+        state: CampaignState,
+    ) -> Dict[str, Any]:
+        """
+        Snapshot campaign state into the persisted ``state_json`` shape.
+
+        The result shares no mutable containers with ``state``, so it can be
+        handed to another thread while gameplay keeps mutating the state.
+
+        Args:
+            campaign_id: The campaign UUID
+            state: The campaign state to snapshot
+
+        Returns:
+            Dict compatible with the existing runtime state schema
+        """
+        return {
+            "campaign_id": campaign_id,
+            "phase": state.phase.value,
+            "genre": state.genre,
+            "tone": state.tone,
+            "story_type": state.story_type,
+            "character_sheet": state.character_sheet.model_dump(),
+            "seed_chunks": list(state.seed_chunks),
+            "inventory": list(state.inventory),
+            "abilities": list(state.abilities),
+            "locations": list(state.discovered_locations),
+            "key_people": list(state.known_npcs),
+            "world_events": list(state.active_events),
+            "message_history": [dict(m) for m in state.message_history[-50:]],  # Keep last 50 messages
+            # Simulation layer
+            "simulation": state.simulation.model_dump() if state.simulation else None,
+            "current_location": state.current_location,
+            "current_turn": state.current_turn,
+        }
+
+    def save_state_json(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        """
+        Persist a snapshot produced by :meth:`build_state_json`.
+
+        Sends only a delta against the last persisted snapshot when possible,
+        and a full checkpoint on first save or every ``checkpoint_interval``
+        deltas.
+
+        Args:
+            campaign_id: The campaign UUID
+            state_json: Runtime state snapshot
+        """
+        with self._snapshots_lock:
+            base = self._snapshots.get(campaign_id)
+
+        if self.delta_saves and base and base.seq < self.checkpoint_interval:
+            patch = make_patch(base.state_json, state_json)
+            if not patch:
+                return  # Nothing changed since the last save
+
+            try:
+                stored = self._write_delta(campaign_id, base.checkpoint_id, base.seq + 1, patch)
+            except Exception:
+                # The write may have been applied even though it failed (e.g. a
+                # timeout): never reuse its seq, start a new checkpoint next save
+                with self._snapshots_lock:
+                    self._snapshots.pop(campaign_id, None)
+                raise
+
+            if stored:
+                with self._snapshots_lock:
+                    self._snapshots[campaign_id] = _PersistedSnapshot(
+                        state_json=state_json,
+                        checkpoint_id=base.checkpoint_id,
+                        seq=base.seq + 1,
+                    )
+                return
+
+        checkpoint_id = uuid4().hex
+        self._write_checkpoint(campaign_id, {**state_json, "checkpoint_id": checkpoint_id})
+
+        with self._snapshots_lock:
+            self._snapshots[campaign_id] = _PersistedSnapshot(
+                state_json=state_json,
+                checkpoint_id=checkpoint_id,
+            )
+
+    def load_runtime_state(self, campaign_id: str) -> Optional[CampaignState]:
+        """
+        Load a campaign's runtime state.
+
+        Args:
+            campaign_id: The campaign UUID
+
+        Returns:
+            CampaignState if found, None otherwise
+        """
+        state_json = self._read_checkpoint(campaign_id)
+        if not state_json:
+            return None
+
+        state_json = self._replay_deltas(campaign_id, dict(state_json))
+        return CampaignState.from_saved(state_json)
+
+    def _replay_deltas(self, campaign_id: str, state_json: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply deltas stored after the loaded checkpoint and track the result as the save base."""
+        checkpoint_id = state_json.pop("checkpoint_id", None)
+        if not checkpoint_id:
+            return state_json  # Saved before delta persistence existed
+
+        seq = 0
+        if self.delta_saves:
+            # One delta per seq: a re-sent seq replaces the earlier write
+            deltas = {delta.get("seq", 0): delta for delta in self._read_deltas(campaign_id, checkpoint_id)}
+            for seq in sorted(deltas):
+                state_json = apply_patch(state_json, deltas[seq].get("patch", []))
+
+        with self._snapshots_lock:
+            self._snapshots[campaign_id] = _PersistedSnapshot(
+                state_json=state_json,
+                checkpoint_id=checkpoint_id,
+                seq=seq,
+            )
+        return state_json
+
+    # ------------------------------------------------------------------
+    # Context retrieval (shared)
+    # ------------------------------------------------------------------
+
+    def embed_query(self, query_text: str) -> List[float]:
+        """Embed a retrieval query with the same model as the stored chunks."""
+        return self.llm_client.embed(query_text, model=EMBED_MODEL)
+
+    def query_similar_chunks(
+        self,
+        campaign_id: str,
+        query_text: str,
+        top_k: int = 8,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find similar chunks using embedding similarity.
+
+        Searches the local vector index; falls back to the backend's
+        similarity search if the index can't be built.
+
+        Args:
+            campaign_id: The campaign UUID
+            query_text: Text to find similar chunks for
+            top_k: Number of results to return
+            query_embedding: Precomputed embedding of ``query_text`` (skips embedding)
+
+        Returns:
+            List of matching chunks (dicts with 'chunk' and 'similarity'), best first
+        """
+        # Generate embedding for query
+        query_embed = query_embedding or self.embed_query(query_text)
+
+        index = self._get_index(campaign_id)
+        if index is not None and len(index):
+            return index.search(query_embed, top_k)
+
+        return self._match_chunks(campaign_id, query_embed, top_k)
+
+    def hydrate_index(self, campaign_id: str, seed_chunks: Optional[List[str]] = None) -> None:
+        """
+        Register a resumed campaign for lazy index hydration.
+
+        Nothing is fetched or embedded until the first query. If the backend
+        can't return stored embeddings, ``seed_chunks`` are re-embedded
+        (falling back to :meth:`load_campaign_chunks` if not given).
+
+        Args:
+            campaign_id: The campaign UUID
+            seed_chunks: Seed chunk texts already in memory (e.g. from the state)
+        """
+        with self._indexes_lock:
+            if campaign_id in self._indexes:
+                return
+            if seed_chunks:
+                self._pending_hydration[campaign_id] = list(seed_chunks)
+
+    def _get_index(self, campaign_id: str) -> Optional[VectorIndex]:
+        """Get the campaign's index, hydrating it on first use (None if that fails)."""
+        with self._indexes_lock:
+            index = self._indexes.get(campaign_id)
+        if index is not None:
+            return index
+
+        try:
+            rows = self._load_chunk_embeddings(campaign_id)
+            if rows is None:
+                with self._indexes_lock:
+                    texts = self._pending_hydration.get(campaign_id)
+                if texts is None:
+                    texts = [c.get("text", "") for c in self.load_campaign_chunks(campaign_id)]
+                chunks = [chunk for text in texts for chunk in self._chunk_text(text)]
+                rows = list(zip(chunks, self.llm_client.embed_batch(chunks, model=EMBED_MODEL)))
+        except Exception as e:
+            logger.warning(f"Failed to hydrate vector index for {campaign_id}: {e}")
+            return None
+
+        index = VectorIndex()
+        index.add([chunk for chunk, _ in rows], [emb for _, emb in rows])
+        with self._indexes_lock:
+            # Another thread may have hydrated (or embedded into) it meanwhile
+            index = self._indexes.setdefault(campaign_id, index)
+            self._pending_hydration.pop(campaign_id, None)
+        return index
+
+    def _embed_and_store(self, campaign_id: str, text: str) -> None:
+        """Embed text chunks, add them to the local index and persist them."""
+        chunks = self._chunk_text(text)
+        if not chunks:
+            return
+
+        embeddings = self.llm_client.embed_batch(chunks, model=EMBED_MODEL)
+
+        with self._indexes_lock:
+            index = self._indexes.setdefault(campaign_id, VectorIndex())
+        index.add(chunks, embeddings)
+
+        self._store_embeddings(campaign_id, chunks, embeddings)
+
+    def _chunk_text(self, text: str, max_tokens: int = 600) -> List[str]:
+        """Split text into token-limited chunks."""
+        ids = self.tokenizer.encode(text)
+        chunks = []
+        for i in range(0, len(ids), max_tokens):
+            chunk_ids = ids[i : i + max_tokens]
+            chunks.append(self.tokenizer.decode(chunk_ids))
+        return chunks
@@ -0,0 +1,166 @@
+"""JSON-patch style deltas between runtime state snapshots.
+
+Produces a subset of RFC 6902 operations (``add``, ``remove``, ``replace``)
+and applies them back. The diff is tuned for the shape of ``state_json``:
+
+- dicts are diffed key by key
+- lists that grew at the end become ``add .../-`` operations
+- sliding windows (e.g. the last-50 ``message_history``) become a few
+  ``remove .../0`` operations followed by appends
+- same-length lists are diffed element by element (e.g. a ``triggered`` flag)
+- anything else is replaced wholesale
+"""
+
+import copy
+from typing import Any, Dict, List, Optional
+
+Patch = List[Dict[str, Any]]
+
+
+def make_patch(old: Any, new: Any) -> Patch:
+    """
+    Compute the operations that turn ``old`` into ``new``.
+
+    Args:
+        old: Previously persisted JSON-compatible value
+        new: Current JSON-compatible value
+
+    Returns:
+        List of patch operations (empty if the values are equal)
+    """
+    ops: Patch = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def apply_patch(doc: Any, patch: Patch) -> Any:
+    """
+    Apply patch operations to a deep copy of ``doc``.
+
+    Args:
+        doc: JSON-compatible value (not mutated)
+        patch: Operations produced by :func:`make_patch`
+
+    Returns:
+        The patched value
+
+    Raises:
+        ValueError: If an operation is malformed or its path doesn't resolve
+    """
+    root = {"": copy.deepcopy(doc)}
+
+    for op in patch:
+        parts = [""] + _split_path(op.get("path", ""))
+        parent = root
+        for part in parts[:-1]:
+            parent = _child(parent, part)
+        key = parts[-1]
+        kind = op.get("op")
+
+        if kind == "replace":
+            _set(parent, key, op["value"])
+        elif kind == "add":
+            if isinstance(parent, list):
+                if key == "-":
+                    parent.append(op["value"])
+                else:
+                    parent.insert(int(key), op["value"])
+            else:
+                parent[key] = op["value"]
+        elif kind == "remove":
+            if isinstance(parent, list):
+                del parent[int(key)]
+            else:
+                del parent[key]
+        else:
+            raise ValueError(f"Unsupported patch op: {kind!r}")
+
+    return root[""]
+
+
+def _diff(old: Any, new: Any, path: str, ops: Patch) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                _diff(old[key], value, child, ops)
+        return
+
+    if isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, ops)
+        return
+
+    if type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_list(old: list, new: list, path: str, ops: Patch) -> None:
+    if old == new:
+        return
+
+    shift = _window_shift(old, new)
+    if shift is not None:
+        for _ in range(shift):
+            ops.append({"op": "remove", "path": f"{path}/0"})
+        for value in new[len(old) - shift:]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+        return
+
+    if len(old) == len(new):
+        for i, (a, b) in enumerate(zip(old, new)):
+            _diff(a, b, f"{path}/{i}", ops)
+        return
+
+    ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _window_shift(old: list, new: list) -> Optional[int]:
+    """
+    Find the smallest ``k`` with ``old[k:]`` a prefix of ``new``.
+
+    ``k == 0`` is a pure append. Returns None when no non-empty overlap
+    exists (a wholesale replace is cheaper then).
+    """
+    if not old:
+        return 0
+    first = new[0] if new else None
+    for k in range(len(old)):
+        overlap = len(old) - k
+        if overlap > len(new) or old[k] != first:
+            continue
+        if old[k:] == new[:overlap]:
+            return k
+    return None
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _split_path(path: str) -> List[str]:
+    if not path:
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid patch path: {path!r}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path[1:].split("/")]
+
+
+def _child(container: Any, key: str) -> Any:
+    try:
+        if isinstance(container, list):
+            return container[int(key)]
+        return container[key]
+    except (KeyError, IndexError, ValueError, TypeError) as e:
+        raise ValueError(f"Patch path does not resolve at {key!r}") from e
+
+
+def _set(container: Any, key: str, value: Any) -> None:
+    if isinstance(container, list):
+        container[int(key)] = value
+    else:
+        container[key] = value
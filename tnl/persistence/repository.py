@@ -3,44 +3,104 @@
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
-import tiktoken
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..llm import LLMClient
-from ..models.campaign import CampaignState
+from .base import DEFAULT_CHECKPOINT_INTERVAL, BaseCampaignRepository
+from .delta import Patch
 
 logger = logging.getLogger(__name__)
 
 # Default to deployed API, can be overridden
 DEFAULT_BASE_URL = "https://tnl-api-blue-snow-1079.fly.dev"
-EMBED_MODEL = "text-embedding-3-small"
 
+# HTTP connection pooling defaults
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 30.0)  # (connect, read) seconds
+DEFAULT_HTTP_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
-class CampaignRepository:
+
+class CampaignRepository(BaseCampaignRepository):
     """
     Repository for campaign persistence.
 
     Wraps the existing FastAPI endpoints in app/api/v1/seed.py.
+
+    All calls go through one pooled ``requests.Session`` so connections to the
+    backend are kept alive instead of paying a TCP+TLS handshake per call.
+    The session is never mutated after construction, so one repository can be
+    shared by worker threads (e.g. in ``PlaytestOrchestrator``); size the pool
+    to at least the number of concurrent threads.
+
+    If the backend doesn't expose the delta endpoints, the repository falls
+    back to full state saves; without the scene archive endpoints, cold
+    scenes simply stay resident.
     """
 
     def __init__(
         self,
         base_url: Optional[str] = None,
         llm_client: Optional[LLMClient] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_HTTP_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        session: Optional[requests.Session] = None,
+        delta_saves: bool = True,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
     ):
+        super().__init__(
+            llm_client=llm_client,
+            delta_saves=delta_saves,
+            checkpoint_interval=checkpoint_interval,
+        )
         self.base_url = (base_url or os.getenv("SUPABASE_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
         self.api_base = f"{self.base_url}/v1"
-        self.llm_client = llm_client or LLMClient()
-        self._tokenizer = None
+        self.timeout = timeout
+        self.scene_archive = True  # Cleared if the backend has no scene archive endpoints
+        self.session = session or self._build_session(pool_size, max_retries, backoff_factor)
+
+    @staticmethod
+    def _build_session(
+        pool_size: int,
+        max_retries: int,
+        backoff_factor: float,
+    ) -> requests.Session:
+        """
+        Build a keep-alive session with a sized connection pool and retries.
+
+        Connection errors are retried for every method (nothing was sent).
+        Read errors and retryable status codes are only retried for
+        idempotent methods, so a campaign-creating POST is never replayed.
+        """
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
 
-    @property
-    def tokenizer(self):
-        """Lazy load tokenizer."""
-        if self._tokenizer is None:
-            self._tokenizer = tiktoken.encoding_for_model(EMBED_MODEL)
-        return self._tokenizer
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self.session.close()
 
     def save_seed_chunk(
         self,
@@ -66,10 +126,10 @@ class CampaignRepository:
         if campaign_id:
             payload["campaign_id"] = campaign_id
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.api_base}/save_seed_chunk",
             json=payload,
-            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
         )
         response.raise_for_status()
 
@@ -91,44 +151,37 @@ class CampaignRepository:
         Returns:
             List of chunk dicts with 'order' and 'text' keys
         """
-        response = requests.get(f"{self.api_base}/load_campaign/{campaign_id}")
+        response = self.session.get(
+            f"{self.api_base}/load_campaign/{campaign_id}",
+            timeout=self.timeout,
+        )
         response.raise_for_status()
         return response.json().get("chunks", [])
 
-    def save_runtime_state(
-        self,
-        campaign_id: str,
-        state: CampaignState,
-    ) -> None:
-        """
-        Save the current campaign state.
+    def _read_checkpoint(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch the runtime state checkpoint (None on 404)."""
+        try:
+            response = self.session.get(
+                f"{self.api_base}/load_runtime_state/{campaign_id}",
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
 
-        Args:
-            campaign_id: The campaign UUID
-            state: The campaign state to save
-        """
-        # Build state dict compatible with existing schema
-        state_json = {
-            "campaign_id": campaign_id,
-            "phase": state.phase.value,
-            "genre": state.genre,
-            "tone": state.tone,
-            "story_type": state.story_type,
-            "character_sheet": state.character_sheet.model_dump(),
-            "seed_chunks": state.seed_chunks,
-            "inventory": state.inventory,
-            "abilities": state.abilities,
-            "locations": state.discovered_locations,
-            "key_people": state.known_npcs,
-            "world_events": state.active_events,
-            "message_history": state.message_history[-50:],  # Keep last 50 messages
-            # Simulation layer
-            "simulation": state.simulation.model_dump() if state.simulation else None,
-            "current_location": state.current_location,
-            "current_turn": state.current_turn,
-        }
+            state_json = data.get("state_json")
+            if isinstance(state_json, str):
+                state_json = json.loads(state_json)
+
+            return state_json or None
 
-        response = requests.post(
+        except requests.HTTPError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    def _write_checkpoint(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        """Upload a full runtime state snapshot."""
+        response = self.session.post(
             f"{self.api_base}/save_runtime_state",
             json={
                 "campaign_id": campaign_id,
@@ -136,97 +189,135 @@ class CampaignRepository:
                 "thread_id": "",  # No longer used
                 "state_json": state_json,
             },
-            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
         )
         response.raise_for_status()
 
-    def load_runtime_state(self, campaign_id: str) -> Optional[CampaignState]:
+    def _write_delta(
+        self,
+        campaign_id: str,
+        checkpoint_id: str,
+        seq: int,
+        patch: Patch,
+    ) -> bool:
         """
-        Load a campaign's runtime state.
+        Upload a delta on top of a checkpoint.
 
-        Args:
-            campaign_id: The campaign UUID
+        (campaign_id, checkpoint_id, seq) is the delta's key: the backend
+        must upsert on it, so a retried upload replaces rather than appends.
 
         Returns:
-            CampaignState if found, None otherwise
+            True if stored, False if the backend has no delta support
+            (delta saves are then disabled for this repository)
         """
-        try:
-            response = requests.get(f"{self.api_base}/load_runtime_state/{campaign_id}")
-            response.raise_for_status()
-            data = response.json()
-
-            state_json = data.get("state_json")
-            if isinstance(state_json, str):
-                state_json = json.loads(state_json)
-
-            if not state_json:
-                return None
+        response = self.session.post(
+            f"{self.api_base}/save_runtime_delta",
+            json={
+                "campaign_id": campaign_id,
+                "checkpoint_id": checkpoint_id,
+                "seq": seq,
+                "patch": patch,
+            },
+            headers={"Idempotency-Key": f"{campaign_id}:{checkpoint_id}:{seq}"},
+            timeout=self.timeout,
+        )
+        if response.status_code in (404, 405):
+            logger.info("Backend has no delta endpoint; falling back to full state saves")
+            self.delta_saves = False
+            return False
+        response.raise_for_status()
+        return True
+
+    def _read_deltas(self, campaign_id: str, checkpoint_id: str) -> List[Dict[str, Any]]:
+        """Fetch deltas recorded on top of a checkpoint."""
+        response = self.session.get(
+            f"{self.api_base}/load_runtime_deltas/{campaign_id}",
+            params={"checkpoint_id": checkpoint_id},
+            timeout=self.timeout,
+        )
+        if response.status_code in (404, 405):
+            return []
+        response.raise_for_status()
+        return response.json().get("deltas", [])
 
-            return CampaignState.from_saved(state_json)
+    def _write_scene_archive(
+        self,
+        campaign_id: str,
+        location: str,
+        scene_json: Dict[str, Any],
+    ) -> bool:
+        """Upload an evicted scene (False if the backend has no scene archive)."""
+        if not self.scene_archive:
+            return False
+
+        response = self.session.post(
+            f"{self.api_base}/save_scene_archive",
+            json={
+                "campaign_id": campaign_id,
+                "location": location,
+                "scene_json": scene_json,
+            },
+            timeout=self.timeout,
+        )
+        if response.status_code in (404, 405):
+            logger.info("Backend has no scene archive endpoint; keeping scenes resident")
+            self.scene_archive = False
+            return False
+        response.raise_for_status()
+        return True
+
+    def _read_scene_archive(self, campaign_id: str, location: str) -> Optional[Dict[str, Any]]:
+        """Fetch an archived scene (None on 404)."""
+        response = self.session.get(
+            f"{self.api_base}/load_scene_archive/{campaign_id}",
+            params={"location": location},
+            timeout=self.timeout,
+        )
+        if response.status_code in (404, 405):
+            return None
+        response.raise_for_status()
 
-        except requests.HTTPError as e:
-            if e.response.status_code == 404:
-                return None
-            raise
+        scene_json = response.json().get("scene_json")
+        if isinstance(scene_json, str):
+            scene_json = json.loads(scene_json)
+        return scene_json or None
 
-    def query_similar_chunks(
+    def _match_chunks(
         self,
         campaign_id: str,
-        query_text: str,
-        top_k: int = 8,
+        embedding: List[float],
+        top_k: int,
     ) -> List[Dict[str, Any]]:
-        """
-        Find similar chunks using embedding similarity.
-
-        Args:
-            campaign_id: The campaign UUID
-            query_text: Text to find similar chunks for
-            top_k: Number of results to return
-
-        Returns:
-            List of matching chunks with similarity scores
-        """
-        # Generate embedding for query
-        query_embed = self.llm_client.embed(query_text)
-
-        response = requests.post(
+        """Remote similarity search via /match_chunks."""
+        response = self.session.post(
             f"{self.api_base}/match_chunks",
             json={
                 "campaign_id": campaign_id,
-                "embedding": query_embed,
+                "embedding": embedding,
                 "top_k": top_k,
             },
-            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
         )
         response.raise_for_status()
         return response.json()
 
-    def _chunk_text(self, text: str, max_tokens: int = 600) -> List[str]:
-        """Split text into token-limited chunks."""
-        ids = self.tokenizer.encode(text)
-        chunks = []
-        for i in range(0, len(ids), max_tokens):
-            chunk_ids = ids[i : i + max_tokens]
-            chunks.append(self.tokenizer.decode(chunk_ids))
-        return chunks
-
-    def _embed_and_store(self, campaign_id: str, text: str) -> None:
-        """Embed text chunks and store in database."""
-        chunks = self._chunk_text(text)
-        if not chunks:
-            return
-
-        embeddings = self.llm_client.embed_batch(chunks)
+    def _store_embeddings(
+        self,
+        campaign_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+    ) -> None:
+        """Store chunk embeddings via /bulk_embed."""
         rows = [
             {"campaign_id": campaign_id, "chunk": chunk, "embedding": emb}
             for chunk, emb in zip(chunks, embeddings)
         ]
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base}/bulk_embed",
                 json=rows,
-                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
             )
             response.raise_for_status()
         except requests.HTTPError as e:
@@ -0,0 +1,259 @@
+"""Local SQLite persistence backend.
+
+Stores seed chunks, runtime state checkpoints/deltas, archived scenes and
+chunk embeddings in a single WAL-mode database file, so campaigns, playtests
+and benchmarks can run without the remote API.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from ..llm import LLMClient
+from .base import DEFAULT_CHECKPOINT_INTERVAL, BaseCampaignRepository
+from .delta import Patch
+from .vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PATH = "tnl_local.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seed_chunks (
+    campaign_id TEXT NOT NULL,
+    chunk_order INTEGER NOT NULL,
+    seed_chunk TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, chunk_order)
+);
+
+CREATE TABLE IF NOT EXISTS runtime_state (
+    campaign_id TEXT PRIMARY KEY,
+    state_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS runtime_deltas (
+    campaign_id TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    patch TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, checkpoint_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS scene_archive (
+    campaign_id TEXT NOT NULL,
+    location TEXT NOT NULL,
+    scene_json TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, location)
+);
+
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id TEXT NOT NULL,
+    chunk TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    UNIQUE (campaign_id, chunk)
+);
+"""
+
+
+class SQLiteCampaignRepository(BaseCampaignRepository):
+    """
+    Campaign repository backed by a local SQLite database.
+
+    Each thread gets its own connection (WAL mode lets readers and the
+    write-behind saver proceed concurrently). Embeddings are stored as
+    float32 blobs.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SQLITE_PATH,
+        llm_client: Optional[LLMClient] = None,
+        delta_saves: bool = True,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ):
+        super().__init__(
+            llm_client=llm_client,
+            delta_saves=delta_saves,
+            checkpoint_interval=checkpoint_interval,
+        )
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._conn.executescript(SCHEMA)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread (created on first use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened by this repository."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def save_seed_chunk(
+        self,
+        chunk_order: int,
+        seed_chunk: str,
+        campaign_id: Optional[str] = None,
+    ) -> str:
+        """
+        Save a seed chunk to the database.
+
+        Args:
+            chunk_order: Order index of this chunk (0-4)
+            seed_chunk: The narrative chunk text
+            campaign_id: Campaign ID (omit for first chunk to create new campaign)
+
+        Returns:
+            The campaign ID (created on first call)
+        """
+        campaign_id = campaign_id or str(uuid4())
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO seed_chunks (campaign_id, chunk_order, seed_chunk) "
+                "VALUES (?, ?, ?)",
+                (campaign_id, chunk_order, seed_chunk),
+            )
+
+        # Also store embedding for context retrieval
+        self._embed_and_store(campaign_id, seed_chunk)
+
+        return campaign_id
+
+    def load_campaign_chunks(self, campaign_id: str) -> List[Dict[str, Any]]:
+        """
+        Load all seed chunks for a campaign.
+
+        Args:
+            campaign_id: The campaign UUID
+
+        Returns:
+            List of chunk dicts with 'order' and 'text' keys
+        """
+        rows = self._conn.execute(
+            "SELECT chunk_order, seed_chunk FROM seed_chunks "
+            "WHERE campaign_id = ? ORDER BY chunk_order",
+            (campaign_id,),
+        ).fetchall()
+        return [{"order": order, "text": text} for order, text in rows]
+
+    def _read_checkpoint(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT state_json FROM runtime_state WHERE campaign_id = ?",
+            (campaign_id,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_checkpoint(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runtime_state (campaign_id, state_json, updated_at) "
+                "VALUES (?, ?, CURRENT_TIMESTAMP)",
+                (campaign_id, json.dumps(state_json)),
+            )
+            # Deltas against older checkpoints can never be replayed again
+            conn.execute(
+                "DELETE FROM runtime_deltas WHERE campaign_id = ? AND checkpoint_id != ?",
+                (campaign_id, state_json.get("checkpoint_id", "")),
+            )
+
+    def _read_deltas(self, campaign_id: str, checkpoint_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT seq, patch FROM runtime_deltas "
+            "WHERE campaign_id = ? AND checkpoint_id = ? ORDER BY seq",
+            (campaign_id, checkpoint_id),
+        ).fetchall()
+        return [{"seq": seq, "patch": json.loads(patch)} for seq, patch in rows]
+
+    def _write_delta(
+        self,
+        campaign_id: str,
+        checkpoint_id: str,
+        seq: int,
+        patch: Patch,
+    ) -> bool:
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runtime_deltas (campaign_id, checkpoint_id, seq, patch) "
+                "VALUES (?, ?, ?, ?)",
+                (campaign_id, checkpoint_id, seq, json.dumps(patch)),
+            )
+        return True
+
+    def _write_scene_archive(
+        self,
+        campaign_id: str,
+        location: str,
+        scene_json: Dict[str, Any],
+    ) -> bool:
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scene_archive (campaign_id, location, scene_json) "
+                "VALUES (?, ?, ?)",
+                (campaign_id, location, json.dumps(scene_json)),
+            )
+        return True
+
+    def _read_scene_archive(self, campaign_id: str, location: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT scene_json FROM scene_archive WHERE campaign_id = ? AND location = ?",
+            (campaign_id, location),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _match_chunks(
+        self,
+        campaign_id: str,
+        embedding: List[float],
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
+        """Similarity search over stored embeddings (one-off index)."""
+        rows = self._load_chunk_embeddings(campaign_id)
+        index = VectorIndex()
+        index.add([chunk for chunk, _ in rows], [emb for _, emb in rows])
+        return index.search(embedding, top_k)
+
+    def _load_chunk_embeddings(self, campaign_id: str) -> List[Tuple[str, List[float]]]:
+        """Load stored (chunk, embedding) pairs for a campaign."""
+        rows = self._conn.execute(
+            "SELECT chunk, embedding FROM chunk_embeddings WHERE campaign_id = ? ORDER BY id",
+            (campaign_id,),
+        ).fetchall()
+        return [(chunk, array("f", blob).tolist()) for chunk, blob in rows]
+
+    def _store_embeddings(
+        self,
+        campaign_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+    ) -> None:
+        """Store chunk embeddings as float32 blobs (re-saving a chunk replaces its embedding)."""
+        with self._conn as conn:
+            conn.executemany(
+                "INSERT INTO chunk_embeddings (campaign_id, chunk, embedding) VALUES (?, ?, ?) "
+                "ON CONFLICT (campaign_id, chunk) DO UPDATE SET embedding = excluded.embedding",
+                [
+                    (campaign_id, chunk, array("f", emb).tobytes())
+                    for chunk, emb in zip(chunks, embeddings)
+                ],
+            )
@@ -0,0 +1,94 @@
+"""In-process vector index for campaign context retrieval.
+
+A campaign only has a few hundred embedded chunks, so a dense NumPy matrix
+of L2-normalized embeddings and one matrix-vector product per query beats
+any network round trip by orders of magnitude.
+"""
+
+import threading
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+class VectorIndex:
+    """Cosine top-k over a growing set of (chunk, embedding) rows, one row per distinct chunk."""
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def add(self, chunks: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """
+        Add chunks with their embeddings.
+
+        A chunk already in the index (e.g. a re-saved seed chunk) has its
+        embedding replaced rather than being added twice.
+
+        Args:
+            chunks: Chunk texts
+            embeddings: One embedding per chunk (same dimension for all)
+        """
+        if not chunks:
+            return
+
+        rows = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            # Copy on write: searches may still hold the previous matrix/list
+            matrix = self._matrix.copy() if self._matrix.size else rows[:0]
+            chunk_list = list(self._chunks)
+            appended = []
+            for chunk, row in zip(chunks, rows):
+                pos = self._positions.get(chunk)
+                if pos is None:
+                    self._positions[chunk] = pos = len(chunk_list)
+                    chunk_list.append(chunk)
+                    appended.append(row)
+                elif pos < matrix.shape[0]:
+                    matrix[pos] = row
+                else:
+                    appended[pos - matrix.shape[0]] = row
+            if appended:
+                matrix = np.vstack([matrix, np.stack(appended)])
+            self._matrix, self._chunks = matrix, chunk_list
+
+    def search(self, query: Sequence[float], top_k: int = 8) -> List[Dict[str, Any]]:
+        """
+        Find the chunks most similar to a query embedding.
+
+        Args:
+            query: Query embedding
+            top_k: Number of results to return
+
+        Returns:
+            List of dicts with 'chunk' and 'similarity', best first
+        """
+        with self._lock:
+            matrix, chunks = self._matrix, self._chunks
+        n = matrix.shape[0]
+
+        if n == 0 or top_k <= 0:
+            return []
+
+        q = _normalize(np.asarray(query, dtype=np.float32)[None, :])[0]
+        scores = matrix @ q
+
+        k = min(top_k, n)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+
+        return [{"chunk": chunks[i], "similarity": float(scores[i])} for i in top]
+
+
+def _normalize(rows: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return rows / norms
@@ -0,0 +1,145 @@
+"""Write-behind saver - takes runtime state saves off the gameplay critical path.
+
+Gameplay used to POST the full runtime state after every turn before the
+player saw the response. ``WriteBehindSaver`` snapshots the state on the
+caller's thread (cheap, local) and uploads it from a background worker.
+Successive saves for the same campaign are coalesced: only the latest
+snapshot is uploaded.
+"""
+
+import atexit
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from ..models.campaign import CampaignState
+from .base import BaseCampaignRepository
+
+logger = logging.getLogger(__name__)
+
+# Savers still alive at interpreter exit get flushed so queued saves aren't lost
+_live_savers: "weakref.WeakSet[WriteBehindSaver]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_savers() -> None:
+    for saver in list(_live_savers):
+        saver.close()
+
+
+class WriteBehindSaver:
+    """
+    Background, latest-wins persistence of campaign runtime state.
+
+    Usage:
+        saver = WriteBehindSaver(repository)
+        saver.submit(campaign_id, state)   # returns immediately
+        saver.flush()                      # block until everything is persisted
+        saver.close()                      # flush and stop the worker
+    """
+
+    def __init__(self, repository: BaseCampaignRepository):
+        self.repository = repository
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Counters (for debugging / benchmarks)
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_error: Optional[Exception] = None
+
+        self._worker = threading.Thread(
+            target=self._run,
+            name="tnl-write-behind",
+            daemon=True,
+        )
+        self._worker.start()
+        _live_savers.add(self)
+
+    def submit(self, campaign_id: str, state: CampaignState) -> None:
+        """
+        Queue a save of ``state``, replacing any unsaved snapshot for the campaign.
+
+        After :meth:`close`, saves are written synchronously instead.
+        """
+        state_json = self.repository.build_state_json(campaign_id, state)
+
+        with self._cond:
+            self.submitted += 1
+            if not self._closed:
+                if campaign_id in self._pending:
+                    self.coalesced += 1
+                self._pending[campaign_id] = state_json
+                self._cond.notify_all()
+                return
+
+        self._write(campaign_id, state_json)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until all queued saves have been written (or failed).
+
+        Args:
+            timeout: Max seconds to wait (None = wait indefinitely)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._in_flight == 0,
+                timeout=timeout,
+            )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush outstanding saves and stop the background worker."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+
+        # The worker drains the queue before exiting
+        self._worker.join(timeout)
+        _live_savers.discard(self)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of campaigns with an unsaved snapshot queued."""
+        with self._cond:
+            return len(self._pending)
+
+    def _run(self) -> None:
+        """Worker loop: upload the oldest pending snapshot until closed and drained."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return  # closed and drained
+
+                campaign_id = next(iter(self._pending))
+                state_json = self._pending.pop(campaign_id)
+                self._in_flight += 1
+
+            try:
+                self._write(campaign_id, state_json)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def _write(self, campaign_id: str, state_json: Dict[str, Any]) -> None:
+        """Upload one snapshot, logging (not raising) failures like the sync path."""
+        try:
+            self.repository.save_state_json(campaign_id, state_json)
+            self.written += 1
+        except Exception as e:
+            self.failed += 1
+            self.last_error = e
+            logger.warning(f"Failed to save state for {campaign_id}: {e}")
@@ -60,6 +60,10 @@ class Phase(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """Release background resources held by the phase (if any)."""
+        pass
+
     def can_skip(self) -> bool:
         """Whether this phase can be skipped (e.g., on resume)."""
         return False
@@ -134,6 +134,7 @@ Ready to lock it in? Say "yes" to continue, or tell me what to adjust."""
             schema=CharacterSummaryResponse,
             max_tokens=500,
             temperature=0.7,
+            cache=True,  # The same description gives the same character
         )
 
         return CharacterSheet(
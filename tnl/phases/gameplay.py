@@ -3,36 +3,66 @@
 import json
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from ..llm import LLMClient
 from ..models.campaign import CampaignPhase, CampaignState
-from ..models.simulation import TriggerResult
-from ..persistence import CampaignRepository
+from ..models.simulation import SceneSimulation, TriggerResult
+from ..persistence import BaseCampaignRepository, WriteBehindSaver
 from ..prompts import GAMEPLAY_RESPONSE_PROMPT, GAMEPLAY_SYSTEM_PROMPT, build_intro_prompt
-from ..simulation import SceneDetector, SceneSimulationGenerator, SimulationEvaluator
+from ..simulation import ScenePregenerator, SceneDetector, SceneSimulationGenerator, SimulationEvaluator
 from .base import Phase, PhaseResult
 
 logger = logging.getLogger(__name__)
 
+ERROR_MESSAGE = "The world shimmers uncertainly... (Error - try again)"
+
+# Scenes not visited for this many turns are archived and replaced by stubs
+DEFAULT_SCENE_IDLE_TURNS = 15
+
 
 class GameplayPhase(Phase):
     """Handle active gameplay with simulation layer."""
 
-    def __init__(self, llm_client: LLMClient, repository: CampaignRepository):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        repository: BaseCampaignRepository,
+        saver: Optional[WriteBehindSaver] = None,
+        scene_idle_turns: Optional[int] = DEFAULT_SCENE_IDLE_TURNS,
+        speculate_scenes: bool = True,
+    ):
         self.llm = llm_client
         self.repository = repository
+        self.saver = saver  # If set, per-turn saves happen in the background
+        self.scene_idle_turns = scene_idle_turns  # None disables cold-scene archival
         self._intro_shown = False
 
+        # Runs work that can overlap with the simulation layer (context retrieval)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tnl-gameplay")
+        # Writes cold scenes to the repository's scene archive off the turn's critical path
+        self._archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tnl-archive")
+        # In-flight archive batch: (future of archived locations, location -> (scene, last visited turn))
+        self._archive_batch: Optional[Tuple[Future, Dict[str, Tuple[SceneSimulation, int]]]] = None
+
         # Simulation components
-        self.scene_detector = SceneDetector()
         self.scene_generator = SceneSimulationGenerator(llm_client)
-        self.evaluator = SimulationEvaluator()
+        self.evaluator = SimulationEvaluator(llm_client)
+        # Generates likely next scenes during the player's think time
+        self.pregenerator = ScenePregenerator(self.scene_generator) if speculate_scenes else None
 
     @property
     def phase_type(self) -> CampaignPhase:
         return CampaignPhase.GAMEPLAY
 
+    def close(self) -> None:
+        """Stop the background executors."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._archiver.shutdown(wait=False, cancel_futures=True)
+        if self.pregenerator:
+            self.pregenerator.close()
+
     def enter(self, state: CampaignState) -> str:
         """Generate and show campaign introduction."""
         self._intro_shown = False
@@ -46,6 +76,7 @@ class GameplayPhase(Phase):
             self._intro_shown = True
             state.add_message("assistant", intro)
             self._save_state(state)
+            self._speculate(state, intro)
             return PhaseResult(display_message=intro)
 
         # Regular gameplay turn
@@ -59,18 +90,81 @@ class GameplayPhase(Phase):
 
             state.add_message("assistant", response)
             self._save_state(state)
+            self._speculate(state, response)
 
             return PhaseResult(display_message=response)
 
         except Exception as e:
             logger.error(f"Gameplay response failed: {e}")
             return PhaseResult(
-                display_message="The world shimmers uncertainly... (Error - try again)",
+                display_message=ERROR_MESSAGE,
                 error=str(e),
             )
 
+    def handle_input_stream(self, user_input: str, state: CampaignState) -> Iterator[str]:
+        """
+        Streaming variant of :meth:`handle_input`.
+
+        The simulation layer (scene detection/generation, triggers, context
+        retrieval) runs before this returns, so callers can show a progress
+        indicator for just that part. The returned iterator yields narration
+        deltas as the LLM produces them; once it is drained, state changes
+        are parsed and the state is saved exactly as in the blocking path.
+        """
+        # First turn: stream the intro
+        if not self._intro_shown:
+            return self._stream_intro(state)
+
+        # Regular gameplay turn
+        state.add_message("user", user_input)
+
+        try:
+            request = self._prepare_response(user_input, state)
+        except Exception as e:
+            logger.error(f"Gameplay response failed: {e}")
+            return iter([ERROR_MESSAGE])
+        return self._stream_response(request, state)
+
+    def _stream_intro(self, state: CampaignState) -> Iterator[str]:
+        """Yield the opening scene's deltas, then record and save it."""
+        parts = []
+        for delta in self.llm.generate_stream(**self._intro_request(state)):
+            parts.append(delta)
+            yield delta
+        intro = "".join(parts)
+        self._intro_shown = True
+        state.add_message("assistant", intro)
+        self._save_state(state)
+        self._speculate(state, intro)
+
+    def _stream_response(self, request: Dict[str, Any], state: CampaignState) -> Iterator[str]:
+        """Yield a turn's narration deltas, then apply and save it."""
+        parts = []
+        try:
+            # The first narration token is what the player waits on: hedge a slow start
+            for delta in self.llm.generate_stream(hedge=True, **request):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            logger.error(f"Gameplay response failed: {e}")
+            yield ("\n\n" if parts else "") + ERROR_MESSAGE
+            return
+
+        response = "".join(parts)
+
+        # Parse any state changes from response
+        self._parse_state_changes(response, state)
+
+        state.add_message("assistant", response)
+        self._save_state(state)
+        self._speculate(state, response)
+
     def _generate_intro(self, state: CampaignState) -> str:
         """Generate the campaign opening scene with genre-aware variety."""
+        return self.llm.generate(**self._intro_request(state))
+
+    def _intro_request(self, state: CampaignState) -> Dict[str, Any]:
+        """Build LLM kwargs for the campaign opening scene."""
         world_context = "\n\n".join(state.seed_chunks)
 
         # Use genre-aware prompt builder for variety
@@ -82,39 +176,77 @@ class GameplayPhase(Phase):
             world_context=world_context,
         )
 
-        return self.llm.generate(
-            prompt=prompt,
-            max_tokens=600,
-            temperature=0.8,
-        )
+        return {
+            "prompt": prompt,
+            "max_tokens": 600,
+            "temperature": 0.8,
+        }
 
     def _generate_response(self, user_input: str, state: CampaignState) -> str:
         """Generate response to player action with simulation layer."""
+        # The narration is what the player waits on: hedge slow requests
+        return self.llm.generate(hedge=True, **self._prepare_response(user_input, state))
+
+    def _prepare_response(self, user_input: str, state: CampaignState) -> Dict[str, Any]:
+        """
+        Run the simulation layer for a player action and build the narration request.
+
+        Context retrieval (embed + similarity search) doesn't depend on the
+        simulation layer, so it runs in the background while scenes are
+        detected/generated and triggers evaluated. The input embedding is
+        computed once and shared by retrieval and semantic triggers.
+
+        Returns:
+            LLM kwargs for the narration call (shared by blocking and streaming paths)
+        """
+        embedding_future = self._executor.submit(self._embed_input, user_input)
+        context_future = self._executor.submit(self._get_context, user_input, state, embedding_future)
+
         # STEP 1: Detect scene transition
-        new_location = self.scene_detector.detect_scene_transition(
+        new_location = SceneDetector.for_genre(state.genre).detect_scene_transition(
             user_input, state.current_location
         )
+        if new_location:
+            # Map aliases ("Old Docks" / "The Old Docks") onto existing scenes
+            new_location = self._resolve_location(new_location, state)
+            if new_location == state.current_location:
+                new_location = None
 
         # STEP 2: Generate simulation for new scene (if transitioning)
+        if new_location and self.pregenerator and state.campaign_id:
+            self.pregenerator.record_move(state.campaign_id, state.current_location, new_location)
+
         if new_location and new_location not in state.simulation.scenes:
             logger.info(f"Player entering new location: {new_location}")
-            world_context_for_sim = "\n\n".join(state.seed_chunks[:3])
-            scene_sim = self.scene_generator.generate_scene_simulation(
-                location=new_location,
-                state=state,
-                world_context=world_context_for_sim,
-            )
+            scene_sim = self.pregenerator.take(state.campaign_id, new_location) if self.pregenerator else None
+            if scene_sim is None:
+                world_context_for_sim = "\n\n".join(state.seed_chunks[:3])
+                scene_sim = self.scene_generator.generate_scene_simulation(
+                    location=new_location,
+                    state=state,
+                    world_context=world_context_for_sim,
+                )
             # Store simulation - now "pre-exists" for this scene
-            state.simulation.add_scene(scene_sim)
+            state.simulation.add_scene(scene_sim, state.current_turn)
             state.current_location = new_location
             state.simulation.current_location = new_location
 
             # Add to discovered locations
-            if new_location not in state.discovered_locations:
-                state.discovered_locations.append(new_location)
+            state.discovered_locations.add(new_location)
+        elif new_location:
+            # Re-entering a known scene (rehydrate it if it was archived)
+            if state.simulation.scenes[new_location].archived:
+                self._rehydrate_scene(new_location, state)
+            state.current_location = new_location
+            state.simulation.current_location = new_location
+
+        if state.current_location:
+            state.simulation.touch_scene(state.current_location, state.current_turn)
 
         # STEP 3: Evaluate triggers against player action
-        trigger_results = self.evaluator.evaluate_action(user_input, state)
+        trigger_results = self.evaluator.evaluate_action(
+            user_input, state, query_embedding=embedding_future.result()
+        )
         timed_results = self.evaluator.advance_timed_events(state)
         all_triggers = trigger_results + timed_results
 
@@ -126,8 +258,8 @@ class GameplayPhase(Phase):
             if result.triggered:
                 state.simulation.mark_triggered(result.element_id)
 
-        # Get relevant context from embeddings
-        context_chunks = self._get_context(user_input, state)
+        # Get relevant context from embeddings (started above)
+        context_chunks = context_future.result()
         world_context = "\n\n".join(context_chunks) if context_chunks else "\n\n".join(state.seed_chunks[:2])
 
         # Build system prompt with current state
@@ -152,13 +284,13 @@ class GameplayPhase(Phase):
         # Generate response
         prompt = GAMEPLAY_RESPONSE_PROMPT.format(player_input=user_input)
 
-        return self.llm.generate(
-            prompt=prompt,
-            system_prompt=system,
-            context=context,
-            max_tokens=600,
-            temperature=0.8,
-        )
+        return {
+            "prompt": prompt,
+            "system_prompt": system,
+            "context": context,
+            "max_tokens": 600,
+            "temperature": 0.8,
+        }
 
     def _build_simulation_injection(self, triggers: List[TriggerResult]) -> str:
         """Build simulation context to inject into system prompt."""
@@ -176,7 +308,20 @@ class GameplayPhase(Phase):
 
         return "\n\n".join(parts)
 
-    def _get_context(self, query: str, state: CampaignState) -> List[str]:
+    def _embed_input(self, user_input: str) -> Optional[List[float]]:
+        """Embed the player input (None on failure)."""
+        try:
+            return self.repository.embed_query(user_input)
+        except Exception as e:
+            logger.warning(f"Input embedding failed: {e}")
+            return None
+
+    def _get_context(
+        self,
+        query: str,
+        state: CampaignState,
+        embedding_future: Optional[Future] = None,
+    ) -> List[str]:
         """Retrieve relevant context chunks via embedding similarity."""
         if not state.campaign_id:
             return []
@@ -186,6 +331,7 @@ class GameplayPhase(Phase):
                 campaign_id=state.campaign_id,
                 query_text=query,
                 top_k=5,
+                query_embedding=embedding_future.result() if embedding_future else None,
             )
             return [m.get("chunk", "") for m in matches if m.get("chunk")]
         except Exception as e:
@@ -209,23 +355,19 @@ class GameplayPhase(Phase):
             # Apply changes
             if "inventory_add" in changes:
                 for item in changes["inventory_add"]:
-                    if item not in state.inventory:
-                        state.inventory.append(item)
+                    state.inventory.add(str(item))
 
             if "inventory_remove" in changes:
                 for item in changes["inventory_remove"]:
-                    if item in state.inventory:
-                        state.inventory.remove(item)
+                    state.inventory.discard(str(item))
 
             if "abilities_add" in changes:
                 for ability in changes["abilities_add"]:
-                    if ability not in state.abilities:
-                        state.abilities.append(ability)
+                    state.abilities.add(str(ability))
 
             if "locations_add" in changes:
                 for loc in changes["locations_add"]:
-                    if loc not in state.discovered_locations:
-                        state.discovered_locations.append(loc)
+                    state.discovered_locations.add(str(loc))
 
             if "npcs_add" in changes:
                 for npc in changes["npcs_add"]:
@@ -234,18 +376,99 @@ class GameplayPhase(Phase):
                         npc_name = npc.get("name", str(npc))
                     else:
                         npc_name = str(npc)
-                    if npc_name not in state.known_npcs:
-                        state.known_npcs.append(npc_name)
+                    state.known_npcs.add(npc_name)
 
             logger.info(f"Applied state changes: {changes}")
 
         except json.JSONDecodeError as e:
             logger.warning(f"Failed to parse state changes: {e}")
 
+    def _resolve_location(self, location: str, state: CampaignState) -> str:
+        """Canonical scene for a detected location (token match if embedding fails)."""
+        try:
+            return state.simulation.resolve_location(location, embed_batch=self.llm.embed_batch)
+        except Exception as e:
+            logger.warning(f"Location embedding failed: {e}")
+            return state.simulation.resolve_location(location)
+
+    def _speculate(self, state: CampaignState, narration: str) -> None:
+        """Start pre-generating scenes the player may enter next (never raises)."""
+        if not self.pregenerator:
+            return
+        try:
+            self.pregenerator.speculate(state, narration)
+        except Exception as e:
+            logger.warning(f"Scene speculation failed: {e}")
+
+    def _rehydrate_scene(self, location: str, state: CampaignState) -> None:
+        """Swap an archived scene's stub for the full scene from the repository."""
+        scene = None
+        if state.campaign_id:
+            scene = self.repository.load_archived_scene(state.campaign_id, location)
+
+        if scene is None:
+            # Archive lost: keep the stub (no hidden elements) rather than retry every turn
+            logger.warning(f"Archived scene {location!r} not found; continuing without its elements")
+            state.simulation.scenes[location].archived = False
+            return
+
+        logger.info(f"Rehydrated archived scene: {location}")
+        state.simulation.restore_scene(scene)
+
+    def _archive_cold_scenes(self, state: CampaignState) -> None:
+        """
+        Archive scenes the player hasn't visited for ``scene_idle_turns`` turns.
+
+        Cold scenes are written to the repository in the background, each as
+        its own record. On a later save, the ones whose write succeeded (and
+        that weren't visited meanwhile) are replaced by stubs, so per-turn
+        saves only carry recently visited scenes. A scene is never evicted
+        before its archive write succeeded.
+        """
+        if self.scene_idle_turns is None or not state.campaign_id:
+            return
+
+        simulation = state.simulation
+        if self._archive_batch is not None:
+            future, batch = self._archive_batch
+            if not future.done():
+                return
+            self._archive_batch = None
+            try:
+                archived = future.result()
+            except Exception as e:
+                logger.warning(f"Scene archival failed: {e}")
+                archived = []
+            for location in archived:
+                scene, visited_turn = batch[location]
+                if simulation.scenes.get(location) is scene and scene.last_visited_turn == visited_turn:
+                    simulation.evict_scene(location)
+                    logger.info(f"Archived cold scene: {location}")
+
+        cold = simulation.cold_scenes(state.current_turn, self.scene_idle_turns)
+        if cold:
+            # Snapshots, so the worker never reads scenes gameplay is mutating
+            snapshots = [SceneSimulation(**scene.model_dump()) for scene in cold]
+            future = self._archiver.submit(self._archive_scenes, state.campaign_id, snapshots)
+            self._archive_batch = (future, {scene.location: (scene, scene.last_visited_turn) for scene in cold})
+
+    def _archive_scenes(self, campaign_id: str, scenes: List[SceneSimulation]) -> List[str]:
+        """Archive scene snapshots (background); returns the locations stored."""
+        archived = []
+        for scene in scenes:
+            if not self.repository.archive_scene(campaign_id, scene):
+                break  # Backend can't archive (or is failing) - try again on a later save
+            archived.append(scene.location)
+        return archived
+
     def _save_state(self, state: CampaignState) -> None:
-        """Persist current state."""
+        """Persist current state (write-behind if a saver is configured)."""
         if state.campaign_id:
             try:
-                self.repository.save_runtime_state(state.campaign_id, state)
+                self._archive_cold_scenes(state)
+                if self.saver:
+                    self.saver.submit(state.campaign_id, state)
+                else:
+                    self.repository.save_runtime_state(state.campaign_id, state)
             except Exception as e:
                 logger.warning(f"Failed to save state: {e}")
@@ -1,11 +1,13 @@
 """World generation phase - code-controlled chunk generation."""
 
 import logging
-from typing import List, Optional
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from ..llm import LLMClient
 from ..models.campaign import CampaignPhase, CampaignState
-from ..persistence import CampaignRepository
+from ..persistence import BaseCampaignRepository
 from ..prompts import WORLD_CHUNK_PROMPTS
 from .base import Phase, PhaseResult
 
@@ -20,18 +22,42 @@ CHUNK_TYPES = [
     "player_hook",
 ]
 
+# Context each chunk needs in parallel mode. Sequential mode gives every
+# chunk all previous chunks; parallel mode trims this to what the prompt
+# actually builds on, so independent chunks can be generated together.
+PARALLEL_CHUNK_DEPENDENCIES: Dict[str, List[str]] = {
+    "atmospheric_setup": [],
+    "factions_overview": [],
+    "key_figures": ["factions_overview"],
+    "world_events": ["factions_overview"],
+    "player_hook": ["atmospheric_setup", "factions_overview", "key_figures", "world_events"],
+}
+
 
 class WorldGenPhase(Phase):
     """
     Generate the hidden world seed.
 
     This is the CRITICAL FIX - code controls the generation loop,
-    not the AI. Each chunk is generated, saved, then we move to the next.
+    not the AI. Generation is pipelined: while chunk N+1 is being generated,
+    chunk N is saved and embedded in the background (saves stay in order).
+
+    With ``parallel_chunks`` (or ``TNL_PARALLEL_WORLDGEN=1``), chunks only get
+    the context listed in ``PARALLEL_CHUNK_DEPENDENCIES`` and independent
+    chunks are generated concurrently (3 LLM rounds instead of 5).
     """
 
-    def __init__(self, llm_client: LLMClient, repository: CampaignRepository):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        repository: BaseCampaignRepository,
+        parallel_chunks: Optional[bool] = None,
+    ):
         self.llm = llm_client
         self.repository = repository
+        if parallel_chunks is None:
+            parallel_chunks = os.getenv("TNL_PARALLEL_WORLDGEN", "") == "1"
+        self.parallel_chunks = parallel_chunks
         self._generation_started = False
         self._generation_complete = False
 
@@ -97,44 +123,49 @@ Type **continue** when you're ready to begin."""
 
     def _generate_world(self, state: CampaignState) -> None:
         """
-        Generate all 5 world chunks sequentially.
+        Generate all 5 world chunks, persisting each in the background.
 
         THIS IS THE KEY CHANGE: Code controls the loop, not AI.
         """
         character_summary = state.character_sheet.summary()
-        campaign_id: Optional[str] = None
-        previous_chunks: List[str] = []
-
-        for i, chunk_type in enumerate(CHUNK_TYPES):
-            logger.info(f"Generating chunk {i + 1}/5: {chunk_type}")
-
-            # Build prompt with context
-            prompt = WORLD_CHUNK_PROMPTS[chunk_type].format(
-                genre=state.genre,
-                tone=state.tone,
-                character_summary=character_summary,
-                previous_chunks="\n\n".join(previous_chunks) if previous_chunks else "(none yet)",
+        texts: Dict[str, str] = {}
+        saves: List[Future] = []
+        saved_ids: List[Optional[str]] = [None]
+
+        def save_chunk(order: int, chunk_text: str) -> None:
+            # First save creates the campaign; later saves need its ID
+            if order > 0 and saved_ids[0] is None:
+                raise RuntimeError("Cannot save chunk: campaign was not created")
+            saved_ids[0] = self.repository.save_seed_chunk(
+                chunk_order=order,
+                seed_chunk=chunk_text,
+                campaign_id=saved_ids[0],
             )
+            logger.info(f"Saved chunk {order + 1} to campaign {saved_ids[0]}")
 
-            # Generate chunk
-            chunk_text = self.llm.generate(
-                prompt=prompt,
-                max_tokens=500,
-                temperature=0.8,
-            )
+        with ThreadPoolExecutor(max_workers=len(CHUNK_TYPES), thread_name_prefix="tnl-worldgen") as gen_pool, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="tnl-worldgen-save") as save_pool:
+            next_to_save = 0
+            for stage in self._generation_stages():
+                futures = {
+                    chunk_type: gen_pool.submit(self._generate_chunk, chunk_type, state, character_summary, texts)
+                    for chunk_type in stage
+                }
+                for chunk_type in stage:
+                    texts[chunk_type] = futures[chunk_type].result()
 
-            # Save chunk (first call creates campaign)
-            campaign_id = self.repository.save_seed_chunk(
-                chunk_order=i,
-                seed_chunk=chunk_text,
-                campaign_id=campaign_id,
-            )
+                # Queue saves in chunk order as soon as the next one is ready
+                while next_to_save < len(CHUNK_TYPES) and CHUNK_TYPES[next_to_save] in texts:
+                    saves.append(save_pool.submit(save_chunk, next_to_save, texts[CHUNK_TYPES[next_to_save]]))
+                    next_to_save += 1
 
-            # Track for context
-            state.seed_chunks.append(chunk_text)
-            previous_chunks.append(chunk_text)
+            for future in saves:
+                future.result()  # Surface save errors
 
-            logger.info(f"Saved chunk {i + 1} to campaign {campaign_id}")
+        campaign_id = saved_ids[0]
+
+        # Track for context
+        state.seed_chunks.extend(texts[chunk_type] for chunk_type in CHUNK_TYPES)
 
         # Store campaign ID in state
         state.campaign_id = campaign_id
@@ -142,6 +173,53 @@ Type **continue** when you're ready to begin."""
         # Save full state
         self.repository.save_runtime_state(campaign_id, state)
 
+    def _generation_stages(self) -> List[List[str]]:
+        """Group chunk types into rounds whose members can be generated together."""
+        if not self.parallel_chunks:
+            return [[chunk_type] for chunk_type in CHUNK_TYPES]
+
+        stages: List[List[str]] = []
+        done: set = set()
+        remaining = list(CHUNK_TYPES)
+        while remaining:
+            stage = [c for c in remaining if all(d in done for d in PARALLEL_CHUNK_DEPENDENCIES[c])]
+            stages.append(stage)
+            done.update(stage)
+            remaining = [c for c in remaining if c not in done]
+        return stages
+
+    def _generate_chunk(
+        self,
+        chunk_type: str,
+        state: CampaignState,
+        character_summary: str,
+        texts: Dict[str, str],
+    ) -> str:
+        """Generate one chunk given the chunks generated so far."""
+        i = CHUNK_TYPES.index(chunk_type)
+        logger.info(f"Generating chunk {i + 1}/5: {chunk_type}")
+
+        if self.parallel_chunks:
+            context_types = PARALLEL_CHUNK_DEPENDENCIES[chunk_type]
+        else:
+            context_types = CHUNK_TYPES[:i]
+        previous_chunks = [texts[c] for c in context_types]
+
+        # Build prompt with context
+        prompt = WORLD_CHUNK_PROMPTS[chunk_type].format(
+            genre=state.genre,
+            tone=state.tone,
+            character_summary=character_summary,
+            previous_chunks="\n\n".join(previous_chunks) if previous_chunks else "(none yet)",
+        )
+
+        # Generate chunk
+        return self.llm.generate(
+            prompt=prompt,
+            max_tokens=500,
+            temperature=0.8,
+        )
+
     def generate_sync(self, state: CampaignState) -> str:
         """
         Synchronous generation for non-interactive use.
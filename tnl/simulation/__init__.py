@@ -3,15 +3,19 @@
 This module provides:
 - SceneDetector: Detects when player enters a new location
 - SceneSimulationGenerator: Generates hidden elements for scenes
-- SimulationEvaluator: Evaluates triggers against player actions
+- SimulationEvaluator: Evaluates triggers against player actions (live or in batch)
+- ScenePregenerator: Speculatively generates likely next scenes in the background
 """
 
 from .detector import SceneDetector
 from .generator import SceneSimulationGenerator
-from .evaluator import SimulationEvaluator
+from .evaluator import BatchEvaluation, SimulationEvaluator
+from .pregen import ScenePregenerator
 
 __all__ = [
+    "BatchEvaluation",
     "SceneDetector",
+    "ScenePregenerator",
     "SceneSimulationGenerator",
     "SimulationEvaluator",
 ]
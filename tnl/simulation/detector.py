@@ -4,56 +4,116 @@ Detects when a player is entering a new scene/location from their input.
 """
 
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Keywords indicating location change (earlier entries take priority)
+MOVEMENT_KEYWORDS: Tuple[str, ...] = (
+    "go to",
+    "walk to",
+    "walk into",
+    "enter",
+    "head to",
+    "head into",
+    "visit",
+    "step into",
+    "step inside",
+    "approach",
+    "leave for",
+    "exit to",
+    "travel to",
+    "make my way to",
+    "head inside",
+    "go inside",
+    "walk inside",
+    "go into",
+    "go in",
+    "walk in",
+)
+
+# Extra genre-flavoured movement phrases, checked after the defaults
+GENRE_MOVEMENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "cyberpunk": ("jack into", "take the maglev to"),
+    "dark fantasy": ("ride to", "sail to", "descend into"),
+    "noir": ("drive to", "take a cab to", "stop by"),
+    "sci-fi horror": ("board the", "dock at", "crawl into"),
+    "post-apocalyptic": ("drive to", "hike to", "scavenge in"),
+    "steampunk": ("board the", "ride to", "take the airship to"),
+    "gothic": ("ride to", "descend into", "climb to"),
+    "mythic": ("ride to", "sail to", "journey to"),
+}
+
+# Words to strip from extracted locations
+STRIP_WORDS: FrozenSet[str] = frozenset({"the", "a", "an", "to", "into", "inside"})
+
+# Trailing phrases to remove from location names
+TRAILING_PHRASES: Tuple[str, ...] = (
+    "at the coordinates",
+    "at the coordinate",
+    "at coordinates",
+    "on the map",
+    "from the note",
+    "that was mentioned",
+    "where",
+    "at the",
+)
+
+# Words that indicate NOT a location (actions, not places)
+NON_LOCATION_WORDS: FrozenSet[str] = frozenset({
+    "avoid", "escape", "evade", "hide", "fight", "attack",
+    "run", "flee", "dodge", "them", "him", "her", "it",
+    "trouble", "danger", "agents", "guards", "police",
+})
+
+
+def _alternation(phrases: Iterable[str]) -> str:
+    """Regex alternation of literal phrases, longest first (never matches if there are none)."""
+    return "|".join(re.escape(p) for p in sorted(set(phrases), key=len, reverse=True)) or "(?!)"
 
 
 class SceneDetector:
-    """Detect scene transitions from player input."""
-
-    # Keywords indicating location change
-    MOVEMENT_KEYWORDS = [
-        "go to",
-        "walk to",
-        "walk into",
-        "enter",
-        "head to",
-        "head into",
-        "visit",
-        "step into",
-        "step inside",
-        "approach",
-        "leave for",
-        "exit to",
-        "travel to",
-        "make my way to",
-        "head inside",
-        "go inside",
-        "walk inside",
-        "go in",
-        "walk in",
-    ]
-
-    # Words to strip from extracted locations
-    STRIP_WORDS = ["the", "a", "an", "to", "into", "inside"]
-
-    # Trailing phrases to remove from location names
-    TRAILING_PHRASES = [
-        "at the coordinates",
-        "at the coordinate",
-        "at coordinates",
-        "on the map",
-        "from the note",
-        "that was mentioned",
-        "where",
-        "at the",
-    ]
-
-    # Phrases that indicate NOT a location (actions, not places)
-    NON_LOCATION_WORDS = [
-        "avoid", "escape", "evade", "hide", "fight", "attack",
-        "run", "flee", "dodge", "them", "him", "her", "it",
-        "trouble", "danger", "agents", "guards", "police",
-    ]
+    """
+    Detect scene transitions from player input.
+
+    Movement and trailing phrases are compiled into single regexes at
+    construction, so each turn is one scan of the input no matter how many
+    phrases are configured. Use ``for_genre`` to get a shared detector with
+    genre-specific movement phrases.
+    """
+
+    def __init__(
+        self,
+        movement_keywords: Optional[Iterable[str]] = None,
+        trailing_phrases: Optional[Iterable[str]] = None,
+        non_location_words: Optional[Iterable[str]] = None,
+        strip_words: Optional[Iterable[str]] = None,
+    ):
+        self.movement_keywords: List[str] = [
+            kw.lower() for kw in (movement_keywords if movement_keywords is not None else MOVEMENT_KEYWORDS)
+        ]
+        self.trailing_phrases = tuple(
+            p.lower() for p in (trailing_phrases if trailing_phrases is not None else TRAILING_PHRASES)
+        )
+        self.non_location_words = frozenset(
+            non_location_words if non_location_words is not None else NON_LOCATION_WORDS
+        )
+        self.strip_words = frozenset(strip_words if strip_words is not None else STRIP_WORDS)
+
+        # Keyword -> priority (position in the configured list)
+        self._priority = {}
+        for kw in self.movement_keywords:
+            self._priority.setdefault(kw, len(self._priority))
+
+        # Whole words only: "board" must not match "boardroom", nor "stop by" "stop byzantine"
+        self._movement_re = re.compile(rf"\b(?:{_alternation(self._priority)})\b")
+        self._trailing_re = re.compile(rf"\b(?:{_alternation(self.trailing_phrases)})\b")
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_genre(cls, genre: Optional[str] = None) -> "SceneDetector":
+        """Shared detector with the default phrases plus any for ``genre``."""
+        extra = GENRE_MOVEMENT_KEYWORDS.get((genre or "").strip().lower(), ())
+        return cls(movement_keywords=MOVEMENT_KEYWORDS + extra)
 
     def detect_scene_transition(
         self,
@@ -72,29 +132,58 @@ class SceneDetector:
         """
         input_lower = player_input.lower()
 
-        for keyword in self.MOVEMENT_KEYWORDS:
-            if keyword in input_lower:
-                location = self._extract_location(input_lower, keyword)
-                if location:
-                    # Normalize the location name
-                    location = self._normalize_location(location)
-
-                    # Check if it's actually a new location
-                    if current_location is None:
-                        return location
-                    if location.lower() != current_location.lower():
-                        return location
+        # One pass to find the first occurrence of each keyword present
+        first_match: Dict[str, int] = {}
+        for match in self._movement_re.finditer(input_lower):
+            first_match.setdefault(match.group(), match.end())
+
+        # Try keywords in priority order
+        for keyword in sorted(first_match, key=self._priority.__getitem__):
+            location = self._extract_location(input_lower, first_match[keyword])
+            if location:
+                # Normalize the location name
+                location = self._normalize_location(location)
+                if not location:
+                    continue
+
+                # Check if it's actually a new location
+                if current_location is None:
+                    return location
+                if location.lower() != current_location.lower():
+                    return location
 
         return None
 
-    def _extract_location(self, text: str, keyword: str) -> Optional[str]:
-        """Extract location name from text after movement keyword."""
-        idx = text.find(keyword)
-        if idx < 0:
-            return None
+    def detect_locations(self, text: str, current_location: Optional[str] = None) -> List[str]:
+        """
+        Find every location the text mentions moving to.
+
+        Used on narration to guess where the player may go next.
+
+        Args:
+            text: Text to scan (e.g. the narration just produced)
+            current_location: Current location (excluded from the result)
+
+        Returns:
+            Distinct location names in order of appearance
+        """
+        text_lower = text.lower()
+        seen = {current_location.lower()} if current_location else set()
+        locations = []
+
+        for match in self._movement_re.finditer(text_lower):
+            location = self._extract_location(text_lower, match.end())
+            location = self._normalize_location(location) if location else None
+            if location and location.lower() not in seen:
+                seen.add(location.lower())
+                locations.append(location)
+
+        return locations
 
+    def _extract_location(self, text: str, start: int) -> Optional[str]:
+        """Extract location name from text after a movement keyword ending at ``start``."""
         # Get text after the keyword
-        after = text[idx + len(keyword):].strip()
+        after = text[start:].strip()
 
         if not after:
             return None
@@ -111,26 +200,26 @@ class SceneDetector:
 
         return " ".join(words)
 
-    def _normalize_location(self, location: str) -> str:
+    def _normalize_location(self, location: str) -> Optional[str]:
         """Clean up and normalize a location name."""
         loc_lower = location.lower()
 
-        # Remove trailing phrases
-        for phrase in self.TRAILING_PHRASES:
-            if phrase in loc_lower:
-                idx = loc_lower.find(phrase)
-                loc_lower = loc_lower[:idx].strip()
+        # Remove trailing phrases (cut at the earliest one)
+        match = self._trailing_re.search(loc_lower)
+        if match:
+            loc_lower = loc_lower[:match.start()]
 
         words = loc_lower.split()
 
         # Check if this looks like an action, not a location
-        for word in words:
-            if word in self.NON_LOCATION_WORDS:
-                return None  # Not a valid location
+        if not self.non_location_words.isdisjoint(words):
+            return None  # Not a valid location
 
         # Remove leading articles and prepositions
-        while words and words[0] in self.STRIP_WORDS:
-            words = words[1:]
+        i = 0
+        while i < len(words) and words[i] in self.strip_words:
+            i += 1
+        words = words[i:]
 
         if not words:
             return None
@@ -5,8 +5,14 @@ which triggers activate.
 """
 
 import logging
-from typing import List, Optional
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from ..llm import LLMClient
 from ..models.campaign import CampaignState
 from ..models.simulation import (
     TriggerResult,
@@ -15,19 +21,46 @@ from ..models.simulation import (
     FailCondition,
     Secret,
     TimedEvent,
+    TriggerCondition,
     SceneSimulation,
+    SimulationState,
 )
+from .trigger_index import TriggerIndex, element_triggers, is_live
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class BatchEvaluation:
+    """
+    Outcome of evaluating many inputs against one simulation snapshot.
+
+    Matrices are (inputs x elements); columns follow ``element_ids``.
+    """
+    element_ids: List[str]
+    element_types: List[str]
+    hits: np.ndarray              # bool: some trigger of the element matched
+    fired: np.ndarray             # bool: the element passed its probability roll
+    fire_probability: np.ndarray  # float: chance the element fires for that input
+
+    @property
+    def fire_rates(self) -> np.ndarray:
+        """Fraction of inputs that fired each element."""
+        return self.fired.mean(axis=0) if len(self.fired) else np.zeros(len(self.element_ids))
+
+
 class SimulationEvaluator:
     """Evaluates player actions against pre-generated simulation triggers."""
 
+    def __init__(self, llm_client: Optional[LLMClient] = None):
+        # Used to (re-)embed semantic trigger texts, e.g. after a resume
+        self.llm = llm_client
+
     def evaluate_action(
         self,
         player_input: str,
         state: CampaignState,
+        query_embedding: Optional[Sequence[float]] = None,
     ) -> List[TriggerResult]:
         """
         Evaluate player action against all active simulation elements.
@@ -37,139 +70,167 @@ class SimulationEvaluator:
         Args:
             player_input: What the player typed
             state: Current campaign state
+            query_embedding: Embedding of ``player_input`` (enables semantic
+                triggers; pass the one already computed for context retrieval)
 
         Returns:
             List of triggered results (could be empty or multiple)
         """
-        results = []
         input_lower = player_input.lower()
 
-        # Check global watchers
-        for watcher in state.simulation.global_watchers:
-            if watcher.active and not watcher.triggered:
-                result = self._check_watcher(watcher, input_lower)
-                if result.triggered:
-                    results.append(result)
-
-        # Check global fail conditions
-        for fail_cond in state.simulation.global_fail_conditions:
-            if fail_cond.active and not fail_cond.triggered:
-                result = self._check_fail_condition(fail_cond, input_lower)
-                if result.triggered:
-                    results.append(result)
+        # Check global watchers and fail conditions
+        results = self._evaluate_index(
+            state.simulation.global_trigger_index(), input_lower, query_embedding
+        )
 
         # Check location-specific elements
         current_location = state.current_location
         if current_location:
             scene = state.simulation.get_scene(current_location)
             if scene:
-                results.extend(self._evaluate_scene(scene, input_lower))
+                results.extend(self._evaluate_scene(scene, input_lower, query_embedding))
 
         return results
 
+    def evaluate_batch(
+        self,
+        inputs: Sequence[str],
+        simulation: SimulationState,
+        location: Optional[str] = None,
+        query_embeddings: Optional[Sequence[Sequence[float]]] = None,
+        seed: int = 0,
+        processes: Optional[int] = None,
+    ) -> BatchEvaluation:
+        """
+        Evaluate many player inputs against a frozen simulation snapshot.
+
+        Every input is evaluated independently against the same snapshot
+        (nothing is marked triggered), so results are reproducible and
+        suitable for replaying recorded playtests to tune probabilities.
+
+        Args:
+            inputs: Player inputs to evaluate
+            simulation: Simulation state to snapshot (not mutated)
+            location: Scene to evaluate in (defaults to ``simulation.current_location``)
+            query_embeddings: One embedding per input (enables semantic triggers)
+            seed: Seed for the probability rolls (per-input, independent of ``processes``)
+            processes: Worker processes to spread the inputs over (None = in-process)
+
+        Returns:
+            BatchEvaluation with hit / roll / probability matrices
+        """
+        snapshot = simulation.model_copy(deep=True)
+        elements = snapshot.global_indexed_elements()
+        scene = snapshot.get_scene(location or snapshot.current_location or "")
+        if scene:
+            elements += scene.indexed_elements()
+
+        index = TriggerIndex(elements)
+        if query_embeddings is not None and index.needs_embeddings and self.llm:
+            index.embed_semantic(self.llm.embed_batch)
+
+        inputs = list(inputs)
+        if processes and processes > 1 and len(inputs) > processes:
+            step = -(-len(inputs) // (processes * 4))
+            starts = list(range(0, len(inputs), step))
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                parts = list(pool.map(
+                    _evaluate_rows,
+                    [index] * len(starts),
+                    [inputs[i:i + step] for i in starts],
+                    [query_embeddings[i:i + step] if query_embeddings is not None else None for i in starts],
+                    starts,
+                    [seed] * len(starts),
+                ))
+            hits, fired, probability = (np.concatenate(arrays) for arrays in zip(*parts))
+        else:
+            hits, fired, probability = _evaluate_rows(index, inputs, query_embeddings, 0, seed)
+
+        return BatchEvaluation(
+            element_ids=[element.id for _, element in elements],
+            element_types=[element_type for element_type, _ in elements],
+            hits=hits,
+            fired=fired,
+            fire_probability=probability,
+        )
+
     def _evaluate_scene(
         self,
         scene: SceneSimulation,
-        input_lower: str
+        input_lower: str,
+        query_embedding: Optional[Sequence[float]] = None,
     ) -> List[TriggerResult]:
         """Evaluate triggers for a specific scene."""
+        return self._evaluate_index(scene.trigger_index(), input_lower, query_embedding)
+
+    def _evaluate_index(
+        self,
+        index: TriggerIndex,
+        input_lower: str,
+        query_embedding: Optional[Sequence[float]] = None,
+    ) -> List[TriggerResult]:
+        """
+        Roll the elements whose keywords (or semantic triggers) match the input.
+
+        Elements are visited in their original order. Each matching element
+        is rolled once, however many of its triggers matched (see
+        :func:`match_trigger`), so an input hitting both the keyword and the
+        semantic trigger doesn't get two chances to fire.
+        """
         results = []
 
-        # Check watchers
-        for watcher in scene.watchers:
-            if watcher.active and not watcher.triggered:
-                result = self._check_watcher(watcher, input_lower)
-                if result.triggered:
-                    results.append(result)
-
-        # Check hidden guards
-        for guard in scene.hidden_guards:
-            if guard.active and not guard.triggered:
-                result = self._check_guard(guard, input_lower)
-                if result.triggered:
-                    results.append(result)
-
-        # Check fail conditions
-        for fail_cond in scene.fail_conditions:
-            if fail_cond.active and not fail_cond.triggered:
-                result = self._check_fail_condition(fail_cond, input_lower)
-                if result.triggered:
-                    results.append(result)
-
-        # Check secrets
-        for secret in scene.secrets:
-            if not secret.discovered:
-                result = self._check_secret(secret, input_lower)
-                if result.triggered:
-                    results.append(result)
+        if query_embedding is not None and index.needs_embeddings and self.llm:
+            try:
+                index.embed_semantic(self.llm.embed_batch)
+            except Exception as e:
+                logger.warning(f"Failed to embed semantic triggers: {e}")
 
-        return results
+        for slot, trigger_ids in index.candidates(input_lower, query_embedding):
+            element_type, element = index.elements[slot]
+            if not is_live(element):
+                index.retire(slot)
+                continue
 
-    def _check_watcher(self, watcher: Watcher, input_lower: str) -> TriggerResult:
-        """Check if a watcher's triggers match."""
-        for trigger in watcher.triggers:
-            if trigger.matches(input_lower) and trigger.check_probability():
-                watcher.triggered = True
-                logger.info(f"Watcher triggered: {watcher.name}")
-                return TriggerResult(
-                    triggered=True,
-                    element_id=watcher.id,
-                    element_type="watcher",
-                    narrative_injection=self._build_watcher_narrative(watcher),
-                )
-        return TriggerResult(triggered=False)
-
-    def _check_guard(self, guard: HiddenGuard, input_lower: str) -> TriggerResult:
-        """Check if a hidden guard's triggers match."""
-        for trigger in guard.triggers:
-            if trigger.matches(input_lower) and trigger.check_probability():
-                guard.triggered = True
-                logger.info(f"Hidden guard triggered: {guard.name}")
-                return TriggerResult(
-                    triggered=True,
-                    element_id=guard.id,
-                    element_type="hidden_guard",
-                    narrative_injection=self._build_guard_narrative(guard),
-                )
-        return TriggerResult(triggered=False)
+            if match_trigger(element, trigger_ids).check_probability():
+                index.retire(slot)
+                results.append(self._fire(element_type, element))
 
-    def _check_fail_condition(
-        self,
-        fail_cond: FailCondition,
-        input_lower: str
-    ) -> TriggerResult:
-        """Check if a fail condition's triggers match."""
-        for trigger in fail_cond.triggers:
-            if trigger.matches(input_lower) and trigger.check_probability():
-                fail_cond.triggered = True
-                logger.info(f"Fail condition triggered: {fail_cond.name}")
-                return TriggerResult(
-                    triggered=True,
-                    element_id=fail_cond.id,
-                    element_type="fail_condition",
-                    narrative_injection=self._build_fail_narrative(fail_cond),
-                )
-        return TriggerResult(triggered=False)
-
-    def _check_secret(self, secret: Secret, input_lower: str) -> TriggerResult:
-        """Check if a secret's discovery triggers match."""
-        for trigger in secret.discovery_triggers:
-            if trigger.matches(input_lower) and trigger.check_probability():
-                secret.discovered = True
-                logger.info(f"Secret discovered: {secret.id}")
-                return TriggerResult(
-                    triggered=True,
-                    element_id=secret.id,
-                    element_type="secret",
-                    narrative_injection=self._build_secret_narrative(secret),
-                )
-        return TriggerResult(triggered=False)
+        return results
+
+    def _fire(self, element_type: str, element: Any) -> TriggerResult:
+        """Flag an element as activated and build its result."""
+        if element_type == "watcher":
+            element.triggered = True
+            logger.info(f"Watcher triggered: {element.name}")
+            narrative = self._build_watcher_narrative(element)
+        elif element_type == "hidden_guard":
+            element.triggered = True
+            logger.info(f"Hidden guard triggered: {element.name}")
+            narrative = self._build_guard_narrative(element)
+        elif element_type == "fail_condition":
+            element.triggered = True
+            logger.info(f"Fail condition triggered: {element.name}")
+            narrative = self._build_fail_narrative(element)
+        else:
+            element.discovered = True
+            logger.info(f"Secret discovered: {element.id}")
+            narrative = self._build_secret_narrative(element)
+
+        return TriggerResult(
+            triggered=True,
+            element_id=element.id,
+            element_type=element_type,
+            narrative_injection=narrative,
+        )
 
     def advance_timed_events(self, state: CampaignState) -> List[TriggerResult]:
         """
         Advance all timed events by one turn.
 
-        Called at the end of each gameplay turn.
+        Called at the end of each gameplay turn. Only events due this turn
+        are visited (see ``SimulationState.pop_due_events``). Scene-local
+        events keep progressing while the player is elsewhere, but are only
+        reported in their own scene.
 
         Args:
             state: Current campaign state
@@ -178,31 +239,38 @@ class SimulationEvaluator:
             List of timed event trigger results (stage advances or completions)
         """
         state.current_turn += 1
+        simulation = state.simulation
+        simulation.current_turn = state.current_turn
         results = []
 
-        for event in state.simulation.global_timed_events:
-            if not event.active:
-                continue
-
-            # Check if it's time to advance the stage
-            if state.current_turn % event.turns_per_stage == 0:
-                if event.current_stage < event.max_stages - 1:
-                    event.current_stage += 1
-                    stage_desc = ""
-                    if event.current_stage < len(event.stage_descriptions):
-                        stage_desc = event.stage_descriptions[event.current_stage]
-
-                    logger.info(f"Timed event advanced: {event.name} -> stage {event.current_stage}")
-                    results.append(TriggerResult(
-                        triggered=True,
-                        element_id=event.id,
-                        element_type="timed_event",
-                        narrative_injection=self._build_timed_event_narrative(event, stage_desc),
-                    ))
-                elif event.current_stage >= event.max_stages - 1:
-                    # Event reached final stage
-                    event.active = False
-                    logger.info(f"Timed event completed: {event.name}")
+        for event, location in simulation.pop_due_events(state.current_turn):
+            stage_desc = None
+
+            if event.fire_at_turn is not None:
+                # One-shot event
+                event.active = False
+                stage_desc = event.description
+                logger.info(f"One-shot event fired: {event.name}")
+            elif event.current_stage < event.max_stages - 1:
+                event.current_stage += 1
+                stage_desc = ""
+                if event.current_stage < len(event.stage_descriptions):
+                    stage_desc = event.stage_descriptions[event.current_stage]
+
+                logger.info(f"Timed event advanced: {event.name} -> stage {event.current_stage}")
+                simulation.schedule_event(event, state.current_turn, location)
+            else:
+                # Event reached final stage
+                event.active = False
+                logger.info(f"Timed event completed: {event.name}")
+
+            if stage_desc is not None and location in (None, state.current_location):
+                results.append(TriggerResult(
+                    triggered=True,
+                    element_id=event.id,
+                    element_type="timed_event",
+                    narrative_injection=self._build_timed_event_narrative(event, stage_desc),
+                ))
 
         return results
 
@@ -271,3 +339,35 @@ Stage: {event.current_stage + 1}/{event.max_stages}
 Weave this background event into your response naturally. It should feel like
 the world is progressing independently of the player's actions - news reaches
 them, they notice changes in the environment, NPCs mention it in passing."""
+
+
+def match_trigger(element: Any, trigger_ids: Sequence[int]) -> TriggerCondition:
+    """The matching trigger an element is rolled against: the most likely one."""
+    triggers = element_triggers(element)
+    return max((triggers[i] for i in trigger_ids), key=lambda trigger: trigger.probability)
+
+
+def _evaluate_rows(
+    index: TriggerIndex,
+    inputs: Sequence[str],
+    query_embeddings: Optional[Sequence[Sequence[float]]],
+    start: int,
+    seed: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate a slice of inputs (module-level so process pools can pickle it)."""
+    shape = (len(inputs), len(index.elements))
+    hits = np.zeros(shape, dtype=bool)
+    fired = np.zeros(shape, dtype=bool)
+    probability = np.zeros(shape, dtype=np.float32)
+
+    for row, text in enumerate(inputs):
+        rng = random.Random((seed << 32) + start + row)
+        embedding = query_embeddings[row] if query_embeddings is not None else None
+
+        for slot, trigger_ids in index.candidates(text.lower(), embedding):
+            p = match_trigger(index.elements[slot][1], trigger_ids).probability
+            hits[row, slot] = True
+            probability[row, slot] = p
+            fired[row, slot] = rng.random() <= p
+
+    return hits, fired, probability
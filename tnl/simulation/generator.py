@@ -5,10 +5,11 @@ Generates hidden simulation elements for a scene on-demand when the player enter
 
 import json
 import logging
-import re
-from typing import Optional
+from typing import Any, Dict, List, Sequence
 from uuid import uuid4
 
+from pydantic import BaseModel, Field
+
 from ..llm import LLMClient
 from ..models.campaign import CampaignState
 from ..models.simulation import (
@@ -25,19 +26,8 @@ from ..models.simulation import (
 logger = logging.getLogger(__name__)
 
 
-SCENE_SIMULATION_PROMPT = """Generate HIDDEN simulation elements for this scene as JSON.
-
-LOCATION: {location}
-GENRE: {genre} | TONE: {tone}
-CHARACTER: {character_summary}
-WORLD CONTEXT: {world_context}
-
-Generate pre-existing hidden elements that exist BEFORE the player acts.
-
-IMPORTANT: Output ONLY valid JSON, no explanation text. Start with {{ and end with }}.
-
-Output this exact JSON structure (1-2 of each type):
-{{
+# JSON structure of one scene (a format fragment: braces are doubled)
+SCENE_JSON_STRUCTURE = """{{
     "location_description": "Brief hidden notes about this place",
 
     "watchers": [
@@ -47,6 +37,7 @@ Output this exact JSON structure (1-2 of each type):
             "faction": "Which faction they serve",
             "reports_to": "Who they report to",
             "trigger_keywords": ["words that draw attention"],
+            "trigger_description": "One sentence describing the kind of player action that draws their attention",
             "probability": 0.7
         }}
     ],
@@ -57,6 +48,7 @@ Output this exact JSON structure (1-2 of each type):
             "guard_type": "armed/magical/automated/creature",
             "location_within_scene": "Where exactly they are",
             "trigger_keywords": ["words that trigger them"],
+            "trigger_description": "One sentence describing the kind of player action that triggers them",
             "weaknesses": ["how to avoid or defeat"]
         }}
     ],
@@ -66,6 +58,7 @@ Output this exact JSON structure (1-2 of each type):
             "name": "What action fails",
             "description": "Why this is dangerous here",
             "trigger_keywords": ["words that trigger"],
+            "trigger_description": "One sentence describing the kind of player action that triggers this",
             "probability": 0.8,
             "severity": "minor/moderate/severe",
             "consequence_narrative": "What happens if triggered (2-3 sentences)",
@@ -77,15 +70,117 @@ Output this exact JSON structure (1-2 of each type):
     "secrets": [
         {{
             "description": "Something hidden the player could discover",
-            "discovery_keywords": ["search", "examine", "look"]
+            "discovery_keywords": ["search", "examine", "look"],
+            "discovery_description": "One sentence describing the kind of player action that uncovers it"
         }}
     ]
-}}
+}}"""
+
+SCENE_SIMULATION_PROMPT = """Generate HIDDEN simulation elements for this scene as JSON.
+
+LOCATION: {location}
+GENRE: {genre} | TONE: {tone}
+CHARACTER: {character_summary}
+WORLD CONTEXT: {world_context}
+
+Generate pre-existing hidden elements that exist BEFORE the player acts.
+
+IMPORTANT: Output ONLY valid JSON, no explanation text. Start with {{ and end with }}.
 
+Output this exact JSON structure (1-2 of each type):
+""" + SCENE_JSON_STRUCTURE + """
+
+Match the {genre} and {tone}. Be creative but consistent with the world context.
+
+CRITICAL: Output ONLY the JSON object. No markdown code blocks, no explanation, no text before or after. Just the raw JSON starting with {{ and ending with }}."""
+
+
+BATCH_SCENE_SIMULATION_PROMPT = """Generate HIDDEN simulation elements for each of these scenes as JSON.
+
+LOCATIONS: {locations}
+GENRE: {genre} | TONE: {tone}
+CHARACTER: {character_summary}
+WORLD CONTEXT: {world_context}
+
+Generate pre-existing hidden elements that exist BEFORE the player acts.
+
+IMPORTANT: Output ONLY valid JSON, no explanation text. Start with {{ and end with }}.
+
+Output one object per location under "scenes", in the order given. Each object has a
+"location" field (the location name exactly as given) plus this structure:
+""" + SCENE_JSON_STRUCTURE + """
+
+So the output is {{"scenes": [{{"location": "...", "location_description": "...", "watchers": [...], ...}}, ...]}}
+
+Each scene gets 1-2 of each element type. Make the scenes distinct from each other.
 Match the {genre} and {tone}. Be creative but consistent with the world context.
 
 CRITICAL: Output ONLY the JSON object. No markdown code blocks, no explanation, no text before or after. Just the raw JSON starting with {{ and ending with }}."""
 
+class WatcherSpec(BaseModel):
+    """A watcher as generated by the LLM."""
+    name: str = "Unknown Watcher"
+    description: str = ""
+    faction: str = ""
+    reports_to: str = ""
+    trigger_keywords: List[str] = Field(default_factory=list)
+    trigger_description: str = ""
+    probability: float = 0.7
+
+
+class HiddenGuardSpec(BaseModel):
+    """A hidden guard as generated by the LLM."""
+    name: str = "Unknown Guard"
+    guard_type: str = "armed"
+    location_within_scene: str = ""
+    trigger_keywords: List[str] = Field(default_factory=list)
+    trigger_description: str = ""
+    weaknesses: List[str] = Field(default_factory=list)
+
+
+class FailConditionSpec(BaseModel):
+    """A fail condition as generated by the LLM."""
+    name: str = "Unknown Condition"
+    description: str = ""
+    trigger_keywords: List[str] = Field(default_factory=list)
+    trigger_description: str = ""
+    probability: float = 0.8
+    severity: str = "moderate"
+    consequence_narrative: str = ""
+    can_escape: bool = True
+    escape_conditions: List[str] = Field(default_factory=list)
+
+
+class SecretSpec(BaseModel):
+    """A secret as generated by the LLM."""
+    description: str = ""
+    discovery_keywords: List[str] = Field(default_factory=lambda: ["search", "examine"])
+    discovery_description: str = ""
+
+
+class SceneSimulationResponse(BaseModel):
+    """Schema for a scene simulation AI response."""
+    location_description: str = ""
+    watchers: List[WatcherSpec] = Field(default_factory=list)
+    hidden_guards: List[HiddenGuardSpec] = Field(default_factory=list)
+    fail_conditions: List[FailConditionSpec] = Field(default_factory=list)
+    secrets: List[SecretSpec] = Field(default_factory=list)
+
+
+class BatchSceneEntry(SceneSimulationResponse):
+    """One scene of a batched response."""
+    location: str = ""
+
+
+class BatchSceneSimulationResponse(BaseModel):
+    """Schema for a batched scene simulation AI response."""
+    scenes: List[BatchSceneEntry] = Field(default_factory=list)
+
+
+# Scenes per batched call, and output tokens budgeted per scene
+MAX_BATCH_SCENES = 4
+BATCH_TOKENS_PER_SCENE = 2500
+
 
 class SceneSimulationGenerator:
     """Generate hidden elements for a scene on-demand."""
@@ -124,14 +219,15 @@ class SceneSimulationGenerator:
             logger.debug(f"Generating simulation for location: {location}")
             # GPT-5.2 Thinking model uses internal reasoning tokens, so we need
             # higher max_tokens to ensure the actual output isn't truncated
-            response = self.llm.generate(
+            response = self.llm.generate_structured(
                 prompt=prompt,
+                schema=SceneSimulationResponse,
                 max_tokens=4000,
                 temperature=0.7,
             )
-            logger.debug(f"Got response of length {len(response) if response else 0}")
 
-            scene = self._parse_response(response, location, state.current_turn)
+            scene = self._build_scene(response.model_dump(), location, state.current_turn)
+            self._embed_semantic_triggers(scene)
             logger.info(f"Generated simulation for '{location}': "
                        f"{len(scene.watchers)} watchers, "
                        f"{len(scene.hidden_guards)} guards, "
@@ -147,26 +243,89 @@ class SceneSimulationGenerator:
                 generated_at_turn=state.current_turn
             )
 
-    def _parse_response(
+    def generate_scene_simulations(
         self,
-        response: str,
-        location: str,
-        current_turn: int
-    ) -> SceneSimulation:
-        """Parse LLM response into SceneSimulation."""
-        # Extract JSON from response
-        json_str = self._extract_json(response)
+        locations: Sequence[str],
+        state: CampaignState,
+        world_context: str,
+    ) -> Dict[str, SceneSimulation]:
+        """
+        Generate hidden elements for several scenes with one call per batch.
 
-        if not json_str:
-            logger.warning(f"No JSON found in simulation response. Response preview: {response[:200] if response else 'EMPTY'}")
-            return SceneSimulation(location=location, generated_at_turn=current_turn)
+        The prompt scaffold and world context are sent once for up to
+        ``MAX_BATCH_SCENES`` locations. Locations missing from a batched
+        response are generated individually.
 
-        try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse simulation JSON: {e}")
-            return SceneSimulation(location=location, generated_at_turn=current_turn)
+        Args:
+            locations: Names of the locations (e.g. all places the intro mentions)
+            state: Current campaign state
+            world_context: Relevant world seed chunks
+
+        Returns:
+            Location -> SceneSimulation, for every requested location
+        """
+        locations = list(dict.fromkeys(locations))
+        scenes: Dict[str, SceneSimulation] = {}
+
+        for start in range(0, len(locations), MAX_BATCH_SCENES):
+            batch = locations[start:start + MAX_BATCH_SCENES]
+            if len(batch) > 1:
+                scenes.update(self._generate_batch(batch, state, world_context))
 
+        for location in locations:
+            if location not in scenes:
+                scenes[location] = self.generate_scene_simulation(location, state, world_context)
+
+        return scenes
+
+    def _generate_batch(
+        self,
+        locations: List[str],
+        state: CampaignState,
+        world_context: str,
+    ) -> Dict[str, SceneSimulation]:
+        """One batched call; returns the scenes it managed to parse."""
+        prompt = BATCH_SCENE_SIMULATION_PROMPT.format(
+            locations=json.dumps(locations),
+            genre=state.genre or "Fantasy",
+            tone=state.tone or "Gritty",
+            character_summary=state.character_sheet.summary(),
+            world_context=world_context,
+        )
+
+        try:
+            logger.debug(f"Generating simulations for locations: {locations}")
+            # Thinking model: leave room for reasoning tokens on top of the output
+            response = self.llm.generate_structured(
+                prompt=prompt,
+                schema=BatchSceneSimulationResponse,
+                max_tokens=1500 + BATCH_TOKENS_PER_SCENE * len(locations),
+                temperature=0.7,
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate batched scene simulations for {locations}: {e}")
+            return {}
+
+        by_name = {entry.location.strip().lower(): entry for entry in response.scenes}
+        scenes = {}
+        for location in locations:
+            entry = by_name.get(location.strip().lower())
+            if entry is None:
+                continue
+            scene = self._build_scene(entry.model_dump(exclude={"location"}), location, state.current_turn)
+            self._embed_semantic_triggers(scene)
+            scenes[location] = scene
+
+        logger.info(f"Generated {len(scenes)}/{len(locations)} scene simulations in one call")
+        return scenes
+
+    def _build_scene(
+        self,
+        data: Dict[str, Any],
+        location: str,
+        current_turn: int,
+    ) -> SceneSimulation:
+        """Build a SceneSimulation from one scene's decoded JSON."""
         # Build scene simulation
         scene = SceneSimulation(
             location=location,
@@ -182,11 +341,11 @@ class SceneSimulationGenerator:
                 description=w.get("description", ""),
                 faction=w.get("faction", ""),
                 reports_to=w.get("reports_to", ""),
-                triggers=[TriggerCondition(
-                    trigger_type=TriggerType.KEYWORD,
-                    keywords=w.get("trigger_keywords", []),
-                    probability=w.get("probability", 0.7),
-                )],
+                triggers=self._build_triggers(
+                    w.get("trigger_keywords", []),
+                    w.get("trigger_description", ""),
+                    w.get("probability", 0.7),
+                ),
             ))
 
         # Parse hidden guards
@@ -197,11 +356,11 @@ class SceneSimulationGenerator:
                 guard_type=g.get("guard_type", "armed"),
                 location_within_scene=g.get("location_within_scene", ""),
                 weaknesses=g.get("weaknesses", []),
-                triggers=[TriggerCondition(
-                    trigger_type=TriggerType.KEYWORD,
-                    keywords=g.get("trigger_keywords", []),
-                    probability=g.get("probability", 0.9),
-                )],
+                triggers=self._build_triggers(
+                    g.get("trigger_keywords", []),
+                    g.get("trigger_description", ""),
+                    g.get("probability", 0.9),
+                ),
             ))
 
         # Parse fail conditions
@@ -220,11 +379,11 @@ class SceneSimulationGenerator:
                 consequence_narrative=f.get("consequence_narrative", ""),
                 can_escape=f.get("can_escape", True),
                 escape_conditions=f.get("escape_conditions", []),
-                triggers=[TriggerCondition(
-                    trigger_type=TriggerType.KEYWORD,
-                    keywords=f.get("trigger_keywords", []),
-                    probability=f.get("probability", 0.8),
-                )],
+                triggers=self._build_triggers(
+                    f.get("trigger_keywords", []),
+                    f.get("trigger_description", ""),
+                    f.get("probability", 0.8),
+                ),
             ))
 
         # Parse secrets
@@ -232,31 +391,43 @@ class SceneSimulationGenerator:
             scene.secrets.append(Secret(
                 id=f"secret_{location}_{i}_{uuid4().hex[:6]}",
                 description=s.get("description", ""),
-                discovery_triggers=[TriggerCondition(
-                    trigger_type=TriggerType.KEYWORD,
-                    keywords=s.get("discovery_keywords", ["search", "examine"]),
-                    probability=1.0,
-                )],
+                discovery_triggers=self._build_triggers(
+                    s.get("discovery_keywords", ["search", "examine"]),
+                    s.get("discovery_description", ""),
+                    1.0,
+                ),
             ))
 
         return scene
 
-    def _extract_json(self, text: str) -> Optional[str]:
-        """Extract JSON from LLM response."""
-        # Try code block first
-        if "```json" in text:
-            match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
-            if match:
-                return match.group(1)
-
-        if "```" in text:
-            match = re.search(r"```\s*(.*?)\s*```", text, re.DOTALL)
-            if match:
-                return match.group(1)
-
-        # Try to find raw JSON object
-        match = re.search(r"\{[\s\S]*\}", text)
-        if match:
-            return match.group(0)
-
-        return None
+    def _build_triggers(
+        self,
+        keywords: List[str],
+        description: str,
+        probability: float,
+    ) -> List[TriggerCondition]:
+        """
+        Keyword trigger, plus a semantic one if the element has a trigger description.
+
+        Both carry the element's probability: they are alternative ways to
+        match, and the evaluator rolls a matching element only once.
+        """
+        triggers = [TriggerCondition(
+            trigger_type=TriggerType.KEYWORD,
+            keywords=keywords,
+            probability=probability,
+        )]
+        if description:
+            triggers.append(TriggerCondition(
+                trigger_type=TriggerType.SEMANTIC,
+                description=description,
+                probability=probability,
+            ))
+        return triggers
+
+    def _embed_semantic_triggers(self, scene: SceneSimulation) -> None:
+        """Embed the scene's semantic trigger texts once, at generation time."""
+        try:
+            scene.trigger_index().embed_semantic(self.llm.embed_batch)
+        except Exception as e:
+            logger.warning(f"Failed to embed semantic triggers for '{scene.location}': {e}")
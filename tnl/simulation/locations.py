@@ -0,0 +1,131 @@
+"""Location canonicalization.
+
+Scene detection only normalizes case, so "The Old Docks", "Old Docks" and
+"the docks by the river" would each get their own (expensive) scene
+simulation. ``LocationIndex`` matches a newly detected name against the
+scenes that already exist - first by token sets, then optionally by
+embedding similarity - so aliases map to one canonical scene.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+# Words that don't distinguish one place from another
+LOCATION_STOP_WORDS = frozenset({
+    "the", "a", "an", "of", "by", "near", "at", "in", "on", "to", "into",
+    "inside", "outside", "next", "beside", "behind",
+})
+
+# Minimum Jaccard similarity of token sets for two names to be the same place
+DEFAULT_TOKEN_THRESHOLD = 0.6
+
+# Minimum cosine similarity of name embeddings (conservative: short names
+# of different places in the same world often score fairly high)
+DEFAULT_EMBEDDING_THRESHOLD = 0.85
+
+
+def location_tokens(name: str) -> Set[str]:
+    """Distinguishing tokens of a location name (lowercased, crude singular)."""
+    tokens = set()
+    for word in re.findall(r"[a-z0-9']+", name.lower()):
+        word = word.replace("'s", "").strip("'")
+        if not word or word in LOCATION_STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return tokens
+
+
+class LocationIndex:
+    """
+    Matches location names to known scenes.
+
+    Two names match when the Jaccard similarity of their token sets reaches
+    ``token_threshold``; among those, a name contained in the other ranks
+    first. Containment alone isn't enough: "Market" vs "Black Market" or
+    "Tower" vs "Wizard Tower" are usually different places. A name matching
+    several known places equally well is treated as new. If an embedding
+    function is given and no token match is found, names are compared by
+    cosine similarity of their embeddings (known names are embedded once).
+    """
+
+    def __init__(
+        self,
+        token_threshold: float = DEFAULT_TOKEN_THRESHOLD,
+        embedding_threshold: float = DEFAULT_EMBEDDING_THRESHOLD,
+    ):
+        self.token_threshold = token_threshold
+        self.embedding_threshold = embedding_threshold
+        self._embeddings: Dict[str, np.ndarray] = {}
+
+    def match(
+        self,
+        name: str,
+        known: Iterable[str],
+        embed_batch: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    ) -> Optional[str]:
+        """
+        Find the known location ``name`` refers to.
+
+        Args:
+            name: Newly detected location name
+            known: Existing canonical location names
+            embed_batch: Function mapping texts to embeddings (enables the
+                embedding fallback), e.g. ``LLMClient.embed_batch``
+
+        Returns:
+            The best matching known name, or None if ``name`` is a new place
+        """
+        known = list(known)
+        tokens = location_tokens(name)
+        if not known or not tokens:
+            return None
+
+        best: List[str] = []
+        best_score = 0.0
+        for candidate in known:
+            candidate_tokens = location_tokens(candidate)
+            if not candidate_tokens:
+                continue
+            score = len(tokens & candidate_tokens) / len(tokens | candidate_tokens)
+            if score >= self.token_threshold and (tokens <= candidate_tokens or candidate_tokens <= tokens):
+                score = 1.0
+            if score > best_score:
+                best, best_score = [candidate], score
+            elif score == best_score:
+                best.append(candidate)
+
+        if best_score >= self.token_threshold:
+            # "Tavern" next to two known taverns is ambiguous - treat as new
+            return best[0] if len(best) == 1 else None
+
+        if embed_batch is not None:
+            return self._match_embedding(name, known, embed_batch)
+        return None
+
+    def _match_embedding(
+        self,
+        name: str,
+        known: List[str],
+        embed_batch: Callable[[List[str]], List[List[float]]],
+    ) -> Optional[str]:
+        """Closest known name by embedding similarity, if close enough."""
+        missing = [k for k in known if k not in self._embeddings]
+        vectors = embed_batch(missing + [name])
+        for text, vector in zip(missing, vectors):
+            self._embeddings[text] = _normalize(vector)
+        query = _normalize(vectors[-1])
+
+        matrix = np.stack([self._embeddings[k] for k in known])
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        return known[best] if scores[best] >= self.embedding_threshold else None
+
+
+def _normalize(vector: List[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
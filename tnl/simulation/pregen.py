@@ -0,0 +1,236 @@
+"""Speculative scene pre-generation.
+
+Generating a scene simulation is a long LLM call that otherwise sits between
+the player's "I go to the docks" and the first word of narration. The
+pre-generator guesses where the player may go next - locations the narration
+just mentioned, places they've been from here before, and discovered places
+without a simulation yet - and generates those scenes in the background (one
+batched call per turn) while the player is reading and typing. Entering a
+pre-generated location then costs no extra LLM call.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..models.campaign import CampaignState
+from ..models.simulation import SceneSimulation
+from .detector import SceneDetector
+from .generator import SceneSimulationGenerator
+
+logger = logging.getLogger(__name__)
+
+# Speculative generations allowed per campaign (each is a full scene LLM call)
+DEFAULT_CAMPAIGN_BUDGET = 12
+
+# Scenes speculated on after any one turn
+DEFAULT_MAX_PER_TURN = 2
+
+
+class ScenePregenerator:
+    """
+    Background, budgeted generation of scenes the player is likely to enter.
+
+    Usage:
+        pregen = ScenePregenerator(scene_generator)
+        pregen.speculate(state, narration)          # after each turn, returns immediately
+        scene = pregen.take(campaign_id, location)  # on entering; None on a miss
+        pregen.close()                              # cancel pending work
+
+    Speculations that are no longer candidates are cancelled on the next
+    turn (if not yet started), and a campaign's budget caps how many scene
+    calls it may spend speculatively.
+    """
+
+    def __init__(
+        self,
+        scene_generator: SceneSimulationGenerator,
+        campaign_budget: int = DEFAULT_CAMPAIGN_BUDGET,
+        max_per_turn: int = DEFAULT_MAX_PER_TURN,
+        max_workers: int = 2,
+    ):
+        self.scene_generator = scene_generator
+        self.campaign_budget = campaign_budget
+        self.max_per_turn = max_per_turn
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tnl-pregen")
+        self._lock = threading.Lock()
+
+        # (campaign_id, location key) -> future scene
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        # campaign_id -> speculative generations started
+        self._spent: Dict[str, int] = {}
+        # campaign_id -> location key -> locations entered from it
+        self._adjacency: Dict[str, Dict[str, List[str]]] = {}
+
+        # Counters (for debugging / benchmarks)
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+
+    def close(self) -> None:
+        """Cancel pending speculations and stop the workers."""
+        with self._lock:
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def record_move(self, campaign_id: str, from_location: Optional[str], to_location: str) -> None:
+        """Add an edge to the campaign's location adjacency graph."""
+        if not from_location:
+            return
+        with self._lock:
+            neighbours = self._adjacency.setdefault(campaign_id, {}).setdefault(_key(from_location), [])
+            if to_location not in neighbours:
+                neighbours.append(to_location)
+            # Paths are walkable both ways
+            back = self._adjacency[campaign_id].setdefault(_key(to_location), [])
+            if from_location not in back:
+                back.append(from_location)
+
+    def candidates(self, state: CampaignState, narration: str = "") -> List[str]:
+        """
+        Locations the player may enter next, most likely first.
+
+        Args:
+            state: Current campaign state
+            narration: Narration just shown to the player
+
+        Returns:
+            Locations without a scene simulation yet
+        """
+        detector = SceneDetector.for_genre(state.genre)
+        mentioned = detector.detect_locations(narration, state.current_location) if narration else []
+
+        with self._lock:
+            adjacent = list(
+                self._adjacency.get(state.campaign_id or "", {}).get(_key(state.current_location or ""), [])
+            )
+
+        result = []
+        seen: Set[str] = {_key(location) for location in state.simulation.scenes}
+        if state.current_location:
+            seen.add(_key(state.current_location))
+        for location in mentioned + adjacent + list(reversed(state.discovered_locations)):
+            if _key(location) not in seen and state.simulation.resolve_location(location) == location:
+                seen.add(_key(location))
+                result.append(location)
+        return result
+
+    def speculate(self, state: CampaignState, narration: str = "") -> List[str]:
+        """
+        Start background generation for the likeliest next locations.
+
+        Pending speculations that are no longer candidates are cancelled.
+
+        Args:
+            state: Current campaign state (workers only get a detached snapshot)
+            narration: Narration just shown to the player
+
+        Returns:
+            Locations newly queued for generation
+        """
+        if not state.campaign_id:
+            return []
+
+        campaign_id = state.campaign_id
+        wanted = self.candidates(state, narration)[: self.max_per_turn]
+        wanted_keys = {_key(location) for location in wanted}
+        snapshot = generation_snapshot(state)
+        world_context = "\n\n".join(state.seed_chunks[:3])
+
+        queued = []
+        with self._lock:
+            # A batch is cancelled only if none of its locations is still wanted
+            batches: Dict[Future, List[Tuple[str, str]]] = {}
+            for pending_key, future in self._pending.items():
+                if pending_key[0] == campaign_id:
+                    batches.setdefault(future, []).append(pending_key)
+            for future, keys in batches.items():
+                if all(key not in wanted_keys for _, key in keys) and future.cancel():
+                    for pending_key in keys:
+                        del self._pending[pending_key]
+                    self._spent[campaign_id] -= len(keys)  # Never ran - refund the budget
+                    self.cancelled += len(keys)
+
+            for location in wanted:
+                if (campaign_id, _key(location)) in self._pending:
+                    continue
+                if self._spent.get(campaign_id, 0) >= self.campaign_budget:
+                    break
+                self._spent[campaign_id] = self._spent.get(campaign_id, 0) + 1
+                queued.append(location)
+
+            if queued:
+                # One batched call for everything queued this turn
+                future = self._executor.submit(
+                    self.scene_generator.generate_scene_simulations,
+                    locations=queued,
+                    state=snapshot,
+                    world_context=world_context,
+                )
+                for location in queued:
+                    self._pending[(campaign_id, _key(location))] = future
+                self.started += len(queued)
+
+        if queued:
+            logger.info(f"Speculatively generating scenes: {', '.join(queued)}")
+        return queued
+
+    def take(self, campaign_id: Optional[str], location: str) -> Optional[SceneSimulation]:
+        """
+        Claim a speculated scene for the location being entered.
+
+        Waits if its generation is still running (it's already ahead of a
+        fresh call).
+
+        Returns:
+            The scene, or None if it wasn't speculated (or generation failed)
+        """
+        with self._lock:
+            future = self._pending.pop((campaign_id or "", _key(location)), None)
+
+        if future is None or future.cancelled():
+            self.misses += 1
+            return None
+
+        try:
+            scenes = future.result()
+        except Exception as e:
+            logger.warning(f"Speculative scene generation for '{location}' failed: {e}")
+            self.misses += 1
+            return None
+
+        scene = next((scene for name, scene in scenes.items() if _key(name) == _key(location)), None)
+        if scene is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        scene.location = location
+        return scene
+
+
+def generation_snapshot(state: CampaignState) -> CampaignState:
+    """
+    Detached copy of the state fields scene generation reads.
+
+    Gameplay keeps mutating the live state (scenes, simulation, collections)
+    while a speculation runs, so workers get a fresh state holding deep
+    copies of just the generator's inputs and sharing nothing with ``state``.
+    """
+    return CampaignState(
+        campaign_id=state.campaign_id,
+        phase=state.phase,
+        genre=state.genre,
+        tone=state.tone,
+        story_type=state.story_type,
+        character_sheet=state.character_sheet.model_copy(deep=True),
+        current_location=state.current_location,
+        current_turn=state.current_turn,
+    )
+
+
+def _key(location: str) -> str:
+    return location.strip().lower()
@@ -0,0 +1,184 @@
+"""Compiled keyword trigger index for simulation elements.
+
+Instead of scanning every keyword of every element with a substring search
+each turn, all keyword triggers of a scene (or of the global elements) are
+compiled into one Aho-Corasick automaton. A turn's evaluation is then a
+single pass over the player input, followed by probability rolls for the
+few elements whose keywords actually appeared.
+
+Semantic triggers are embedded once into a normalized matrix and scored
+against the turn's input embedding with a single matrix-vector product.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..models.simulation import TriggerCondition, TriggerType
+
+# (element_type, element) pairs, in evaluation order
+IndexedElement = Tuple[str, Any]
+
+
+def element_triggers(element: Any) -> List[TriggerCondition]:
+    """Trigger conditions of a simulation element (secrets use discovery triggers)."""
+    triggers = getattr(element, "discovery_triggers", None)
+    return triggers if triggers is not None else element.triggers
+
+
+def is_live(element: Any) -> bool:
+    """Whether an element can still fire."""
+    if hasattr(element, "discovered"):
+        return not element.discovered
+    return element.active and not element.triggered
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed set of lowercase patterns."""
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._always: List[int] = []  # Empty patterns match any input
+
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                self._always.append(pattern_id)
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pattern_id)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def search(self, text: str) -> Set[int]:
+        """Ids of all patterns occurring anywhere in ``text``."""
+        found = set(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class TriggerIndex:
+    """
+    Keyword/semantic hits -> (element, trigger) lookup for a group of elements.
+
+    Elements that are no longer live when the index is built are skipped;
+    elements that fire afterwards are retired so they are never returned
+    again. Rebuild the index if elements or keywords are added.
+    """
+
+    def __init__(self, elements: Sequence[IndexedElement]):
+        self.elements: List[IndexedElement] = list(elements)
+        self._retired: Set[int] = set()
+
+        pattern_ids: Dict[str, int] = {}
+        self._postings: List[List[Tuple[int, int]]] = []
+
+        # Semantic triggers: one matrix row per (slot, trigger id)
+        self.semantic_texts: List[str] = []
+        self._semantic: List[Tuple[int, int]] = []
+        thresholds: List[float] = []
+        self._semantic_matrix: Optional[np.ndarray] = None
+
+        for slot, (_, element) in enumerate(self.elements):
+            if not is_live(element):
+                self._retired.add(slot)
+                continue
+            for trigger_id, trigger in enumerate(element_triggers(element)):
+                if trigger.trigger_type == TriggerType.SEMANTIC and trigger.description:
+                    self.semantic_texts.append(trigger.description)
+                    self._semantic.append((slot, trigger_id))
+                    thresholds.append(trigger.threshold)
+                if trigger.trigger_type != TriggerType.KEYWORD:
+                    continue
+                for keyword in trigger.keywords:
+                    pattern_id = pattern_ids.setdefault(keyword.lower(), len(pattern_ids))
+                    if pattern_id == len(self._postings):
+                        self._postings.append([])
+                    self._postings[pattern_id].append((slot, trigger_id))
+
+        self._automaton = KeywordAutomaton(list(pattern_ids))
+        self._thresholds = np.asarray(thresholds, dtype=np.float32)
+
+    @property
+    def needs_embeddings(self) -> bool:
+        """Whether semantic triggers exist but haven't been embedded yet."""
+        return bool(self.semantic_texts) and self._semantic_matrix is None
+
+    def embed_semantic(self, embed_batch: Callable[[List[str]], List[List[float]]]) -> None:
+        """
+        Embed semantic trigger texts (no-op if already done).
+
+        Args:
+            embed_batch: Function mapping texts to embeddings, e.g. ``LLMClient.embed_batch``
+        """
+        if self.needs_embeddings:
+            self._semantic_matrix = _normalize(np.asarray(embed_batch(self.semantic_texts), dtype=np.float32))
+
+    def candidates(
+        self,
+        input_lower: str,
+        query_embedding: Optional[Sequence[float]] = None,
+    ) -> List[Tuple[int, List[int]]]:
+        """
+        Elements with at least one matching trigger.
+
+        Args:
+            input_lower: Lowercased player input
+            query_embedding: Embedding of the player input (enables semantic triggers)
+
+        Returns:
+            (slot, matching trigger ids) pairs in evaluation order
+        """
+        hits: Dict[int, Set[int]] = {}
+        for pattern_id in self._automaton.search(input_lower):
+            for slot, trigger_id in self._postings[pattern_id]:
+                if slot not in self._retired:
+                    hits.setdefault(slot, set()).add(trigger_id)
+
+        if query_embedding is not None and self._semantic_matrix is not None:
+            query = _normalize(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+            scores = self._semantic_matrix @ query
+            for row in np.flatnonzero(scores >= self._thresholds):
+                slot, trigger_id = self._semantic[row]
+                if slot not in self._retired:
+                    hits.setdefault(slot, set()).add(trigger_id)
+
+        return [(slot, sorted(hits[slot])) for slot in sorted(hits)]
+
+    def retire(self, slot: int) -> None:
+        """Stop returning an element (it fired or was deactivated)."""
+        self._retired.add(slot)
+
+
+def _normalize(rows: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return rows / norms